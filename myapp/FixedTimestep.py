@@ -0,0 +1,81 @@
+class FixedTimestep:
+    """固定刻み幅でゲーム状態を更新するための時間積算器
+
+    描画フレームごとの経過時間を積算し、固定の刻み幅何回分の更新が
+    必要かを返す。刻み幅に満たない端数は次のフレームに繰り越すため、
+    フレームレートによらずゲーム状態は同じ刻み幅で更新される
+
+    端数は刻み幅に対する割合 (alpha) として参照でき、描画時に前回と
+    今回の状態を補間するために使用する
+
+    時間は整数のナノ秒で積算するため、端数の誤差は蓄積しない
+
+    Attributes
+    ----------
+    timestep : float
+        更新の刻み幅 [sec]
+    max_steps : int
+        1フレームで行う更新回数の上限
+    alpha : float
+        繰り越した端数の刻み幅に対する割合 (0以上1未満)
+    """
+
+    def __init__(self, timestep: float, max_steps: int) -> None:
+        """
+        Parameters
+        ----------
+        timestep : float
+            更新の刻み幅 [sec]
+        max_steps : int
+            1フレームで行う更新回数の上限
+            (処理落ち時に更新が追いつかなくなることを防ぐ)
+        """
+        timestep_ns = round(timestep * 1_000_000_000)
+        if timestep_ns <= 0:
+            raise ValueError("刻み幅には正の値を指定してください")
+        if max_steps < 1:
+            raise ValueError("更新回数の上限には1以上を指定してください")
+
+        self._timestep: float = timestep
+        self._timestep_ns: int = timestep_ns
+        self._max_steps: int = max_steps
+        self._accumulator_ns: int = 0
+
+    def advance(self, frame_time: float) -> int:
+        """フレームの経過時間を積算し、必要な更新回数を返す
+
+        Parameters
+        ----------
+        frame_time : float
+            前回のフレームからの経過時間 [sec]
+
+        Returns
+        -------
+        steps : int
+            今回のフレームで行う更新回数
+        """
+        if frame_time < 0:
+            raise ValueError("経過時間に負の値は指定できません")
+
+        self._accumulator_ns += round(frame_time * 1_000_000_000)
+        steps, self._accumulator_ns = divmod(
+            self._accumulator_ns, self._timestep_ns
+        )
+        # 上限を超えた分の時間は破棄する (ゲーム内の時間が遅れる)
+        return min(steps, self._max_steps)
+
+    def reset(self) -> None:
+        """繰り越した端数を破棄する"""
+        self._accumulator_ns = 0
+
+    @property
+    def timestep(self) -> float:
+        return self._timestep
+
+    @property
+    def max_steps(self) -> int:
+        return self._max_steps
+
+    @property
+    def alpha(self) -> float:
+        return self._accumulator_ns / self._timestep_ns
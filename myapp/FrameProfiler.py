@@ -0,0 +1,194 @@
+import csv
+import json
+import os
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+# 保持するフレーム数の既定値
+FRAME_PROFILER_HISTORY: int = 600
+# 集計するパーセンタイル
+FRAME_PROFILER_PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+class FrameProfiler:
+    """フレームの処理時間を処理段階ごとに計測するプロファイラ
+
+    1フレームの処理を段階に分け、段階の終わりごとにlapを呼び出して
+    前回のlapからの経過時間をその段階の処理時間として記録する
+    直近のフレームの処理時間をリングバッファに保持し、
+    パーセンタイルを集計する
+
+    計測は時刻の取得と配列への書き込みのみで、フレームごとに
+    オブジェクトを生成しない
+
+    Attributes
+    ----------
+    phases : tuple[str, ...]
+        処理段階名 (処理順)
+    history : int
+        保持するフレーム数
+    frame_count : int
+        計測したフレーム数
+    """
+
+    def __init__(
+        self,
+        phases: tuple[str, ...],
+        history: int = FRAME_PROFILER_HISTORY,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        phases : tuple[str, ...]
+            処理段階名 (処理順)
+        history : int
+            保持するフレーム数
+        clock : Callable[[], float]
+            現在時刻 [sec] を返す関数
+        """
+        if not phases:
+            raise ValueError("処理段階を1つ以上指定してください")
+        if len(set(phases)) != len(phases):
+            raise ValueError("処理段階名が重複しています")
+        if history <= 0:
+            raise ValueError("保持するフレーム数には1以上を指定してください")
+
+        self._phases: tuple[str, ...] = tuple(phases)
+        self._phase_index: dict[str, int] = {
+            phase: i for i, phase in enumerate(self._phases)
+        }
+        self._history: int = history
+        self._clock: Callable[[], float] = clock
+
+        # 処理時間 [sec] (行: フレーム, 列: 処理段階)
+        self._samples: np.ndarray = np.zeros(
+            (history, len(self._phases)), dtype=np.float64
+        )
+        self._current: np.ndarray = np.zeros(
+            len(self._phases), dtype=np.float64
+        )
+        self._frame_count: int = 0
+        self._last_lap: float = self._clock()
+
+    def lap(self, phase: str) -> None:
+        """前回のlapからの経過時間を処理段階の処理時間として記録する
+
+        1フレームの間に同じ処理段階を複数回記録した場合は合算する
+
+        Parameters
+        ----------
+        phase : str
+            終了した処理段階名
+        """
+        now = self._clock()
+        self._current[self._phase_index[phase]] += now - self._last_lap
+        self._last_lap = now
+
+    def end_frame(self) -> None:
+        """現在のフレームの計測を終了し、リングバッファに記録する"""
+        self._samples[self._frame_count % self._history] = self._current
+        self._current[:] = 0.0
+        self._frame_count += 1
+
+    def get_samples(self) -> np.ndarray:
+        """保持している処理時間を古い順に返す
+
+        Returns
+        -------
+        samples : np.ndarray
+            処理時間 [sec] (行: フレーム, 列: 処理段階)
+        """
+        if self._frame_count <= self._history:
+            return self._samples[: self._frame_count].copy()
+
+        # 最も古いフレームが先頭になるよう並べ替える
+        return np.roll(
+            self._samples, -(self._frame_count % self._history), axis=0
+        )
+
+    def get_summary(
+        self, percentiles: tuple[int, ...] = FRAME_PROFILER_PERCENTILES
+    ) -> dict[str, dict[str, float]]:
+        """処理段階ごとの処理時間の統計値を返す
+
+        Parameters
+        ----------
+        percentiles : tuple[int, ...]
+            集計するパーセンタイル
+
+        Returns
+        -------
+        summary : dict[str, dict[str, float]]
+            処理段階名 (全体は"frame") ごとの統計値 [msec]
+            ("p50"などのパーセンタイル, "mean", "max")
+        """
+        samples = self.get_samples()
+        if len(samples) == 0:
+            return {}
+
+        # 各処理段階と、フレーム全体の処理時間
+        columns = np.column_stack([samples, samples.sum(axis=1)]) * 1000.0
+        names = (*self._phases, "frame")
+        values = np.percentile(columns, percentiles, axis=0)
+
+        summary: dict[str, dict[str, float]] = {}
+        for i, name in enumerate(names):
+            stats = {
+                f"p{percentile}": float(values[j, i])
+                for j, percentile in enumerate(percentiles)
+            }
+            stats["mean"] = float(columns[:, i].mean())
+            stats["max"] = float(columns[:, i].max())
+            summary[name] = stats
+
+        return summary
+
+    def save_csv(self, path: str) -> None:
+        """保持しているフレームごとの処理時間をCSVファイルに保存する
+
+        Parameters
+        ----------
+        path : str
+            保存先のファイルパス
+        """
+        samples = self.get_samples() * 1000.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{phase}_ms" for phase in self._phases])
+            writer.writerows(samples.tolist())
+
+    def save_json(self, path: str) -> None:
+        """処理段階ごとの処理時間の統計値をJSONファイルに保存する
+
+        Parameters
+        ----------
+        path : str
+            保存先のファイルパス
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "frames": min(self._frame_count, self._history),
+                    "unit": "ms",
+                    "phases": self.get_summary(),
+                },
+                f,
+                indent=2,
+            )
+
+    @property
+    def phases(self) -> tuple[str, ...]:
+        return self._phases
+
+    @property
+    def history(self) -> int:
+        return self._history
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
@@ -0,0 +1,180 @@
+import time
+from collections.abc import Callable
+
+# 待機の最後に空ループで待つ時間 [sec] (sleepの起床遅れを吸収する)
+FRAME_SPIN_THRESHOLD: float = 0.001
+# 待機中に入力を取得する間隔 [sec]
+FRAME_POLL_INTERVAL: float = 0.001
+
+
+class FrameScheduler:
+    """フレーム間隔の調整を行うスケジューラ
+
+    次のフレームの開始時刻までの待ち時間の大部分をsleepで待ち、
+    sleepの起床遅れが問題になる最後の僅かな時間のみ空ループで待つ
+    (Clock.tick_busy_loopのように待ち時間の間CPUを占有しない)
+
+    フレームの開始時刻は前回の開始時刻にフレーム間隔を加えて決めるため、
+    sleepの起床遅れが積み重なってフレームレートが下がることはない
+    処理落ちで1フレーム以上遅れた場合は現在時刻から数え直す
+
+    待機中 (idle) はフレームレートを待機時フレームレートまで下げる
+
+    入力取得関数を指定した場合は、sleepを一定間隔に区切って
+    その都度呼び出す (入力の時刻をフレーム間隔より細かく記録するため)
+
+    Attributes
+    ----------
+    framerate : int | None
+        フレームレート (Noneの場合は制限しない)
+    idle_framerate : int | None
+        待機中のフレームレート (Noneの場合は待機中も下げない)
+    frame_time : float
+        前回のフレームからの経過時間 [sec]
+    last_tick : float
+        前回のフレームの開始時刻 [sec]
+    """
+
+    def __init__(
+        self,
+        framerate: int | None,
+        idle_framerate: int | None = None,
+        spin_threshold: float = FRAME_SPIN_THRESHOLD,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+        poll: Callable[[], None] | None = None,
+        poll_interval: float = FRAME_POLL_INTERVAL,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        framerate : int | None
+            フレームレート (Noneの場合は制限しない)
+        idle_framerate : int | None
+            待機中のフレームレート (Noneの場合は待機中も下げない)
+        spin_threshold : float
+            待機の最後に空ループで待つ時間 [sec]
+        clock : Callable[[], float]
+            現在時刻 [sec] を返す関数
+        sleep : Callable[[float], None]
+            指定時間 [sec] 待機する関数
+        poll : Callable[[], None] | None
+            待機中に呼び出す入力取得関数 (Noneの場合は呼び出さない)
+        poll_interval : float
+            入力取得関数を呼び出す間隔 [sec]
+        """
+        for value in (framerate, idle_framerate):
+            if value is not None and value <= 0:
+                raise ValueError(
+                    "フレームレートには1以上またはNoneを指定してください"
+                )
+        if spin_threshold < 0:
+            raise ValueError("空ループで待つ時間に負の値は指定できません")
+        if poll_interval <= 0:
+            raise ValueError("入力を取得する間隔には正の値を指定してください")
+
+        self._framerate: int | None = framerate
+        self._idle_framerate: int | None = idle_framerate
+        self._spin_threshold: float = spin_threshold
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], None] = sleep
+        self._poll: Callable[[], None] | None = poll
+        self._poll_interval: float = poll_interval
+
+        now = self._clock()
+        self._last_tick: float = now
+        self._deadline: float = now
+        self._frame_time: float = 0.0
+
+    def _get_interval(self, idle: bool) -> float:
+        """目標のフレーム間隔を返す
+
+        Parameters
+        ----------
+        idle : bool
+            待機中であればTrue
+
+        Returns
+        -------
+        interval : float
+            フレーム間隔 [sec] (制限しない場合は0)
+        """
+        framerate = self._framerate
+        if idle and self._idle_framerate is not None:
+            if framerate is None:
+                framerate = self._idle_framerate
+            else:
+                framerate = min(framerate, self._idle_framerate)
+
+        if framerate is None:
+            return 0.0
+
+        return 1.0 / framerate
+
+    def _wait_until(self, deadline: float) -> None:
+        """指定時刻まで待機する
+
+        Parameters
+        ----------
+        deadline : float
+            待機を終える時刻 [sec]
+        """
+        remaining = deadline - self._clock()
+        while remaining > self._spin_threshold:
+            if self._poll is None:
+                self._sleep(remaining - self._spin_threshold)
+                break
+            self._sleep(
+                min(remaining - self._spin_threshold, self._poll_interval)
+            )
+            self._poll()
+            remaining = deadline - self._clock()
+        while self._clock() < deadline:
+            pass
+
+    def tick(self, idle: bool = False) -> float:
+        """次のフレームの開始時刻まで待機する
+
+        Parameters
+        ----------
+        idle : bool
+            待機中であればTrue (待機時フレームレートで待つ)
+
+        Returns
+        -------
+        frame_time : float
+            前回のフレームからの経過時間 [sec]
+        """
+        interval = self._get_interval(idle)
+        if interval > 0.0:
+            deadline = self._deadline + interval
+            now = self._clock()
+            if deadline < now - interval:
+                # 処理落ちで1フレーム以上遅れた場合は現在時刻から数え直す
+                deadline = now
+            self._wait_until(deadline)
+            self._deadline = deadline
+
+        now = self._clock()
+        if interval <= 0.0:
+            self._deadline = now
+        self._frame_time = now - self._last_tick
+        self._last_tick = now
+
+        return self._frame_time
+
+    @property
+    def framerate(self) -> int | None:
+        return self._framerate
+
+    @property
+    def idle_framerate(self) -> int | None:
+        return self._idle_framerate
+
+    @property
+    def frame_time(self) -> float:
+        return self._frame_time
+
+    @property
+    def last_tick(self) -> float:
+        return self._last_tick
@@ -1,10 +1,29 @@
+import os
 import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
 
+import config
 import GameData
+import numpy as np
 import pygame
+import Tracer
 import Utility
+from cv2.typing import MatLike
+from FixedTimestep import FixedTimestep
+from FrameProfiler import FrameProfiler
+from FrameScheduler import FrameScheduler
+from GameJournal import GameJournal, create_session_directory
+from InputRecording import InputRecording
+from ProfileRecorder import ProfileRecorder
+from Reel import Reel
 from Slot import Slot
 from Symbol import Symbol
+from TextCache import TextCache
+
+tracer = Tracer.get_tracer()
 
 
 class Game:
@@ -32,49 +51,299 @@ class Game:
         self._name: str = name
 
         pygame.init()
-        self._screen = pygame.display.set_mode(
-            (GameData.SCREEN_WIDTH, GameData.SCREEN_HEIGHT)
-        )
+        self._vsync: bool = GameData.VSYNC
+        self._screen = self._set_display_mode()
         pygame.display.set_caption(self._name)
-        self._clock = pygame.time.Clock()
+
+        # 取得時刻を記録した入力イベント (取得時刻[sec], イベント)
+        self._input_events: deque[tuple[float, pygame.event.Event]] = deque()
+
+        # 垂直同期が有効な場合は描画中のフレーム間隔を垂直同期に任せ、
+        # 待機中のフレームレートのみスケジューラで制限する
+        # フレーム間の待機中も入力を取得し、押した時刻を細かく記録する
+        self._frame_scheduler = FrameScheduler(
+            framerate=None if self._vsync else GameData.FRAMERATE_LIMIT,
+            idle_framerate=GameData.IDLE_FRAMERATE_LIMIT,
+            poll=self._poll_input_while_waiting,
+            poll_interval=GameData.INPUT_POLL_INTERVAL,
+        )
 
         self._system_font = pygame.font.Font(
             GameData.FONT_MPLUS1_FILE_PATH, 16
         )
 
-        self._framerate_limit: int | None = GameData.FRAMERATE_LIMIT
+        # 文字列描画キャッシュ (固定の表示文字列は事前に描画しておく)
+        self._text_cache = TextCache()
+        self._text_cache.preload(
+            self._system_font,
+            ["CREDIT: ", "PAY: "],
+            True,
+            GameData.Color.white,
+        )
+        for color in (GameData.Color.white, GameData.Color.gray):
+            self._text_cache.preload(
+                self._system_font,
+                ["REP", "WAIT", "START", "3BET", "2BET", "1BET"],
+                True,
+                color,
+            )
+
+        # slot (起動ごとのジャーナルに遊技ごとの記録を追記し、
+        # 乱数シードとボタン入力を再生用に記録する)
+        seed = np.random.SeedSequence().entropy
+        self._journal = GameJournal(
+            create_session_directory(config.JOURNAL_DIR),
+            session={"seed": seed},
+        )
+        self._input_recording = InputRecording(seed=seed)
+        self._slot = Slot(
+            rng=np.random.default_rng(seed),
+            journal=self._journal,
+            recorder=self._input_recording,
+        )
 
-        # slot
-        self._slot = Slot()
+        # ゲーム状態は描画のフレームレートによらず固定の刻み幅で更新する
+        self._fixed_timestep = FixedTimestep(
+            timestep=GameData.LOGIC_TIMESTEP,
+            max_steps=GameData.LOGIC_MAX_STEPS,
+        )
+        # 現在のゲーム状態に対応する時刻[sec] (入力の時刻の換算に使用する)
+        self._logic_wall_time: float = self._frame_scheduler.last_tick
+        # 直前の更新前のリール座標 (描画時の補間に使用する)
+        self._previous_reel_coords_fixed: list[int] = [
+            reel.current_coord_fixed for reel in self._slot.reel
+        ]
+        # 描画するリール座標 (固定小数点)
+        self._reel_coords_fixed: list[int] = list(
+            self._previous_reel_coords_fixed
+        )
 
         # リール描画用リール画像 (OpenCV → pygame)
-        self._left_reel_image = Utility.cv2_to_pygame_surface(
+        self._left_reel_image = self._get_reel_surface(
             self._slot.reel[0].reel_image
         )
-        self._center_reel_image = Utility.cv2_to_pygame_surface(
+        self._center_reel_image = self._get_reel_surface(
             self._slot.reel[1].reel_image
         )
-        self._right_reel_image = Utility.cv2_to_pygame_surface(
+        self._right_reel_image = self._get_reel_surface(
             self._slot.reel[2].reel_image
         )
 
+        # フレームの処理段階ごとの処理時間の計測
+        self._frame_profiler = FrameProfiler(
+            phases=(
+                "event",
+                "update",
+                "reel_draw",
+                "ui_draw",
+                "display",
+                "input",
+                "wait",
+            )
+        )
+        # 処理時間の表示の有無
+        self._profiler_overlay: bool = GameData.FRAME_PROFILER_OVERLAY
+        # 表示中の処理時間の文字列
+        self._profiler_overlay_lines: tuple[str, ...] = ()
+
+        # 指定フレーム数の間のcProfileによる計測
+        self._profile_recorder = ProfileRecorder(
+            frames=GameData.PROFILE_FRAMES
+        )
+        if config.PROFILE_FRAMES_ON_START > 0:
+            self._profile_recorder.start(frames=config.PROFILE_FRAMES_ON_START)
+
+        # 差分描画用
+        # 画面全体の再描画要求
+        self._full_redraw: bool = True
+        # 描画要素ごとの前回描画時の状態
+        self._drawn_states: dict[str, object] = {}
+        # 描画要素ごとの前回描画した領域
+        self._drawn_rects: dict[str, pygame.Rect] = {}
+        # 今回のフレームで再描画した領域
+        self._dirty_rects: list[pygame.Rect] = []
+
+    def _get_reel_surface(self, reel_image: MatLike) -> pygame.Surface:
+        """描画用のリール画像を生成する
+
+        表示窓を1回の描画で切り出せるよう、末尾に先頭の図柄を
+        折り返して追加する
+
+        Parameters
+        ----------
+        reel_image : MatLike
+            リール画像 (OpenCV)
+
+        Returns
+        -------
+        reel_surface : pygame.Surface
+            描画用のリール画像
+        """
+        padded_image = Utility.get_wraparound_padded_image(
+            reel_image, GameData.REEL_PADDING_SYMBOLS * GameData.SYMBOL_HEIGHT
+        )
+
+        # 描画時に変換が発生しないよう表示用のピクセル形式にしておく
+        return Utility.convert_to_display_format(
+            Utility.cv2_to_pygame_surface(padded_image)
+        )
+
     def game_quit(self) -> None:
         """ゲームを終了する"""
+        if GameData.FRAME_PROFILER_DUMP:
+            self._save_frame_profile()
+        if tracer.enabled:
+            self._save_trace()
+        self._profile_recorder.stop()
         pygame.quit()
+        # 遊技の記録はmain_loopの終了時に保存する
         sys.exit()
 
+    def _close_records(self) -> None:
+        """遊技の記録を保存して終了する
+
+        例外で終了した場合も不具合の調査に使用できるよう、
+        main_loopの終了時に必ず呼び出す
+        """
+        self._journal.close()
+        self._save_input_recording()
+
+    def _save_frame_profile(self) -> None:
+        """フレームの処理時間をログ出力先に保存する
+
+        フレームごとの処理時間をCSV、処理段階ごとの統計値をJSONで保存する
+        """
+        if self._frame_profiler.frame_count == 0:
+            return
+
+        now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        path = os.path.join(config.LOG_DIR, f"frame_profile_{now}")
+        self._frame_profiler.save_csv(f"{path}.csv")
+        self._frame_profiler.save_json(f"{path}.json")
+
+    def _save_trace(self) -> None:
+        """記録したトレースをログ出力先に保存し、破棄する"""
+        if tracer.count == 0:
+            return
+
+        now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        tracer.save(os.path.join(config.LOG_DIR, f"trace_{now}.json"))
+        tracer.clear()
+
+    def _save_input_recording(self) -> None:
+        """乱数シードとボタン入力の記録を保存する"""
+        if not self._input_recording.events:
+            return
+
+        self._input_recording.finish(self._slot)
+        now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self._input_recording.save(
+            os.path.join(config.RECORDING_DIR, f"recording_{now}.json")
+        )
+
     def _gameevent_update(self) -> None:
         """イベントを検知し更新する"""
+        self._poll_input()
+
+    def _poll_input(self) -> None:
+        """イベントを取得する
+
+        キー入力は取得時刻を記録して保持し、ゲーム状態の更新時に
+        押した時刻に対応する更新の中で処理する
+        """
+        timestamp = time.perf_counter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.game_quit()
-            elif event.type == pygame.KEYDOWN:
-                self._keydown_event(event)
-            elif event.type == pygame.KEYUP:
+            elif event.type == pygame.WINDOWEXPOSED:
+                # ウィンドウの再表示時は画面全体を描画し直す
+                self._full_redraw = True
+            elif event.type == pygame.KEYDOWN and self._debug_keydown_event(
+                event
+            ):
+                # 計測用のキーはゲームの入力として扱わない
+                continue
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                self._input_events.append((timestamp, event))
+
+    def _poll_input_while_waiting(self) -> None:
+        """フレーム間の待機中にイベントを取得する
+
+        イベントの取得時間は待機時間に含めず、inputの処理時間として計測する
+        """
+        self._frame_profiler.lap("wait")
+        self._poll_input()
+        self._frame_profiler.lap("input")
+
+    def _debug_keydown_event(self, event: pygame.event.Event) -> bool:
+        """計測用のキー押下時の処理
+
+        Parameters
+        ----------
+        event : pygame.event.Event
+            キー押下イベント
+
+        Returns
+        -------
+        handled : bool
+            計測用のキーであればTrue
+        """
+        if event.key == pygame.K_F3:
+            # 処理時間の表示を切り替える (消去のため画面全体を描画し直す)
+            self._profiler_overlay = not self._profiler_overlay
+            self._full_redraw = True
+            return True
+        if event.key == pygame.K_F4:
+            # トレースの記録を切り替える (停止時に記録した区間を保存する)
+            if tracer.enabled:
+                tracer.enabled = False
+                self._save_trace()
+            else:
+                tracer.clear()
+                tracer.enabled = True
+            return True
+        if event.key == pygame.K_F5:
+            # cProfileによる計測を開始する (計測中は終了する)
+            self._profile_recorder.toggle()
+            return True
+
+        return False
+
+    @tracer.traced("Game.dispatch_input")
+    def _dispatch_input_events(
+        self, step_start: float, step_end: float
+    ) -> None:
+        """1回の更新の間に取得したキー入力を処理する
+
+        Parameters
+        ----------
+        step_start : float
+            更新前のゲーム状態に対応する時刻[sec]
+        step_end : float
+            更新後のゲーム状態に対応する時刻[sec]
+        """
+        input_events = self._input_events
+        while input_events and input_events[0][0] < step_end:
+            timestamp, event = input_events.popleft()
+            # 更新前の状態からの経過時間 (更新前に取得したものは0とする)
+            elapsed = max(timestamp - step_start, 0.0)
+            if event.type == pygame.KEYDOWN:
+                self._keydown_event(event, elapsed)
+            else:
                 self._keyup_event(event)
 
-    def _keydown_event(self, event: pygame.event.Event) -> None:
-        """コメント"""
+    def _keydown_event(
+        self, event: pygame.event.Event, elapsed: float = 0.0
+    ) -> None:
+        """キー押下時の処理
+
+        Parameters
+        ----------
+        event : pygame.event.Event
+            キー押下イベント
+        elapsed : float
+            キーを押した時刻の前回の更新からの経過時間[sec]
+        """
         if event.key == pygame.K_1:
             # ONEBET BUTTON
             self._slot.onebet_keydown()
@@ -87,13 +356,13 @@ class Game:
         else:
             if event.key == pygame.K_LEFT:
                 # LEFTREEL-STOP BUTTON
-                self._slot.leftreelstop_keydown()
+                self._slot.leftreelstop_keydown(elapsed)
             if event.key == pygame.K_DOWN:
                 # CENTERREEL-STOP BUTTON
-                self._slot.centerreelstop_keydown()
+                self._slot.centerreelstop_keydown(elapsed)
             if event.key == pygame.K_RIGHT:
                 # RIGHTREEL-STOP BUTTON
-                self._slot.rightreelstop_keydown()
+                self._slot.rightreelstop_keydown(elapsed)
 
     def _keyup_event(self, event: pygame.event.Event) -> None:
         """コメント"""
@@ -117,22 +386,44 @@ class Game:
                 # RIGHTREEL-STOP BUTTON
                 self._slot.rightreelstop_keyup()
 
+    def _set_display_mode(self) -> pygame.Surface:
+        """displayオブジェクトを生成する
+
+        垂直同期が有効な場合は垂直同期付きで生成し、
+        垂直同期を利用できない環境では垂直同期なしで生成し直す
+
+        Returns
+        -------
+        screen : pygame.Surface
+            displayオブジェクトのSurface
+        """
+        size = (GameData.SCREEN_WIDTH, GameData.SCREEN_HEIGHT)
+        if self._vsync:
+            try:
+                # 垂直同期はSCALEDまたはOPENGL指定時のみ有効
+                return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            except pygame.error:
+                self._vsync = False
+
+        return pygame.display.set_mode(size)
+
+    def _is_idle(self) -> bool:
+        """リール停止中でBET処理も再描画もない待機中であればTrueを返す"""
+        return not (
+            self._slot.gaming or self._slot.beting or self._dirty_rects
+        )
+
     def _clock_update(self) -> float:
-        """clockを更新する
+        """次のフレームまで待機する
+
+        待機中は待機時フレームレートまでフレームレートを下げる
 
         Returns
         -------
         ticktime_sec: float
-            前回tick命令実行からの経過時間[sec]
+            前回のフレームからの経過時間[sec]
         """
-        if GameData.FRAMERATE_LIMIT is None:
-            ticktime_msec = self._clock.tick_busy_loop()
-        else:
-            ticktime_msec = self._clock.tick_busy_loop(
-                GameData.FRAMERATE_LIMIT
-            )
-
-        ticktime_sec = ticktime_msec / 1000.0
+        ticktime_sec = self._frame_scheduler.tick(idle=self._is_idle())
 
         return ticktime_sec
 
@@ -144,27 +435,102 @@ class Game:
         timedelta_sec: float
             前回tick命令実行からの経過時間[sec]
         """
-        timedelta_msec = self._clock.get_time()
-
-        timedelta_sec = timedelta_msec / 1000.0
+        timedelta_sec = self._frame_scheduler.frame_time
 
         return timedelta_sec
 
+    @tracer.traced("Game.game_update")
     def _game_update(self) -> None:
-        """ゲーム状態を更新する"""
+        """ゲーム状態を更新する
+
+        前回からの経過時間を積算し、固定の刻み幅で必要な回数だけ
+        ゲーム状態を更新する (処理落ち時は複数回更新して追いつく)
+        キー入力は押した時刻を含む更新の直前に、更新前の状態からの
+        経過時間とともに処理する
+        描画するリール座標は直前の更新前後の座標を端数の割合で補間する
+        """
         timedelta_sec = self._get_ticktime()
-        self._slot.update(timedelta_sec)
+        steps = self._fixed_timestep.advance(timedelta_sec)
+        timestep = self._fixed_timestep.timestep
+        reel = self._slot.reel
+        for i in range(steps):
+            step_start = self._logic_wall_time + i * timestep
+            self._dispatch_input_events(step_start, step_start + timestep)
+            self._previous_reel_coords_fixed = [
+                reel[0].current_coord_fixed,
+                reel[1].current_coord_fixed,
+                reel[2].current_coord_fixed,
+            ]
+            self._slot.update(timestep)
+        # 繰り越した端数の分だけゲーム状態は現在時刻より遅れている
+        self._logic_wall_time = (
+            self._frame_scheduler.last_tick
+            - self._fixed_timestep.alpha * timestep
+        )
+
+        alpha = self._fixed_timestep.alpha
+        self._reel_coords_fixed = [
+            self._get_interpolated_coord_fixed(previous, reel[i], alpha)
+            for i, previous in enumerate(self._previous_reel_coords_fixed)
+        ]
+
+    def _get_interpolated_coord_fixed(
+        self, previous: int, reel: Reel, alpha: float
+    ) -> int:
+        """直前の更新前後のリール座標を補間した座標を返す
+
+        Parameters
+        ----------
+        previous : int
+            直前の更新前のリール座標 (固定小数点)
+        reel : Reel
+            対象リール
+        alpha : float
+            補間の割合 (0: 更新前, 1: 更新後)
+
+        Returns
+        -------
+        coord_fixed : int
+            補間したリール座標 (固定小数点)
+        """
+        current = reel.current_coord_fixed
+        if current == previous:
+            return current
+
+        # リールは座標が増える方向にのみ回転するため、1周で折り返した
+        # 場合も含めて進んだ移動量で補間する
+        reel_units = GameData.REEL_UNITS
+        distance = (current - previous) % reel_units
+
+        return (previous + int(distance * alpha)) % reel_units
 
+    @tracer.traced("Game.screen_update")
     def _screen_update(self) -> None:
-        """Surfaceオブジェクトを更新する"""
-        self._screen_fill_black(screen=self._screen)
+        """Surfaceオブジェクトを更新する
+
+        前回から表示内容が変化した要素だけを再描画し、再描画した領域を
+        displayの更新対象として記録する
+        """
+        self._dirty_rects = []
+        if self._full_redraw:
+            self._screen_fill_black(screen=self._screen)
+            self._drawn_states.clear()
+            self._drawn_rects.clear()
+            self._dirty_rects.append(self._screen.get_rect())
+            self._full_redraw = False
+
         self._screen_draw_reel(
             screen=self._screen,
             left_reel_image=self._left_reel_image,
             center_reel_image=self._center_reel_image,
             right_reel_image=self._right_reel_image,
         )
+        self._frame_profiler.lap("reel_draw")
+
         self._screen_draw_ui(screen=self._screen)
+        if self._profiler_overlay:
+            self._screen_draw_profiler_overlay(screen=self._screen)
+        self._frame_profiler.lap("ui_draw")
 
     def _screen_fill_black(self, screen: pygame.Surface) -> None:
         """画面を黒で塗りつぶす
@@ -176,13 +542,49 @@ class Game:
         """
         screen.fill(color=GameData.Color.black)
 
+    def _draw_if_changed(
+        self,
+        key: str,
+        state: object,
+        draw: Callable[..., pygame.Rect],
+        **kwargs,
+    ) -> None:
+        """描画要素の状態が前回から変化した場合のみ再描画する
+
+        Parameters
+        ----------
+        key : str
+            描画要素名
+        state : object
+            描画内容を決める状態 (前回と等しければ描画しない)
+        draw : Callable[..., pygame.Rect]
+            描画関数 (描画した領域を返す)
+        **kwargs
+            描画関数に渡す引数
+        """
+        if key in self._drawn_states and self._drawn_states[key] == state:
+            return
+
+        # 前回描画した領域を消去してから描画する
+        drawn_rect = self._drawn_rects.get(key)
+        if drawn_rect is not None:
+            self._screen.fill(GameData.Color.black, drawn_rect)
+        rect = draw(**kwargs)
+
+        self._drawn_states[key] = state
+        self._drawn_rects[key] = rect
+        self._dirty_rects.append(
+            rect if drawn_rect is None else rect.union(drawn_rect)
+        )
+
+    @tracer.traced("Game.draw_reel")
     def _draw_reel(
         self,
         screen: pygame.Surface,
         reel_image: pygame.Surface,
-        cur_coord: float,
+        cur_coord_fixed: int,
         reel_draw_offset_x: int,
-    ) -> None:
+    ) -> pygame.Rect:
         """リール描画
 
         Parameters
@@ -190,59 +592,46 @@ class Game:
         screen : pygame.Surface
             描画対象のSurfaceオブジェクト
         reel_image : pygame.Surface
-            リール画像
-        cur_coord : float
-            現在座標
+            描画用のリール画像 (末尾に折り返しの余白あり)
+        cur_coord_fixed : int
+            現在座標 (固定小数点)
         reel_draw_offset_x : int
             X方向のオフセット
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        reel_height = GameData.REEL_HEIGHT
-        common_offset_X = GameData.REEL_DRAW_COMMON_OFFSET_X
-        common_offset_Y = GameData.REEL_DRAW_COMMON_OFFSET_Y
-
-        if 0 <= cur_coord <= GameData.REEL_FRAME_BOTTOM:
-            screen.blit(
-                reel_image,
-                (
-                    common_offset_X + reel_draw_offset_x,
-                    common_offset_Y + cur_coord - reel_height * 1,
-                ),
-            )
-            screen.blit(
-                reel_image,
-                (
-                    common_offset_X + reel_draw_offset_x,
-                    common_offset_Y + cur_coord - reel_height * 0,
-                ),
-            )
-        elif GameData.REEL_FRAME_BOTTOM < cur_coord <= GameData.REEL_FRAME_TOP:
-            # この場合は1枚のリール画像のみでよい
-            screen.blit(
-                reel_image,
-                (
-                    common_offset_X + reel_draw_offset_x,
-                    common_offset_Y + cur_coord - reel_height * 1,
-                ),
-            )
-        else:
-            screen.blit(
-                reel_image,
-                (
-                    common_offset_X + reel_draw_offset_x,
-                    common_offset_Y + cur_coord - reel_height * 2,
-                ),
-            )
-            screen.blit(
-                reel_image,
-                (
-                    common_offset_X + reel_draw_offset_x,
-                    common_offset_Y + cur_coord - reel_height * 1,
-                ),
-            )
+        # 固定小数点座標を整数のピクセル座標に変換する
+        cur_coord = cur_coord_fixed >> GameData.SUBPIXEL_BITS
+
+        # 表示窓の上端に対応するリール画像上の座標
+        # (中段の上端に現在座標の位置のリール画像を描画する)
+        area_top = (
+            GameData.REEL_WINDOW_TOP
+            - GameData.REEL_DRAW_COMMON_OFFSET_Y
+            - cur_coord
+        ) % GameData.REEL_HEIGHT
+
+        # 表示窓の範囲だけを1回で描画する
+        return screen.blit(
+            reel_image,
+            (
+                GameData.REEL_DRAW_COMMON_OFFSET_X + reel_draw_offset_x,
+                GameData.REEL_WINDOW_TOP,
+            ),
+            area=pygame.Rect(
+                0,
+                area_top,
+                GameData.REEL_WIDTH,
+                GameData.REEL_WINDOW_HEIGHT,
+            ),
+        )
 
     def _screen_draw_left_reel(
         self, screen: pygame.Surface, left_reel_image: pygame.Surface
-    ) -> None:
+    ) -> pygame.Rect:
         """左リールを描画する
 
         Parameters
@@ -251,17 +640,22 @@ class Game:
             描画対象のSurfaceオブジェクト
         left_reel_image : pygame.Surface
             左リール画像
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        self._draw_reel(
+        return self._draw_reel(
             screen=screen,
             reel_image=left_reel_image,
-            cur_coord=self._slot.reel[0].current_coord,
+            cur_coord_fixed=self._reel_coords_fixed[0],
             reel_draw_offset_x=GameData.REEL_DRAW_LEFT_OFFSET_X,
         )
 
     def _screen_draw_center_reel(
         self, screen: pygame.Surface, center_reel_image: pygame.Surface
-    ) -> None:
+    ) -> pygame.Rect:
         """中リールを描画する
 
         Parameters
@@ -270,17 +664,22 @@ class Game:
             描画対象のSurfaceオブジェクト
         center_reel_image : pygame.Surface
             中リール画像
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        self._draw_reel(
+        return self._draw_reel(
             screen=screen,
             reel_image=center_reel_image,
-            cur_coord=self._slot.reel[1].current_coord,
+            cur_coord_fixed=self._reel_coords_fixed[1],
             reel_draw_offset_x=GameData.REEL_DRAW_CENTER_OFFSET_X,
         )
 
     def _screen_draw_right_reel(
         self, screen: pygame.Surface, right_reel_image: pygame.Surface
-    ) -> None:
+    ) -> pygame.Rect:
         """右リールを描画する
 
         Parameters
@@ -289,60 +688,19 @@ class Game:
             描画対象のSurfaceオブジェクト
         right_reel_image : pygame.Surface
             右リール画像
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        self._draw_reel(
+        return self._draw_reel(
             screen=screen,
             reel_image=right_reel_image,
-            cur_coord=self._slot.reel[2].current_coord,
+            cur_coord_fixed=self._reel_coords_fixed[2],
             reel_draw_offset_x=GameData.REEL_DRAW_RIGHT_OFFSET_X,
         )
 
-    def _screen_draw_upper_reelcover(self, screen: pygame.Surface) -> None:
-        """リール上側を黒で塗りつぶす
-
-        Parameters
-        ----------
-        screen : pygame.Surface
-            描画対象のSurfaceオブジェクト
-        """
-        pygame.draw.rect(
-            screen,
-            GameData.Color.black,
-            (
-                0,
-                0,
-                GameData.SCREEN_WIDTH,
-                int(
-                    GameData.SCREEN_HEIGHT / 2
-                    - GameData.SYMBOL_HEIGHT * 3 / 2
-                    - GameData.REEL_OUTSIDE_DRAW_RANGE
-                ),
-            ),
-        )
-
-    def _screen_draw_lower_reelcover(self, screen: pygame.Surface) -> None:
-        """リール下側を黒で塗りつぶす
-
-        Parameters
-        ----------
-        screen : pygame.Surface
-            描画対象のSurfaceオブジェクト
-        """
-        pygame.draw.rect(
-            screen,
-            GameData.Color.black,
-            (
-                0,
-                int(
-                    GameData.SCREEN_HEIGHT / 2
-                    + GameData.SYMBOL_HEIGHT * 3 / 2
-                    + GameData.REEL_OUTSIDE_DRAW_RANGE
-                ),
-                GameData.SCREEN_WIDTH,
-                GameData.SCREEN_HEIGHT,
-            ),
-        )
-
     def _screen_draw_reel(
         self,
         screen: pygame.Surface,
@@ -363,37 +721,161 @@ class Game:
         right_reel_image : pygame.Surface
             右リール画像
         """
-        self._screen_draw_left_reel(
-            screen=screen, left_reel_image=left_reel_image
+        # リールは描画上の座標 (ピクセル) が変化した場合のみ再描画する
+        subpixel_bits = GameData.SUBPIXEL_BITS
+        reel_coords_fixed = self._reel_coords_fixed
+        self._draw_if_changed(
+            "left_reel",
+            reel_coords_fixed[0] >> subpixel_bits,
+            self._screen_draw_left_reel,
+            screen=screen,
+            left_reel_image=left_reel_image,
         )
-        self._screen_draw_center_reel(
-            screen=screen, center_reel_image=center_reel_image
+        self._draw_if_changed(
+            "center_reel",
+            reel_coords_fixed[1] >> subpixel_bits,
+            self._screen_draw_center_reel,
+            screen=screen,
+            center_reel_image=center_reel_image,
         )
-        self._screen_draw_right_reel(
-            screen=screen, right_reel_image=right_reel_image
+        self._draw_if_changed(
+            "right_reel",
+            reel_coords_fixed[2] >> subpixel_bits,
+            self._screen_draw_right_reel,
+            screen=screen,
+            right_reel_image=right_reel_image,
         )
-        self._screen_draw_upper_reelcover(screen=screen)
-        self._screen_draw_lower_reelcover(screen=screen)
 
     def _screen_draw_ui(self, screen: pygame.Surface):
         """UIを描画する"""
-        self._screen_draw_ui_credit(screen=screen, credit=self._slot.credit)
-        self._screen_draw_ui_payout(screen=screen, payout=self._slot.payout)
+        credit = self._slot.credit
+        self._draw_if_changed(
+            "credit",
+            credit,
+            self._screen_draw_ui_credit,
+            screen=screen,
+            credit=credit,
+        )
+        payout = self._slot.payout
+        self._draw_if_changed(
+            "payout",
+            payout,
+            self._screen_draw_ui_payout,
+            screen=screen,
+            payout=payout,
+        )
 
-        self._screen_draw_ui_reelinfo(
+        reel = self._slot.reel
+        self._draw_if_changed(
+            "reelinfo",
+            (
+                reel[0].current_symbol_index,
+                reel[1].current_symbol_index,
+                reel[2].current_symbol_index,
+            ),
+            self._screen_draw_ui_reelinfo,
             screen=screen,
             font=self._system_font,
-            left_reel_cur_symbol=self._slot.reel[0].current_symbol,
-            center_reel_cur_symbol=self._slot.reel[1].current_symbol,
-            right_reel_cur_symbol=self._slot.reel[2].current_symbol,
+            left_reel_cur_symbol=reel[0].current_symbol,
+            center_reel_cur_symbol=reel[1].current_symbol,
+            right_reel_cur_symbol=reel[2].current_symbol,
+        )
+
+        # ランプは点灯状態が変化した場合のみ再描画する
+        replay = self._slot.replay
+        self._draw_if_changed(
+            "replay",
+            replay,
+            self._screen_draw_ui_replay,
+            screen=screen,
+            replay=replay,
+        )
+        wait = self._slot.wait
+        self._draw_if_changed(
+            "wait",
+            wait,
+            self._screen_draw_ui_wait,
+            screen=screen,
+            wait=wait,
+        )
+        start = self._slot.start
+        self._draw_if_changed(
+            "start",
+            start,
+            self._screen_draw_ui_start,
+            screen=screen,
+            start=start,
+        )
+        bet = self._slot.bet
+        self._draw_if_changed(
+            "bet",
+            bet,
+            self._screen_draw_ui_bet,
+            screen=screen,
+            bet=bet,
+        )
+
+    def _screen_draw_profiler_overlay(self, screen: pygame.Surface) -> None:
+        """処理時間を描画する
+
+        統計値の集計と文字列の描画は一定フレーム数ごとにのみ行う
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            描画対象のSurfaceオブジェクト
+        """
+        frame_count = self._frame_profiler.frame_count
+        if (
+            not self._profiler_overlay_lines
+            or frame_count % GameData.FRAME_PROFILER_OVERLAY_INTERVAL == 0
+        ):
+            summary = self._frame_profiler.get_summary()
+            self._profiler_overlay_lines = tuple(
+                f"{name:<9} p50 {stats['p50']:6.2f}"
+                f"  p95 {stats['p95']:6.2f}  p99 {stats['p99']:6.2f} ms"
+                for name, stats in summary.items()
+            )
+
+        self._draw_if_changed(
+            "profiler_overlay",
+            self._profiler_overlay_lines,
+            self._screen_draw_profiler_overlay_lines,
+            screen=screen,
+            lines=self._profiler_overlay_lines,
         )
 
-    # self._screen_draw_ui_replay(screen=screen)
-    # self._screen_draw_ui_bet(screen=screen)
-    # self._screen_draw_ui_start(screen=screen)
-    # self._screen_draw_ui_wait(screen=screen)
+    def _screen_draw_profiler_overlay_lines(
+        self, screen: pygame.Surface, lines: tuple[str, ...]
+    ) -> pygame.Rect:
+        """処理時間の文字列を描画する
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            描画対象のSurfaceオブジェクト
+        lines : tuple[str, ...]
+            処理段階ごとの処理時間の文字列
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
+        """
+        rect = pygame.Rect(10, 10, 0, 0)
+        for i, line in enumerate(lines):
+            # 数値が毎回変わるため文字列描画キャッシュは使用しない
+            with tracer.span("font.render"):
+                text = self._system_font.render(
+                    line, True, GameData.Color.white
+                )
+            rect.union_ip(screen.blit(text, (10, 10 + i * 20)))
+
+        return rect
 
-    def _screen_draw_ui_credit(self, screen: pygame.Surface, credit: int):
+    def _screen_draw_ui_credit(
+        self, screen: pygame.Surface, credit: int
+    ) -> pygame.Rect:
         """CREDIT表示を描画する
 
         Parameters
@@ -402,20 +884,31 @@ class Game:
             描画対象のSurfaceオブジェクト
         credit : int
             現在のCREDIT値
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
         # ゲーム画面幅
         screen_width = GameData.SCREEN_WIDTH
 
-        text = self._system_font.render("CREDIT: ", True, GameData.Color.white)
+        text = self._text_cache.render(
+            self._system_font, "CREDIT: ", True, GameData.Color.white
+        )
         text_rect = text.get_rect(topright=(screen_width - 80, 10))
-        screen.blit(text, text_rect)
-        text = self._system_font.render(
-            str(credit), True, GameData.Color.white
+        label_rect = screen.blit(text, text_rect)
+        text = self._text_cache.render(
+            self._system_font, str(credit), True, GameData.Color.white
         )
         text_rect = text.get_rect(topright=(screen_width - 10, 10))
-        screen.blit(text, text_rect)
+        value_rect = screen.blit(text, text_rect)
 
-    def _screen_draw_ui_payout(self, screen: pygame.Surface, payout: int):
+        return label_rect.union(value_rect)
+
+    def _screen_draw_ui_payout(
+        self, screen: pygame.Surface, payout: int
+    ) -> pygame.Rect:
         """PAYOUT表示を描画する
 
         Parameters
@@ -424,18 +917,27 @@ class Game:
             描画対象のSurfaceオブジェクト
         payout : int
             現在のPAYOUT値
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
         # ゲーム画面幅
         screen_width = GameData.SCREEN_WIDTH
 
-        text = self._system_font.render("PAY: ", True, GameData.Color.white)
+        text = self._text_cache.render(
+            self._system_font, "PAY: ", True, GameData.Color.white
+        )
         text_rect = text.get_rect(topright=(screen_width - 80, 35))
-        screen.blit(text, text_rect)
-        text = self._system_font.render(
-            str(payout), True, GameData.Color.white
+        label_rect = screen.blit(text, text_rect)
+        text = self._text_cache.render(
+            self._system_font, str(payout), True, GameData.Color.white
         )
         text_rect = text.get_rect(topright=(screen_width - 10, 35))
-        screen.blit(text, text_rect)
+        value_rect = screen.blit(text, text_rect)
+
+        return label_rect.union(value_rect)
 
     def _screen_draw_ui_reelinfo(
         self,
@@ -444,7 +946,7 @@ class Game:
         left_reel_cur_symbol: list[Symbol],
         center_reel_cur_symbol: list[Symbol],
         right_reel_cur_symbol: list[Symbol],
-    ) -> None:
+    ) -> pygame.Rect:
         """リール情報を描画する
 
         Parameters
@@ -459,6 +961,11 @@ class Game:
             現在の中リールの図柄
         right_reel_cur_symbol : list[Symbol]
             現在の右リールの図柄
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
         # 最終的な描画イメージ
         # -----
@@ -468,28 +975,30 @@ class Game:
         # -----
 
         # 左リール情報を描画
-        self._screen_draw_ui_reft_reelinfo(
+        left_rect = self._screen_draw_ui_reft_reelinfo(
             screen=screen, font=font, left_reel_cur_symbol=left_reel_cur_symbol
         )
         # 中リール情報を描画
-        self._screen_draw_ui_center_reelinfo(
+        center_rect = self._screen_draw_ui_center_reelinfo(
             screen=screen,
             font=font,
             center_reel_cur_symbol=center_reel_cur_symbol,
         )
         # 右リール情報を描画
-        self._screen_draw_ui_right_reelinfo(
+        right_rect = self._screen_draw_ui_right_reelinfo(
             screen=screen,
             font=font,
             right_reel_cur_symbol=right_reel_cur_symbol,
         )
 
+        return left_rect.unionall([center_rect, right_rect])
+
     def _screen_draw_ui_reft_reelinfo(
         self,
         screen: pygame.Surface,
         font: pygame.font.Font,
         left_reel_cur_symbol: list[Symbol],
-    ) -> None:
+    ) -> pygame.Rect:
         """左リール情報を描画する
 
         Parameters
@@ -500,8 +1009,13 @@ class Game:
             描画に使用するフォントオブジェクト
         left_reel_cur_symbol : list[Symbol]
             現在の左リールの図柄
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        self._draw_reelinfo(
+        return self._draw_reelinfo(
             screen=screen,
             font=font,
             current_symbol=left_reel_cur_symbol,
@@ -513,7 +1027,7 @@ class Game:
         screen: pygame.Surface,
         font: pygame.font.Font,
         center_reel_cur_symbol: list[Symbol],
-    ) -> None:
+    ) -> pygame.Rect:
         """中リール情報を描画する
 
         Parameters
@@ -524,8 +1038,13 @@ class Game:
             描画に使用するフォントオブジェクト
         center_reel_cur_symbol : list[Symbol]
             現在の中リールの図柄
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        self._draw_reelinfo(
+        return self._draw_reelinfo(
             screen=screen,
             font=font,
             current_symbol=center_reel_cur_symbol,
@@ -537,7 +1056,7 @@ class Game:
         screen: pygame.Surface,
         font: pygame.font.Font,
         right_reel_cur_symbol: list[Symbol],
-    ) -> None:
+    ) -> pygame.Rect:
         """右リール情報を描画する
 
         Parameters
@@ -548,8 +1067,13 @@ class Game:
             描画に使用するフォントオブジェクト
         right_reel_cur_symbol : list[Symbol]
             現在の右リールの図柄
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
-        self._draw_reelinfo(
+        return self._draw_reelinfo(
             screen=screen,
             font=font,
             current_symbol=right_reel_cur_symbol,
@@ -562,7 +1086,7 @@ class Game:
         font: pygame.font.Font,
         current_symbol: list[Symbol],
         reelinfo_draw_offset_x: int,
-    ) -> None:
+    ) -> pygame.Rect:
         """リール情報を描画する
         Parameters
         ----------
@@ -574,22 +1098,27 @@ class Game:
             リール情報の描画オフセットX座標
         font : pygame.font.Font
             描画に使用するフォントオブジェクト
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
         """
         # ゲーム画面高さ
         screen_height = GameData.SCREEN_HEIGHT
         # リール画像(全体)の幅
         symbol_height = GameData.SYMBOL_HEIGHT
 
-        top_symbolid_text = font.render(
-            str(current_symbol[0].id), True, GameData.Color.white
+        top_symbolid_text = self._text_cache.render(
+            font, str(current_symbol[0].id), True, GameData.Color.white
         )
-        middle_symbolid_text = font.render(
-            str(current_symbol[1].id), True, GameData.Color.white
+        middle_symbolid_text = self._text_cache.render(
+            font, str(current_symbol[1].id), True, GameData.Color.white
         )
-        bottom_symbolid_text = font.render(
-            str(current_symbol[2].id), True, GameData.Color.white
+        bottom_symbolid_text = self._text_cache.render(
+            font, str(current_symbol[2].id), True, GameData.Color.white
         )
-        screen.blit(
+        top_rect = screen.blit(
             top_symbolid_text,
             top_symbolid_text.get_rect(
                 center=(
@@ -601,7 +1130,7 @@ class Game:
                 )
             ),
         )
-        screen.blit(
+        middle_rect = screen.blit(
             middle_symbolid_text,
             middle_symbolid_text.get_rect(
                 center=(
@@ -613,7 +1142,7 @@ class Game:
                 )
             ),
         )
-        screen.blit(
+        bottom_rect = screen.blit(
             bottom_symbolid_text,
             bottom_symbolid_text.get_rect(
                 center=(
@@ -626,10 +1155,25 @@ class Game:
             ),
         )
 
-    def _ui_replay_draw(self):
-        """REPLAYランプを描画する"""
-        replay = self._slot.replay
+        return top_rect.unionall([middle_rect, bottom_rect])
+
+    def _screen_draw_ui_replay(
+        self, screen: pygame.Surface, replay: bool
+    ) -> pygame.Rect:
+        """REPLAYランプを描画する
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            描画対象のSurfaceオブジェクト
+        replay : bool
+            リプレイ状態
 
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
+        """
         # ゲーム画面幅
         screen_width = GameData.SCREEN_WIDTH
         # ゲーム画面高さ
@@ -649,8 +1193,11 @@ class Game:
             replay_font_color = GameData.Color.white
         else:
             replay_font_color = GameData.Color.gray
-        text = self._system_font.render("REP", True, replay_font_color)
-        self._screen.blit(
+        text = self._text_cache.render(
+            self._system_font, "REP", True, replay_font_color
+        )
+
+        return screen.blit(
             text,
             text.get_rect(
                 topright=(
@@ -663,16 +1210,23 @@ class Game:
             ),
         )
 
-    def _screen_draw_ui_wait(self, screen: pygame.Surface):
+    def _screen_draw_ui_wait(
+        self, screen: pygame.Surface, wait: bool
+    ) -> pygame.Rect:
         """WAITランプを描画する
 
         Parameters
         ----------
         screen : pygame.Surface
             描画対象のSurfaceオブジェクト
-        """
-        wait = self._slot.wait
+        wait : bool
+            ウェイト状態
 
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
+        """
         # ゲーム画面幅
         screen_width = GameData.SCREEN_WIDTH
         # ゲーム画面高さ
@@ -692,8 +1246,11 @@ class Game:
             wait_font_color = GameData.Color.white
         else:
             wait_font_color = GameData.Color.gray
-        text = self._system_font.render("WAIT", True, wait_font_color)
-        screen.blit(
+        text = self._text_cache.render(
+            self._system_font, "WAIT", True, wait_font_color
+        )
+
+        return screen.blit(
             text,
             text.get_rect(
                 topright=(
@@ -706,10 +1263,23 @@ class Game:
             ),
         )
 
-    def _ui_start_draw(self):
-        """STARTランプを描画する"""
-        start = self._slot.start
+    def _screen_draw_ui_start(
+        self, screen: pygame.Surface, start: bool
+    ) -> pygame.Rect:
+        """STARTランプを描画する
 
+        Parameters
+        ----------
+        screen : pygame.Surface
+            描画対象のSurfaceオブジェクト
+        start : bool
+            スタート可能状態
+
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
+        """
         # ゲーム画面高さ
         screen_height = GameData.SCREEN_HEIGHT
 
@@ -722,18 +1292,34 @@ class Game:
             start_font_color = GameData.Color.white
         else:
             start_font_color = GameData.Color.gray
-        text = self._system_font.render("START", True, start_font_color)
-        self._screen.blit(
+        text = self._text_cache.render(
+            self._system_font, "START", True, start_font_color
+        )
+
+        return screen.blit(
             text,
             text.get_rect(
                 topleft=(uidraw_const_a, screen_height / 2 + uidraw_const_b)
             ),
         )
 
-    def _ui_bet_draw(self):
-        """BETランプ(1BET/2BET/3BET)を描画する"""
-        bet = self._slot.bet
+    def _screen_draw_ui_bet(
+        self, screen: pygame.Surface, bet: int
+    ) -> pygame.Rect:
+        """BETランプ(1BET/2BET/3BET)を描画する
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            描画対象のSurfaceオブジェクト
+        bet : int
+            現在のBET数
 
+        Returns
+        -------
+        rect : pygame.Rect
+            描画した領域
+        """
         # ゲーム画面高さ
         screen_height = GameData.SCREEN_HEIGHT
 
@@ -758,8 +1344,10 @@ class Game:
             bet3_font_color = GameData.Color.gray
             bet2_font_color = GameData.Color.gray
             bet1_font_color = GameData.Color.gray
-        text = self._system_font.render("3BET", True, bet3_font_color)
-        self._screen.blit(
+        text = self._text_cache.render(
+            self._system_font, "3BET", True, bet3_font_color
+        )
+        bet3_rect = screen.blit(
             text,
             text.get_rect(
                 topleft=(
@@ -768,8 +1356,10 @@ class Game:
                 )
             ),
         )
-        text = self._system_font.render("2BET", True, bet2_font_color)
-        self._screen.blit(
+        text = self._text_cache.render(
+            self._system_font, "2BET", True, bet2_font_color
+        )
+        bet2_rect = screen.blit(
             text,
             text.get_rect(
                 topleft=(
@@ -778,8 +1368,10 @@ class Game:
                 )
             ),
         )
-        text = self._system_font.render("1BET", True, bet1_font_color)
-        self._screen.blit(
+        text = self._text_cache.render(
+            self._system_font, "1BET", True, bet1_font_color
+        )
+        bet1_rect = screen.blit(
             text,
             text.get_rect(
                 topleft=(
@@ -789,24 +1381,46 @@ class Game:
             ),
         )
 
+        return bet3_rect.unionall([bet2_rect, bet1_rect])
+
+    @tracer.traced("Game.display_update")
     def _display_update(self):
-        """displayオブジェクトを更新する"""
-        pygame.display.update()
+        """displayオブジェクトを更新する
+
+        再描画した領域のみを更新し、変化がないフレームは更新しない
+        垂直同期が有効な場合は、待機中を除き毎フレーム更新して
+        フレーム間隔を垂直同期に合わせる
+        """
+        if self._dirty_rects:
+            pygame.display.update(self._dirty_rects)
+        elif self._vsync and not self._is_idle():
+            pygame.display.flip()
 
     def main_loop(self):
         """メインループ"""
-        while True:
-            # イベントを検知し更新する
-            self._gameevent_update()
-
-            # ゲーム状態を更新する
-            self._game_update()
-
-            # Surfaceオブジェクトを更新する
-            self._screen_update()
-
-            # displayオブジェクトを更新する
-            self._display_update()
-
-            # clockオブジェクトを更新する
-            self._clock_update()
+        frame_profiler = self._frame_profiler
+        try:
+            while True:
+                # イベントを検知し更新する
+                self._gameevent_update()
+                frame_profiler.lap("event")
+
+                # ゲーム状態を更新する
+                self._game_update()
+                frame_profiler.lap("update")
+
+                # Surfaceオブジェクトを更新する
+                # (リール描画・UI描画の処理時間は内部で計測する)
+                self._screen_update()
+
+                # displayオブジェクトを更新する
+                self._display_update()
+                frame_profiler.lap("display")
+
+                # clockオブジェクトを更新する
+                self._clock_update()
+                frame_profiler.lap("wait")
+                frame_profiler.end_frame()
+                self._profile_recorder.end_frame()
+        finally:
+            self._close_records()
@@ -1,7 +1,5 @@
 import os
 
-import pygame
-
 # ゲームデータフォルダ名
 GAMEDATA_FOLDER_NAME: str = "assets"
 # ゲーム画像フォルダ名
@@ -34,8 +32,22 @@ FONT_MPLUS1_FILE_PATH = os.path.join(
     FONT_FOLDER_NAME,
     "MPLUS1-ExtraBold.ttf",
 )
-# フレームレート指定
-FRAMERATE_LIMIT: int | None = None
+# フレームレート指定 (Noneの場合は制限しない)
+FRAMERATE_LIMIT: int | None = 60
+# 待機中のフレームレート指定 (Noneの場合は待機中も下げない)
+IDLE_FRAMERATE_LIMIT: int | None = 30
+# 垂直同期の有無
+VSYNC: bool = False
+# フレーム間の待機中に入力を取得する間隔[sec]
+INPUT_POLL_INTERVAL: float = 0.001
+# 処理時間の表示の有無 (F3キーで切り替え)
+FRAME_PROFILER_OVERLAY: bool = False
+# 処理時間の表示を更新するフレーム間隔
+FRAME_PROFILER_OVERLAY_INTERVAL: int = 30
+# 終了時に処理時間をログ出力先に保存するか
+FRAME_PROFILER_DUMP: bool = False
+# F5キーでcProfileの計測を開始した場合に計測するフレーム数
+PROFILE_FRAMES: int = 600
 
 # 図柄画像幅
 SYMBOL_WIDTH: int = 150
@@ -48,6 +60,13 @@ REEL_WIDTH: int = SYMBOL_WIDTH
 # リール画像高さ
 REEL_HEIGHT: int = SYMBOL_HEIGHT * REEL_SYMBOL_LENGTH
 
+# リール座標の固定小数点の小数部ビット数 (1ピクセル = 2 ** SUBPIXEL_BITS)
+SUBPIXEL_BITS: int = 8
+# 1図柄あたりの固定小数点座標の単位数
+SYMBOL_UNITS: int = SYMBOL_HEIGHT << SUBPIXEL_BITS
+# リール1周あたりの固定小数点座標の単位数
+REEL_UNITS: int = REEL_HEIGHT << SUBPIXEL_BITS
+
 # 各リール間の間隔
 REEL_SPACE_BETWEEN_REELS: int = int(SYMBOL_WIDTH / 6)
 # 各リールの枠外の描画範囲
@@ -62,12 +81,14 @@ REEL_DRAW_LEFT_OFFSET_X: int = (REEL_SPACE_BETWEEN_REELS + SYMBOL_WIDTH) * -1
 REEL_DRAW_CENTER_OFFSET_X: int = 0
 REEL_DRAW_RIGHT_OFFSET_X: int = REEL_SPACE_BETWEEN_REELS + SYMBOL_WIDTH
 
-# リール枠上端
-REEL_FRAME_TOP: int = int(
-    REEL_HEIGHT - SYMBOL_HEIGHT - REEL_OUTSIDE_DRAW_RANGE
+# リール表示窓の上端 (画面座標)
+REEL_WINDOW_TOP: int = int(
+    SCREEN_HEIGHT / 2 - SYMBOL_HEIGHT * 3 / 2 - REEL_OUTSIDE_DRAW_RANGE
 )
-# リール枠下端
-REEL_FRAME_BOTTOM: int = int(SYMBOL_HEIGHT * 2 + REEL_OUTSIDE_DRAW_RANGE)
+# リール表示窓の高さ
+REEL_WINDOW_HEIGHT: int = SYMBOL_HEIGHT * 3 + REEL_OUTSIDE_DRAW_RANGE * 2
+# リール画像の末尾に折り返して追加する図柄数 (表示窓の高さ以上)
+REEL_PADDING_SYMBOLS: int = -(-REEL_WINDOW_HEIGHT // SYMBOL_HEIGHT)
 
 
 # UI描画用定数A (START/BET/REP/WAITランプの左右に確保する間隔)
@@ -78,10 +99,21 @@ UIDRAW_CONST_B: int = int(REEL_SPACE_BETWEEN_REELS // 2)
 
 # リール回転速度[r/sec]
 REEL_SPEED: float = 0.8
+# リール1周の所要時間[nsec] (固定小数点座標の更新に使用する)
+REEL_PERIOD_NS: int = round(REEL_SPEED * 1_000_000_000)
 # BET処理時にBETを行う間隔[sec]
 BET_INTERVAL: float = (1 / 30) * 2
+# BET処理時にBETを行う間隔[nsec]
+# (切り捨てて、BET_INTERVALの整数倍の経過時間で確実にその回数分BETする)
+BET_INTERVAL_NS: int = int(BET_INTERVAL * 1_000_000_000)
 # リールウェイト時間[sec]
 REELWAIT_TIME: float = 4.1
+# ゲーム状態の更新の刻み幅[sec] (描画のフレームレートによらず一定)
+LOGIC_TIMESTEP: float = 1 / 240
+# 1フレームで行うゲーム状態の更新回数の上限 (超過分の時間は破棄する)
+LOGIC_MAX_STEPS: int = 60
+# ヘッドレスシミュレーションの仮想時計の刻み幅[sec]
+SIMULATION_TIMESTEP: float = 1 / 60
 
 
 # 色
@@ -109,6 +141,12 @@ VALIDBET_MIN: int = 1
 # 有効BET数: 最大
 VALIDBET_MAX: int = 3
 
+# 1遊技あたりの最大払出クレジット数
+PAYOUT_MAX: int = 15
+
+# 内部抽選の抽選値の範囲
+LOTTERY_RANGE: int = 65536
+
 # リール位置: 上段
 REEL_POSITION_TOP: int = 0
 # リール位置: 中段
@@ -0,0 +1,486 @@
+import glob
+import json
+import os
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
+import Logger
+import numpy as np
+
+log = Logger.get_logger(__name__)
+
+# 1ファイルに記録する遊技数の既定値 (超えると次のファイルに切り替える)
+JOURNAL_FILE_RECORDS: int = 1_000_000
+# まとめて書き込む遊技数の既定値
+JOURNAL_BATCH_SIZE: int = 4096
+# バッファに溜めた記録を書き込む時間間隔の既定値[sec]
+JOURNAL_FLUSH_INTERVAL: float = 5.0
+
+# ジャーナルファイル名 (連番)
+JOURNAL_FILENAME_FORMAT: str = "journal_{:06d}.bin"
+JOURNAL_FILENAME_PATTERN: str = "journal_*.bin"
+# 形式が不正なため退避したジャーナルファイルの拡張子
+JOURNAL_CORRUPT_SUFFIX: str = ".corrupt"
+# セッションの情報 (乱数シードなど) を記録するファイル名
+SESSION_FILENAME: str = "session.json"
+# ジャーナルファイルの識別子と形式のバージョン
+JOURNAL_MAGIC: bytes = b"NSGJ"
+JOURNAL_FORMAT_VERSION: int = 1
+
+# 1遊技分の記録 (固定長, リトルエンディアン, 詰め物なし)
+JOURNAL_DTYPE = np.dtype(
+    [
+        # 遊技番号 (Slot生成からの通し番号)
+        ("game", "<u8"),
+        # 遊技終了時の論理時刻[nsec]
+        ("time_ns", "<i8"),
+        # BET数
+        ("bet", "u1"),
+        # 内部抽選結果
+        ("lottery_result", "<i2"),
+        # 押し順 (停止操作したリールのインデックス)
+        ("press_order", "u1", (3,)),
+        # 押した位置 (リールごとの滑りなしの停止位置)
+        ("press", "u1", (3,)),
+        # 停止位置 (リールごとの上段図柄のインデックス)
+        ("stop", "u1", (3,)),
+        # 払出クレジット数
+        ("payout", "u1"),
+        # 遊技終了時のクレジット数
+        ("credit", "<i8"),
+        # 再遊技
+        ("replay", "?"),
+        # 遊技終了時の状態ID
+        ("internal_state", "<u2"),
+        ("at_state", "<u2"),
+        ("navi_state", "<u2"),
+        ("rt_state", "<u2"),
+    ]
+)
+
+# ファイル先頭のヘッダー
+JOURNAL_HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "<u4"),
+        ("record_size", "<u4"),
+        ("reserved", "<u4"),
+    ]
+)
+
+
+def _get_header() -> bytes:
+    """ジャーナルファイルのヘッダーを返す"""
+    header = np.zeros(1, dtype=JOURNAL_HEADER_DTYPE)
+    header["magic"] = JOURNAL_MAGIC
+    header["version"] = JOURNAL_FORMAT_VERSION
+    header["record_size"] = JOURNAL_DTYPE.itemsize
+
+    return header.tobytes()
+
+
+def _get_record_count(path: str) -> int:
+    """ジャーナルファイルのヘッダーを検証し、記録されている遊技数を返す
+
+    Parameters
+    ----------
+    path : str
+        ジャーナルファイルのパス
+
+    Returns
+    -------
+    count : int
+        遊技数 (書き込み途中で中断した末尾の不完全な記録は含まない)
+    """
+    header = np.fromfile(path, dtype=JOURNAL_HEADER_DTYPE, count=1)
+    if (
+        len(header) != 1
+        or header["magic"][0] != JOURNAL_MAGIC
+        or header["version"][0] != JOURNAL_FORMAT_VERSION
+        or header["record_size"][0] != JOURNAL_DTYPE.itemsize
+    ):
+        raise ValueError(f"ジャーナルファイルの形式が不正です: {path}")
+
+    size = os.path.getsize(path) - JOURNAL_HEADER_DTYPE.itemsize
+
+    return size // JOURNAL_DTYPE.itemsize
+
+
+def get_journal_files(directory: str) -> list[str]:
+    """ディレクトリ内のジャーナルファイルを記録順に返す
+
+    Parameters
+    ----------
+    directory : str
+        ジャーナルの保存先
+
+    Returns
+    -------
+    paths : list[str]
+        ジャーナルファイルのパス
+    """
+    return sorted(glob.glob(os.path.join(directory, JOURNAL_FILENAME_PATTERN)))
+
+
+def create_session_directory(directory: str) -> str:
+    """ジャーナルの保存先に起動ごとのセッションのディレクトリを作成する
+
+    Parameters
+    ----------
+    directory : str
+        ジャーナルの保存先
+
+    Returns
+    -------
+    path : str
+        作成したディレクトリ (session_<日時>, 同名がある場合は連番を付ける)
+    """
+    now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    os.makedirs(directory, exist_ok=True)
+    suffix = ""
+    index = 0
+    while True:
+        path = os.path.join(directory, f"session_{now}{suffix}")
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            index += 1
+            suffix = f"_{index}"
+            continue
+
+        return path
+
+
+class GameJournal:
+    """遊技ごとの記録を固定長のバイナリで追記するジャーナル
+
+    記録はメモリ上のバッファに溜めておき、一定数ごと、または一定時間ごとに
+    まとめてファイルに追記する。1ファイルの遊技数が上限に達すると連番の
+    次のファイルに切り替える。既存のジャーナルに続けて記録する場合は
+    最後のファイルの末尾から追記する (最後のファイルの形式が不正な場合は
+    退避して同じ連番のファイルを作り直す)
+
+    Attributes
+    ----------
+    directory : str
+        ジャーナルの保存先
+    file_records : int
+        1ファイルに記録する遊技数
+    batch_size : int
+        まとめて書き込む遊技数
+    flush_interval : float | None
+        バッファに溜めた記録を書き込む時間間隔[sec]
+    path : str
+        現在記録中のファイルのパス
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        file_records: int = JOURNAL_FILE_RECORDS,
+        batch_size: int = JOURNAL_BATCH_SIZE,
+        flush_interval: float | None = JOURNAL_FLUSH_INTERVAL,
+        session: dict | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        directory : str
+            ジャーナルの保存先
+        file_records : int
+            1ファイルに記録する遊技数
+        batch_size : int
+            まとめて書き込む遊技数
+        flush_interval : float | None
+            バッファに溜めた記録を書き込む時間間隔[sec]
+            (Noneの場合は遊技数のみで判断する)
+        session : dict | None
+            セッションの情報 (乱数シードなど, JSONで保存できる値)
+            (指定した場合は保存先のsession.jsonに書き込む)
+        clock : Callable[[], float]
+            現在時刻[sec]を返す関数
+        """
+        if file_records <= 0:
+            raise ValueError("1ファイルの遊技数には1以上を指定してください")
+        if batch_size <= 0:
+            raise ValueError(
+                "まとめて書き込む遊技数には1以上を指定してください"
+            )
+
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("書き込む時間間隔には正の値を指定してください")
+
+        self._directory: str = directory
+        self._file_records: int = file_records
+        self._buffer: np.ndarray = np.zeros(batch_size, dtype=JOURNAL_DTYPE)
+        self._buffered: int = 0
+        self._flush_interval: float | None = flush_interval
+        self._clock: Callable[[], float] = clock
+        self._last_flush_time: float = clock()
+
+        os.makedirs(directory, exist_ok=True)
+        if session is not None:
+            with open(
+                os.path.join(directory, SESSION_FILENAME),
+                "w",
+                encoding="utf-8",
+            ) as f:
+                json.dump(session, f)
+
+        paths = get_journal_files(directory)
+        self._file_index: int = max(len(paths) - 1, 0)
+        self._file_count: int = 0
+        if not paths:
+            self._create_file()
+            return
+
+        try:
+            self._file_count = _get_record_count(paths[-1])
+        except ValueError as e:
+            # ヘッダーの書き込み前に中断した場合など、形式が不正な
+            # ファイルは退避して同じ連番のファイルを作り直す
+            os.replace(paths[-1], paths[-1] + JOURNAL_CORRUPT_SUFFIX)
+            log.warning("journal file moved aside: %s (%s)", paths[-1], e)
+            self._create_file()
+            return
+
+        # 書き込み途中で中断した末尾の不完全な記録を切り捨てる
+        with open(paths[-1], "r+b") as f:
+            f.truncate(
+                JOURNAL_HEADER_DTYPE.itemsize
+                + self._file_count * JOURNAL_DTYPE.itemsize
+            )
+
+    def _create_file(self) -> None:
+        """現在の連番のジャーナルファイルをヘッダーのみで作成する
+
+        ヘッダーのない空のファイルが残らないよう、一時ファイルに
+        書き込んでから名前を変更する
+        """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_get_header())
+        os.replace(temp_path, self.path)
+
+    def append(
+        self,
+        *,
+        game: int,
+        time_ns: int,
+        bet: int,
+        lottery_result: int,
+        press_order: tuple[int, int, int],
+        press: tuple[int, int, int],
+        stop: tuple[int, int, int],
+        payout: int,
+        credit: int,
+        replay: bool,
+        internal_state: int,
+        at_state: int,
+        navi_state: int,
+        rt_state: int,
+    ) -> None:
+        """1遊技分の記録を追加する
+
+        Parameters
+        ----------
+        game : int
+            遊技番号
+        time_ns : int
+            遊技終了時の論理時刻[nsec]
+        bet : int
+            BET数
+        lottery_result : int
+            内部抽選結果
+        press_order : tuple[int, int, int]
+            押し順 (停止操作したリールのインデックス)
+        press : tuple[int, int, int]
+            押した位置 (リールごとの滑りなしの停止位置)
+        stop : tuple[int, int, int]
+            停止位置 (リールごとの上段図柄のインデックス)
+        payout : int
+            払出クレジット数
+        credit : int
+            遊技終了時のクレジット数
+        replay : bool
+            再遊技
+        internal_state : int
+            内部状態ID
+        at_state : int
+            AT状態ID
+        navi_state : int
+            ナビ状態ID
+        rt_state : int
+            RT状態ID
+        """
+        self._buffer[self._buffered] = (
+            game,
+            time_ns,
+            bet,
+            lottery_result,
+            press_order,
+            press,
+            stop,
+            payout,
+            credit,
+            replay,
+            internal_state,
+            at_state,
+            navi_state,
+            rt_state,
+        )
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+        elif (
+            self._flush_interval is not None
+            and self._clock() - self._last_flush_time >= self._flush_interval
+        ):
+            # 遊技の間隔が長い場合も一定時間ごとに書き込む
+            self.flush()
+
+    def flush(self) -> None:
+        """バッファに溜めた記録をファイルに書き込む"""
+        start = 0
+        while start < self._buffered:
+            if self._file_count == self._file_records:
+                # 上限に達したら次のファイルに切り替える
+                self._file_index += 1
+                self._file_count = 0
+                self._create_file()
+
+            count = min(
+                self._buffered - start, self._file_records - self._file_count
+            )
+            with open(self.path, "ab") as f:
+                f.write(self._buffer[start : start + count].tobytes())
+            self._file_count += count
+            start += count
+
+        self._buffered = 0
+        self._last_flush_time = self._clock()
+
+    def close(self) -> None:
+        """バッファに溜めた記録を書き込んで終了する"""
+        self.flush()
+
+    def __enter__(self) -> "GameJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def file_records(self) -> int:
+        return self._file_records
+
+    @property
+    def batch_size(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def flush_interval(self) -> float | None:
+        return self._flush_interval
+
+    @property
+    def path(self) -> str:
+        return os.path.join(
+            self._directory, JOURNAL_FILENAME_FORMAT.format(self._file_index)
+        )
+
+
+class GameJournalReader:
+    """ジャーナルの記録をNumPyの構造化配列として読み出す
+
+    各ファイルをメモリマップで開き、記録順に一定数ずつ返すため、
+    ジャーナル全体をメモリに読み込まずに集計できる
+
+    Attributes
+    ----------
+    directory : str
+        ジャーナルの保存先
+    files : list[str]
+        ジャーナルファイルのパス (記録順)
+    session : dict | None
+        セッションの情報 (記録されていない場合はNone)
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Parameters
+        ----------
+        directory : str
+            ジャーナルの保存先
+        """
+        self._directory: str = directory
+
+    def iter_batches(
+        self, batch_size: int = JOURNAL_BATCH_SIZE
+    ) -> Iterator[np.ndarray]:
+        """記録を一定数ずつ記録順に返す
+
+        Parameters
+        ----------
+        batch_size : int
+            1回に返す遊技数の上限
+
+        Yields
+        ------
+        records : np.ndarray
+            記録 (dtypeはJOURNAL_DTYPE, 読み取り専用)
+        """
+        if batch_size <= 0:
+            raise ValueError("1回に返す遊技数には1以上を指定してください")
+
+        for path in self.files:
+            count = _get_record_count(path)
+            if count == 0:
+                continue
+            records = np.memmap(
+                path,
+                dtype=JOURNAL_DTYPE,
+                mode="r",
+                offset=JOURNAL_HEADER_DTYPE.itemsize,
+                shape=(count,),
+            )
+            for start in range(0, count, batch_size):
+                yield records[start : start + batch_size]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self.iter_batches()
+
+    def read(self) -> np.ndarray:
+        """全ての記録を1つの配列として返す
+
+        Returns
+        -------
+        records : np.ndarray
+            記録 (dtypeはJOURNAL_DTYPE)
+        """
+        batches = list(self.iter_batches())
+        if not batches:
+            return np.zeros(0, dtype=JOURNAL_DTYPE)
+
+        return np.concatenate(batches)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def files(self) -> list[str]:
+        return get_journal_files(self._directory)
+
+    @property
+    def session(self) -> dict | None:
+        path = os.path.join(self._directory, SESSION_FILENAME)
+        if not os.path.isfile(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
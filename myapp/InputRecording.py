@@ -0,0 +1,284 @@
+import json
+import os
+
+import GameData
+import numpy as np
+
+# 記録ファイルの形式のバージョン
+RECORDING_FORMAT_VERSION: int = 2
+
+# 記録対象のボタン (Slotの<ボタン名>_keydown/<ボタン名>_keyupに対応する)
+INPUT_BUTTONS: tuple[str, ...] = (
+    "onebet",
+    "maxbet",
+    "lever",
+    "leftreelstop",
+    "centerreelstop",
+    "rightreelstop",
+)
+# 押した時刻をリール座標に反映するボタン
+TIMED_INPUT_BUTTONS: tuple[str, ...] = (
+    "leftreelstop",
+    "centerreelstop",
+    "rightreelstop",
+)
+
+
+class InputRecording:
+    """Slotへのボタン入力の記録
+
+    内部抽選の乱数シードと、ボタン入力を受け付けた論理時刻・
+    押した時刻の更新からの経過時間を記録する
+    同じ乱数シードかつ同じ仕様のテーブルのSlotに同じ論理時刻で
+    入力を与えると、遊技の結果は記録時と一致する
+
+    Attributes
+    ----------
+    seed : int
+        内部抽選の乱数シード
+    events : list[tuple[int, int, str, bool]]
+        入力 (論理時刻[nsec], 押した時刻の経過時間[nsec], ボタン名, 押下)
+    spec_hash : str | None
+        記録したSlotのテーブルの仕様のハッシュ値
+    end_time_ns : int | None
+        記録終了時の論理時刻[nsec]
+    credit : int | None
+        記録終了時のクレジット数
+    stops : tuple[int, int, int] | None
+        記録終了時のリールの上段図柄のインデックス
+    """
+
+    def __init__(self, seed: int) -> None:
+        """
+        Parameters
+        ----------
+        seed : int
+            内部抽選の乱数シード
+        """
+        self._seed: int = seed
+        self._events: list[tuple[int, int, str, bool]] = []
+        self._spec_hash: str | None = None
+        self._end_time_ns: int | None = None
+        self._credit: int | None = None
+        self._stops: tuple[int, int, int] | None = None
+
+    def record(
+        self, time_ns: int, elapsed_ns: int, button: str, pressed: bool
+    ) -> None:
+        """ボタン入力を記録する
+
+        Parameters
+        ----------
+        time_ns : int
+            入力を受け付けたSlotの論理時刻[nsec]
+        elapsed_ns : int
+            押した時刻の論理時刻からの経過時間[nsec]
+        button : str
+            ボタン名
+        pressed : bool
+            押下であればTrue, 開放であればFalse
+        """
+        self._events.append((time_ns, elapsed_ns, button, pressed))
+
+    def finish(self, slot) -> None:
+        """記録終了時のSlotの状態を記録する
+
+        Parameters
+        ----------
+        slot : Slot
+            記録対象のSlot
+        """
+        self._spec_hash = slot.spec_hash
+        self._end_time_ns = slot.time_ns
+        self._credit = slot.credit
+        self._stops = tuple(reel.current_symbol_index for reel in slot.reel)
+
+    def save(self, path: str) -> None:
+        """記録をJSONファイルに保存する
+
+        Parameters
+        ----------
+        path : str
+            保存先のファイルパス
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "format_version": RECORDING_FORMAT_VERSION,
+                    "seed": self._seed,
+                    "spec_hash": self._spec_hash,
+                    "events": self._events,
+                    "end_time_ns": self._end_time_ns,
+                    "credit": self._credit,
+                    "stops": self._stops,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "InputRecording":
+        """JSONファイルから記録を読み込む
+
+        Parameters
+        ----------
+        path : str
+            記録ファイルのパス
+
+        Returns
+        -------
+        recording : InputRecording
+            読み込んだ記録
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != RECORDING_FORMAT_VERSION:
+            raise ValueError(f"記録ファイルの形式が不正です: {path}")
+
+        recording = cls(seed=data["seed"])
+        for time_ns, elapsed_ns, button, pressed in data["events"]:
+            if button not in INPUT_BUTTONS:
+                raise ValueError(f"記録ファイルのボタン名が不正です: {button}")
+            recording.record(time_ns, elapsed_ns, button, pressed)
+        recording._spec_hash = data["spec_hash"]
+        recording._end_time_ns = data["end_time_ns"]
+        recording._credit = data["credit"]
+        if data["stops"] is not None:
+            recording._stops = tuple(data["stops"])
+
+        return recording
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def events(self) -> list[tuple[int, int, str, bool]]:
+        return self._events
+
+    @property
+    def spec_hash(self) -> str | None:
+        return self._spec_hash
+
+    @property
+    def end_time_ns(self) -> int | None:
+        return self._end_time_ns
+
+    @property
+    def credit(self) -> int | None:
+        return self._credit
+
+    @property
+    def stops(self) -> tuple[int, int, int] | None:
+        return self._stops
+
+
+def replay(recording: InputRecording, slot_factory=None):
+    """記録した入力をpygameを使用せずに最大速度で再生する
+
+    ゲーム本体と同じ固定の刻み幅でSlotを入力の論理時刻まで進めて
+    入力を与え、最後に記録終了時の論理時刻まで進める
+    (遊技終了を判定する更新の区切りが記録時と同じになるため、
+    ジャーナルの論理時刻も記録時と一致する)
+
+    Parameters
+    ----------
+    recording : InputRecording
+        再生する記録
+    slot_factory : Callable[[np.random.Generator], Slot] | None
+        乱数生成器からSlotを生成する関数 (Noneの場合はSlot(rng=rng))
+
+    Returns
+    -------
+    slot : Slot
+        再生後のSlot
+
+    Raises
+    ------
+    ValueError
+        記録時とテーブルの仕様が異なる場合
+    """
+    # SlotはInputRecordingを参照するため、循環参照を避けて実行時に読み込む
+    from Slot import Slot
+
+    rng = np.random.default_rng(recording.seed)
+    slot = Slot(rng=rng) if slot_factory is None else slot_factory(rng)
+    # 仕様が異なると同じ入力でも結果が変わるため、再生せずに中断する
+    if (
+        recording.spec_hash is not None
+        and slot.spec_hash != recording.spec_hash
+    ):
+        raise ValueError(
+            "記録時とテーブルの仕様が異なります: "
+            f"{recording.spec_hash} != {slot.spec_hash}"
+        )
+
+    timestep = GameData.LOGIC_TIMESTEP
+    timestep_ns = round(timestep * 1_000_000_000)
+
+    def advance(time_ns: int) -> None:
+        # 刻み幅の倍数でない時刻は最後の更新を端数の分だけにする
+        while slot.time_ns < time_ns:
+            remaining_ns = time_ns - slot.time_ns
+            if remaining_ns >= timestep_ns:
+                slot.update(timestep)
+            else:
+                slot.update(remaining_ns / 1_000_000_000)
+
+    for time_ns, elapsed_ns, button, pressed in recording.events:
+        advance(time_ns)
+        handler = getattr(
+            slot, f"{button}_{'keydown' if pressed else 'keyup'}"
+        )
+        if pressed and button in TIMED_INPUT_BUTTONS:
+            handler(elapsed_ns / 1_000_000_000)
+        else:
+            handler()
+
+    if recording.end_time_ns is not None:
+        advance(recording.end_time_ns)
+
+    return slot
+
+
+def verify(recording: InputRecording, slot_factory=None):
+    """記録した入力を再生し、記録終了時の状態と一致することを確認する
+
+    Parameters
+    ----------
+    recording : InputRecording
+        再生する記録
+    slot_factory : Callable[[np.random.Generator], Slot] | None
+        乱数生成器からSlotを生成する関数 (Noneの場合はSlot(rng=rng))
+
+    Returns
+    -------
+    slot : Slot
+        再生後のSlot
+
+    Raises
+    ------
+    ValueError
+        記録終了時の状態が記録されていない場合,
+        記録時とテーブルの仕様が異なる場合
+    AssertionError
+        クレジット数またはリールの停止位置が記録と一致しない場合
+    """
+    if recording.credit is None or recording.stops is None:
+        raise ValueError("記録終了時の状態が記録されていません")
+
+    slot = replay(recording, slot_factory)
+    stops = tuple(reel.current_symbol_index for reel in slot.reel)
+    mismatches = []
+    if slot.credit != recording.credit:
+        mismatches.append(
+            f"クレジット数が一致しません: {slot.credit} != {recording.credit}"
+        )
+    if stops != recording.stops:
+        mismatches.append(
+            f"リールの停止位置が一致しません: {stops} != {recording.stops}"
+        )
+    if mismatches:
+        raise AssertionError(", ".join(mismatches))
+
+    return slot
@@ -1,15 +1,75 @@
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 import config
 
 # ログ設定が一度だけ行われるようにフラグを用意
 _is_configured = False
+# 整形をリスナーのスレッドに任せられる (変更されない) 引数の型
+_IMMUTABLE_ARG_TYPES: tuple[type, ...] = (
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    type(None),
+)
+# ゲームスレッドからログレコードを受け取るハンドラ
+_queue_handler: QueueHandler | None = None
+# ログレコードを別スレッドで出力するリスナー
+# (ワーカープロセスでは親プロセスのリスナーが出力するためNone)
+_listener: QueueListener | None = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """ログレコードを整形せずにキューへ渡すハンドラ
+
+    QueueHandlerは既定でキューに入れる前にメッセージを整形するため、
+    整形も含めてリスナーのスレッドで行うよう、レコードをそのまま渡す
+    (同一プロセス内のスレッド間でのみ使用する)
+    ただし引数に変更されうるオブジェクト (リスト, 配列など) を含む場合は、
+    整形までに値が変わらないようにこの時点でメッセージを整形する
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if isinstance(args, dict):
+            args = args.values()
+        if args and not all(
+            isinstance(arg, _IMMUTABLE_ARG_TYPES) for arg in args
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+
+        return record
+
+
+class _ForwardHandler(logging.Handler):
+    """ワーカープロセスから受け取ったログレコードを
+    このプロセスの同名のロガーに渡すハンドラ
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
 
 
 def setup_logging():
-    global _is_configured
+    """ログ出力を設定する
+
+    ログ呼び出し側ではレベル判定とキューへの追加のみを行い、
+    整形とファイル・コンソールへの出力は別スレッドのリスナーで行う
+    (ファイル書き込みの遅延がフレームの処理に影響しないようにする)
+    """
+    global _is_configured, _queue_handler, _listener
     if _is_configured:
         return  # すでに設定済みなら何もしない
 
@@ -17,11 +77,96 @@ def setup_logging():
     now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     log_file = os.path.join(config.LOG_DIR, f"log_{now}.log")
 
-    logging.basicConfig(
-        level=config.LOG_LEVEL,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-        handlers=[logging.StreamHandler(), logging.FileHandler(log_file)],
+    formatter = logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s %(message)s"
     )
+    handlers: list[logging.Handler] = [
+        logging.StreamHandler(),
+        logging.FileHandler(log_file, encoding="utf-8"),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    # 出力しないレベルのログはレコードを生成する前に破棄される
+    root_logger = logging.getLogger()
+    root_logger.setLevel(config.LOG_LEVEL)
+    root_logger.addHandler(_queue_handler)
+    _listener.start()
+
+    # 終了時にキューに残ったログを出力してから停止する
+    atexit.register(shutdown_logging)
+    _is_configured = True
+
+
+def shutdown_logging():
+    """キューに残ったログを出力し、ログ出力を停止する"""
+    global _is_configured, _queue_handler, _listener
+    if not _is_configured:
+        return
+
+    logging.getLogger().removeHandler(_queue_handler)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+
+    atexit.unregister(shutdown_logging)
+    _queue_handler = None
+    _listener = None
+    _is_configured = False
+
+
+@contextmanager
+def worker_log_queue() -> Iterator[multiprocessing.Queue]:
+    """ワーカープロセスのログを受け取るキューを用意する
+
+    ワーカープロセスには親プロセスのリスナーのスレッドが引き継がれないため、
+    setup_worker_logging()で設定したワーカーのログをこのキューで受け取り、
+    このプロセスのロガーで出力する
+    (終了時にキューに残ったログを出力してから停止する)
+
+    Yields
+    ------
+    log_queue : multiprocessing.Queue
+        ワーカープロセスのログレコードを受け取るキュー
+    """
+    log_queue: multiprocessing.Queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, _ForwardHandler())
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+        log_queue.close()
+        log_queue.join_thread()
+
+
+def setup_worker_logging(log_queue: multiprocessing.Queue) -> None:
+    """ワーカープロセスのログを親プロセスのキューへ送るよう設定する
+
+    ProcessPoolExecutorのinitializerとしてワーカープロセスの開始時に呼び出す
+
+    Parameters
+    ----------
+    log_queue : multiprocessing.Queue
+        worker_log_queue()で用意したキュー
+    """
+    global _is_configured, _queue_handler, _listener
+    # fork時に引き継いだハンドラはリスナーのスレッドがなく出力されないため外す
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+    # プロセス間で渡すため、キューに入れる前に整形する (QueueHandlerの既定)
+    _queue_handler = QueueHandler(log_queue)
+    _listener = None
+    root_logger.setLevel(config.LOG_LEVEL)
+    root_logger.addHandler(_queue_handler)
+    atexit.unregister(shutdown_logging)
     _is_configured = True
 
 
@@ -0,0 +1,126 @@
+import GameData
+import numpy as np
+from Role import Role
+
+
+class Lottery:
+    """内部抽選
+
+    役ごとの置数 (抽選値の範囲 GameData.LOTTERY_RANGE のうち当選となる数)
+    から累積の当選境界値を生成し、乱数1つで当選役を決定する
+
+    抽選結果は 0: ハズレ, i + 1: roles[i] 当選 で表す
+
+    Attributes
+    ----------
+    roles : list[Role]
+        抽選対象の役
+    values : np.ndarray
+        役ごとの置数 (役数,)
+    thresholds : np.ndarray
+        累積の当選境界値 (役数,)
+    """
+
+    # 抽選結果: ハズレ
+    RESULT_NONE: int = 0
+
+    def __init__(
+        self,
+        table: list[tuple[Role, int]],
+        arrays: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        table : list[tuple[Role, int]]
+            抽選テーブル (役, 置数)
+        arrays : dict[str, np.ndarray] | None
+            to_arraysで出力したコンパイル済みの配列
+            (指定した場合はコンパイルを省略する)
+        """
+        values = [value for _, value in table]
+        for value in values:
+            if not isinstance(value, int):
+                raise TypeError("置数の型が不正です")
+            if value < 0:
+                raise ValueError("置数に負の値は指定できません")
+        if sum(values) > GameData.LOTTERY_RANGE:
+            raise ValueError("置数の合計が抽選値の範囲を超えています")
+
+        self._roles: list[Role] = [role for role, _ in table]
+        if arrays is None:
+            self._values: np.ndarray = np.array(values, dtype=np.int64)
+            self._thresholds: np.ndarray = np.cumsum(self._values)
+        else:
+            self._values = arrays["values"]
+            self._thresholds = arrays["thresholds"]
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """コンパイル済みの配列を返す
+
+        Returns
+        -------
+        arrays : dict[str, np.ndarray]
+            コンパイル済みの配列
+        """
+        return {"values": self._values, "thresholds": self._thresholds}
+
+    def draw(self, rng: np.random.Generator) -> int:
+        """抽選を行う
+
+        Parameters
+        ----------
+        rng : np.random.Generator
+            抽選に使用する乱数生成器
+
+        Returns
+        -------
+        result : int
+            抽選結果 (0: ハズレ, i + 1: roles[i] 当選)
+        """
+        value = int(rng.integers(GameData.LOTTERY_RANGE))
+        index = int(np.searchsorted(self._thresholds, value, side="right"))
+        if index >= len(self._roles):
+            return Lottery.RESULT_NONE
+
+        return index + 1
+
+    def get_role(self, result: int) -> Role | None:
+        """抽選結果から当選役を返す
+
+        Parameters
+        ----------
+        result : int
+            抽選結果
+
+        Returns
+        -------
+        role : Role | None
+            当選役 (ハズレの場合はNone)
+        """
+        if result == Lottery.RESULT_NONE:
+            return None
+
+        return self._roles[result - 1]
+
+    def get_probabilities(self) -> np.ndarray:
+        """役ごとの当選確率を返す
+
+        Returns
+        -------
+        probabilities : np.ndarray
+            役ごとの当選確率 (役数,)
+        """
+        return self._values / GameData.LOTTERY_RANGE
+
+    @property
+    def roles(self) -> list[Role]:
+        return self._roles
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def thresholds(self) -> np.ndarray:
+        return self._thresholds
@@ -0,0 +1,217 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+import Logger
+import numpy as np
+from GameJournal import GameJournal
+from Simulator import SimulationResult, Simulator
+from Slot import Slot
+from TableCache import TableCache
+
+
+def _run_worker(
+    games: int,
+    seedseq: np.random.SeedSequence,
+    journal_dir: str | None = None,
+    cache_dir: str | None = config.CACHE_DIR,
+) -> SimulationResult:
+    """ワーカープロセスでシミュレーションを実行する
+
+    Parameters
+    ----------
+    games : int
+        ワーカーが担当する遊技数
+    seedseq : np.random.SeedSequence
+        ワーカー固有の乱数シード
+    journal_dir : str | None
+        ワーカーのジャーナルの保存先 (Noneの場合は記録しない)
+    cache_dir : str | None
+        コンパイル済みテーブルのキャッシュの保存先
+        (Noneの場合はキャッシュを使用しない)
+
+    Returns
+    -------
+    result : SimulationResult
+        ワーカーのシミュレーション結果
+    """
+    rng = np.random.default_rng(seedseq)
+    if journal_dir is None:
+        simulator = Simulator(slot=Slot(rng=rng, cache_dir=cache_dir), rng=rng)
+        return simulator.run(games)
+
+    # SeedSequence(seed, spawn_key=spawn_key)でワーカーの乱数列を再現できる
+    session = {"seed": seedseq.entropy, "spawn_key": list(seedseq.spawn_key)}
+    with GameJournal(journal_dir, session=session) as journal:
+        slot = Slot(rng=rng, cache_dir=cache_dir, journal=journal)
+        simulator = Simulator(slot=slot, rng=rng)
+        return simulator.run(games)
+
+
+class MonteCarloRunner:
+    """マルチプロセスのモンテカルロシミュレーター
+
+    遊技数をワーカープロセスに分配し、各ワーカーの集計結果を合算する。
+    各ワーカーにはSeedSequenceから派生させた独立な乱数列を割り当てるため、
+    シードとワーカー数が同じであれば合算結果は常に一致する。
+
+    Attributes
+    ----------
+    workers : int
+        ワーカー数
+    seed : int
+        乱数シード
+    journal_dir : str | None
+        ジャーナルの保存先 (ワーカーごとのサブディレクトリに記録する)
+        (前回の記録に続けて追記しないよう、空のディレクトリのみ指定できる)
+    cache_dir : str | None
+        コンパイル済みテーブルのキャッシュの保存先
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        seed: int | None = None,
+        journal_dir: str | None = None,
+        cache_dir: str | None = config.CACHE_DIR,
+    ):
+        """
+        Parameters
+        ----------
+        workers : int | None
+            ワーカー数 (Noneの場合はCPUコア数)
+        seed : int | None
+            乱数シード (Noneの場合はランダムに決定)
+        journal_dir : str | None
+            ジャーナルの保存先 (Noneの場合は記録しない)
+            (存在しないディレクトリまたは空のディレクトリ)
+        cache_dir : str | None
+            コンパイル済みテーブルのキャッシュの保存先
+            (Noneの場合はキャッシュを使用しない)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("ワーカー数には1以上を指定してください")
+        self._workers: int = workers
+
+        # シード未指定時も結果を再現できるよう、決定したシードを保持する
+        self._seed: int = np.random.SeedSequence(seed).entropy
+        self._journal_dir: str | None = journal_dir
+        self._cache_dir: str | None = cache_dir
+
+    def _prepare_cache(self) -> None:
+        """各ワーカーがテーブルを再コンパイルせずにキャッシュを
+        メモリマップで共有できるよう、事前にキャッシュを生成しておく
+        """
+        if self._cache_dir is None:
+            return
+        if TableCache(cache_dir=self._cache_dir).load(Slot.get_spec_hash()):
+            return
+
+        # キャッシュがない場合のみテーブルをコンパイルして保存する
+        Slot(cache_dir=self._cache_dir)
+
+    def _split_games(self, games: int) -> list[int]:
+        """遊技数をワーカーごとに分配する
+
+        Parameters
+        ----------
+        games : int
+            総遊技数
+
+        Returns
+        -------
+        worker_games : list[int]
+            ワーカーごとの遊技数
+        """
+        base, remainder = divmod(games, self._workers)
+
+        return [
+            base + 1 if i < remainder else base for i in range(self._workers)
+        ]
+
+    def run(self, games: int) -> SimulationResult:
+        """モンテカルロシミュレーションを実行する
+
+        Parameters
+        ----------
+        games : int
+            総遊技数
+
+        Returns
+        -------
+        result : SimulationResult
+            全ワーカーの合算結果
+        """
+        if games < 0:
+            raise ValueError("遊技数に負の値は指定できません")
+        if (
+            self._journal_dir is not None
+            and os.path.isdir(self._journal_dir)
+            and os.listdir(self._journal_dir)
+        ):
+            raise ValueError(
+                f"ジャーナルの保存先が空ではありません: {self._journal_dir}"
+            )
+
+        worker_games = self._split_games(games)
+        worker_seeds = np.random.SeedSequence(self._seed).spawn(self._workers)
+        worker_journal_dirs = [
+            None
+            if self._journal_dir is None
+            else os.path.join(self._journal_dir, f"worker_{i:03d}")
+            for i in range(self._workers)
+        ]
+
+        start = time.perf_counter()
+        if self._workers == 1:
+            results = [
+                _run_worker(
+                    worker_games[0],
+                    worker_seeds[0],
+                    worker_journal_dirs[0],
+                    self._cache_dir,
+                )
+            ]
+        else:
+            self._prepare_cache()
+            # ワーカーのログは親プロセスのロガーで出力する
+            with (
+                Logger.worker_log_queue() as log_queue,
+                ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    initializer=Logger.setup_worker_logging,
+                    initargs=(log_queue,),
+                ) as executor,
+            ):
+                # mapは投入順に結果を返すため合算順序は常に一定
+                results = list(
+                    executor.map(
+                        _run_worker,
+                        worker_games,
+                        worker_seeds,
+                        worker_journal_dirs,
+                        [self._cache_dir] * self._workers,
+                    )
+                )
+        elapsed = time.perf_counter() - start
+
+        return SimulationResult.merge(results, elapsed=elapsed)
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def journal_dir(self) -> str | None:
+        return self._journal_dir
+
+    @property
+    def cache_dir(self) -> str | None:
+        return self._cache_dir
@@ -0,0 +1,222 @@
+import GameData
+import numpy as np
+from Role import Role
+from Symbol import Symbol
+from WinEvaluator import WinEvaluator
+
+
+class PayoutTable:
+    """停止位置組合せ払出テーブル
+
+    全リールの停止位置の組合せ (20 × 20 × 20) を一括で入賞判定し、
+    停止位置から入賞役・払出クレジット数を配列参照で引けるようにする
+
+    停止位置は上段図柄のインデックスで表す
+
+    Attributes
+    ----------
+    evaluator : WinEvaluator
+        テーブル生成に使用した入賞判定器
+    reel_symbol_ids : np.ndarray
+        リール配列の図柄ID (リール数, リール図柄数)
+    line_roles : np.ndarray
+        入賞ラインごとに入賞した役のビット集合
+        (左停止位置, 中停止位置, 右停止位置, ライン数)
+    role_bits : np.ndarray
+        入賞した役のビット集合 (左停止位置, 中停止位置, 右停止位置)
+    payouts : np.ndarray
+        払出クレジット数 (左停止位置, 中停止位置, 右停止位置)
+    """
+
+    def __init__(
+        self,
+        evaluator: WinEvaluator,
+        reel_symbols: list[list[Symbol]],
+        arrays: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        evaluator : WinEvaluator
+            入賞判定器
+        reel_symbols : list[list[Symbol]]
+            リール配列 [左リール, 中リール, 右リール]
+        arrays : dict[str, np.ndarray] | None
+            to_arraysで出力したコンパイル済みの配列
+            (指定した場合はコンパイルを省略する)
+        """
+        if len(reel_symbols) != 3:
+            raise ValueError("リール配列の数がリール数と一致しません")
+        for symbols in reel_symbols:
+            if len(symbols) != GameData.REEL_SYMBOL_LENGTH:
+                raise ValueError(
+                    "リール配列の図柄数が既定のリール図柄数と一致しません"
+                )
+        self._evaluator: WinEvaluator = evaluator
+        self._reel_symbol_ids: np.ndarray = np.array(
+            [[symbol.id for symbol in symbols] for symbols in reel_symbols],
+            dtype=np.intp,
+        )
+
+        if arrays is None:
+            self._line_roles: np.ndarray = self._compile(self._reel_symbol_ids)
+            self._role_bits: np.ndarray = np.bitwise_or.reduce(
+                self._line_roles, axis=-1
+            )
+            reel_length = GameData.REEL_SYMBOL_LENGTH
+            self._payouts: np.ndarray = evaluator.get_payout_batch(
+                self._line_roles.reshape(-1, self._line_roles.shape[-1])
+            ).reshape((reel_length,) * 3)
+        else:
+            self._line_roles = arrays["line_roles"]
+            self._role_bits = arrays["role_bits"]
+            self._payouts = arrays["payouts"]
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """コンパイル済みの配列を返す
+
+        Returns
+        -------
+        arrays : dict[str, np.ndarray]
+            コンパイル済みの配列
+        """
+        return {
+            "line_roles": self._line_roles,
+            "role_bits": self._role_bits,
+            "payouts": self._payouts,
+        }
+
+    def _compile(self, reel_symbol_ids: np.ndarray) -> np.ndarray:
+        """全停止位置の組合せに対して入賞判定を行う
+
+        Parameters
+        ----------
+        reel_symbol_ids : np.ndarray
+            リール配列の図柄ID (リール数, リール図柄数)
+
+        Returns
+        -------
+        line_roles : np.ndarray
+            入賞ラインごとに入賞した役のビット集合
+            (左停止位置, 中停止位置, 右停止位置, ライン数)
+        """
+        reel_length = GameData.REEL_SYMBOL_LENGTH
+
+        # 停止位置ごとの上段/中段/下段の図柄インデックス (停止位置, 3)
+        rows = (
+            np.arange(reel_length)[:, np.newaxis] + np.arange(3)
+        ) % reel_length
+        # リールごと・停止位置ごとの停止図柄 (リール数, 停止位置, 3)
+        reel_windows = reel_symbol_ids[:, rows]
+
+        # 全組合せの停止図柄 (左, 中, 右, リール数, 3)
+        windows = np.empty((reel_length,) * 3 + (3, 3), dtype=np.intp)
+        windows[:, :, :, 0] = reel_windows[0][:, np.newaxis, np.newaxis]
+        windows[:, :, :, 1] = reel_windows[1][np.newaxis, :, np.newaxis]
+        windows[:, :, :, 2] = reel_windows[2][np.newaxis, np.newaxis, :]
+
+        line_roles = self._evaluator.evaluate_batch(windows.reshape(-1, 3, 3))
+
+        return line_roles.reshape((reel_length,) * 3 + (-1,))
+
+    def get_payout(self, stops: tuple[int, int, int]) -> int:
+        """停止位置から払出クレジット数を返す
+
+        Parameters
+        ----------
+        stops : tuple[int, int, int]
+            停止位置 [左リール, 中リール, 右リール]
+
+        Returns
+        -------
+        payout : int
+            払出クレジット数
+        """
+        return self._payouts.item(stops[0], stops[1], stops[2])
+
+    def get_win_roles(self, stops: tuple[int, int, int]) -> list[Role]:
+        """停止位置から入賞した役を返す
+
+        Parameters
+        ----------
+        stops : tuple[int, int, int]
+            停止位置 [左リール, 中リール, 右リール]
+
+        Returns
+        -------
+        win_roles : list[Role]
+            入賞した役
+        """
+        return self._evaluator.get_win_roles(
+            [self._role_bits.item(stops[0], stops[1], stops[2])]
+        )
+
+    def get_role_probabilities(self) -> np.ndarray:
+        """全停止位置が等確率の場合の役ごとの入賞確率を返す
+
+        Returns
+        -------
+        probabilities : np.ndarray
+            役ごとの入賞確率 (evaluator.rolesと同じ並び)
+        """
+        role_count = len(self._evaluator.roles)
+        role_bits = np.left_shift(
+            np.uint64(1), np.arange(role_count, dtype=np.uint64)
+        )
+        hits = (self._role_bits[..., np.newaxis] & role_bits) != 0
+
+        return hits.reshape(-1, role_count).mean(axis=0)
+
+    def get_payout_rate(
+        self,
+        bet: int = GameData.VALIDBET_MAX,
+        replay_roles: list[Role] | None = None,
+    ) -> float:
+        """全停止位置が等確率の場合の機械割を返す
+
+        Parameters
+        ----------
+        bet : int
+            1遊技あたりのBET数
+        replay_roles : list[Role] | None
+            再遊技役 (入賞時は次遊技の投入がない)
+
+        Returns
+        -------
+        payout_rate : float
+            機械割 (払出クレジット数の期待値 / 投入クレジット数の期待値)
+        """
+        if bet <= 0:
+            raise ValueError("BET数には正の値を指定してください")
+
+        replay_probability = 0.0
+        if replay_roles:
+            roles = self._evaluator.roles
+            replay_mask = 0
+            for role in replay_roles:
+                replay_mask |= 1 << roles.index(role)
+            replay_probability = float(
+                np.mean((self._role_bits & np.uint64(replay_mask)) != 0)
+            )
+
+        return float(self._payouts.mean()) / (bet * (1 - replay_probability))
+
+    @property
+    def evaluator(self) -> WinEvaluator:
+        return self._evaluator
+
+    @property
+    def reel_symbol_ids(self) -> np.ndarray:
+        return self._reel_symbol_ids
+
+    @property
+    def line_roles(self) -> np.ndarray:
+        return self._line_roles
+
+    @property
+    def role_bits(self) -> np.ndarray:
+        return self._role_bits
+
+    @property
+    def payouts(self) -> np.ndarray:
+        return self._payouts
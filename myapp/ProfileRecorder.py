@@ -0,0 +1,130 @@
+import cProfile
+import os
+from datetime import datetime
+
+import config
+import Logger
+
+log = Logger.get_logger(__name__)
+
+
+class ProfileRecorder:
+    """指定フレーム数の間だけcProfileで計測するプロファイラ
+
+    計測を開始すると、指定フレーム数が経過するか停止を指示するまで
+    cProfileで計測し、計測ごとに時刻付きの.pstatsファイルを保存する
+    (pstatsモジュールやsnakevizで参照できる)
+
+    Attributes
+    ----------
+    frames : int
+        1回の計測のフレーム数
+    output_dir : str
+        .pstatsファイルの保存先
+    active : bool
+        計測中であればTrue
+    """
+
+    def __init__(self, frames: int, output_dir: str = config.LOG_DIR) -> None:
+        """
+        Parameters
+        ----------
+        frames : int
+            1回の計測のフレーム数
+        output_dir : str
+            .pstatsファイルの保存先
+        """
+        if frames <= 0:
+            raise ValueError("計測するフレーム数には1以上を指定してください")
+        self._frames: int = frames
+        self._output_dir: str = output_dir
+        self._profile: cProfile.Profile | None = None
+        self._remaining_frames: int = 0
+        self._session: int = 0
+
+    def start(self, frames: int | None = None) -> None:
+        """計測を開始する (計測中は何もしない)
+
+        Parameters
+        ----------
+        frames : int | None
+            計測するフレーム数 (Noneの場合は既定のフレーム数)
+        """
+        if self._profile is not None:
+            return
+        if frames is None:
+            frames = self._frames
+        if frames <= 0:
+            raise ValueError("計測するフレーム数には1以上を指定してください")
+
+        self._remaining_frames = frames
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> str | None:
+        """計測を終了し、計測結果を保存する
+
+        Returns
+        -------
+        path : str | None
+            保存した.pstatsファイルのパス (計測中でない場合はNone)
+        """
+        profile = self._profile
+        if profile is None:
+            return None
+        profile.disable()
+        self._profile = None
+
+        self._session += 1
+        now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        os.makedirs(self._output_dir, exist_ok=True)
+        path = os.path.join(
+            self._output_dir, f"profile_{now}_{self._session}.pstats"
+        )
+        profile.dump_stats(path)
+        log.info("profile saved: %s", path)
+
+        return path
+
+    def toggle(self) -> str | None:
+        """計測中であれば計測を終了し、そうでなければ計測を開始する
+
+        Returns
+        -------
+        path : str | None
+            計測を終了した場合は保存した.pstatsファイルのパス
+        """
+        if self._profile is not None:
+            return self.stop()
+        self.start()
+
+        return None
+
+    def end_frame(self) -> str | None:
+        """1フレームの終了を通知する
+
+        Returns
+        -------
+        path : str | None
+            指定フレーム数が経過して計測を終了した場合は
+            保存した.pstatsファイルのパス
+        """
+        if self._profile is None:
+            return None
+        self._remaining_frames -= 1
+        if self._remaining_frames > 0:
+            return None
+
+        return self.stop()
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def output_dir(self) -> str:
+        return self._output_dir
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
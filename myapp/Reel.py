@@ -1,8 +1,11 @@
-import cv2
 import GameData
+import numpy as np
+import Tracer
 from cv2.typing import MatLike
 from Symbol import Symbol
 
+tracer = Tracer.get_tracer()
+
 
 class Reel:
     """リール
@@ -13,14 +16,24 @@ class Reel:
         リールID
     reel_symbol : list[Symbol]
         リール配列
+    reel_symbol_ids : np.ndarray
+        図柄IDのリール配列
     reel_image : MatLike
         リール画像
     current_coord : float
-        リール現在座標
+        リール現在座標 (ピクセル)
+    current_coord_fixed : int
+        リール現在座標 (固定小数点, 1ピクセル = 2 ** GameData.SUBPIXEL_BITS)
     current_symbol : list[Symbol]
         現在表示中の図柄
+    current_symbol_index : int
+        現在上段に表示中の図柄のインデックス (停止位置)
     target_symbol : list[Symbol]
         目標図柄
+    target_symbol_index : int | None
+        目標停止位置 (上段図柄のインデックス)
+    time_to_stop : float | None
+        目標停止位置に到達するまでの残り時間[sec] (停止指示前はNone)
     spinning : bool
         リール回転状態
     stop_request : bool
@@ -28,6 +41,8 @@ class Reel:
     """
 
     _Id: int = 0
+    # 図柄IDの並び → リール画像
+    _reel_image_cache: dict[tuple[int, ...], MatLike] = {}
 
     def __init__(self, reel_symbol: list[Symbol]) -> None:
         """
@@ -51,10 +66,22 @@ class Reel:
         if self._reel_image.shape[0] != GameData.REEL_HEIGHT:
             raise ValueError("リール画像の高さが既定値と一致しません")
 
-        self._current_coord: float = 600.0
-        self._current_symbol: list[Symbol] = self._get_current_symbol()
+        # 図柄IDのリール配列 (窓の判定はインデックス演算で行う)
+        self._reel_symbol_ids: np.ndarray = np.array(
+            [symbol.id for symbol in reel_symbol], dtype=np.int16
+        )
+
+        # 上段図柄のインデックス (停止位置)
+        self._current_symbol_index: int = self._get_symbol_index(0.0)
+        # 上段図柄の図柄境界からの移動量 (固定小数点座標)
+        self._current_offset: int = 0
+        # 1単位に満たない移動量の端数 (単位 × nsec)
+        self._motion_remainder: int = 0
 
-        self._target_symbol: list[Symbol] | list[None] = [None, None, None]
+        # 目標停止位置 (上段図柄のインデックス)
+        self._target_symbol_index: int | None = None
+        # 停止指示から目標停止位置に到達するまでの残り移動量
+        self._stop_distance: int | None = None
 
         self._spinning: bool = False
         self._stop_request: bool = True
@@ -62,6 +89,8 @@ class Reel:
     def _get_reel_image(self, symbols: list["Symbol"]) -> MatLike:
         """リール画像を生成して返す
 
+        同じ図柄IDの並びのリール画像は生成済みのものを共有する
+
         Parameters
         ----------
         symbol_array: list[Symbol]
@@ -70,7 +99,7 @@ class Reel:
         Returns
         -------
         reel_image: MatLike
-            リール画像
+            リール画像 (共有されるため書込不可)
         """
         # 画像サイズチェック
         base_shape = symbols[0].image.shape
@@ -81,43 +110,133 @@ class Reel:
                 raise ValueError("リール画像の幅が不正です")
             if symbol.image.shape[0] != GameData.SYMBOL_HEIGHT:
                 raise ValueError("リール画像の高さが不正です")
-        # 画像を縦に連結
-        reel_image_tmp = symbols[0].image
-        for symbol in symbols[1:]:
-            reel_image_tmp = cv2.vconcat([reel_image_tmp, symbol.image])
-        return reel_image_tmp
 
-    def _get_current_symbol(self) -> list[Symbol]:
-        """現在リール上にある図柄を取得し、現在表示中の図柄として返す
+        key = tuple(symbol.id for symbol in symbols)
+        reel_image = Reel._reel_image_cache.get(key)
+        if reel_image is not None:
+            return reel_image
+
+        # 画像を縦に連結 (確保済みの領域に各図柄を1回ずつ書き込む)
+        symbol_height = GameData.SYMBOL_HEIGHT
+        reel_image = np.empty(
+            (symbol_height * len(symbols),) + base_shape[1:],
+            dtype=symbols[0].image.dtype,
+        )
+        for i, symbol in enumerate(symbols):
+            reel_image[i * symbol_height : (i + 1) * symbol_height] = (
+                symbol.image
+            )
+        reel_image.flags.writeable = False
+        Reel._reel_image_cache[key] = reel_image
+
+        return reel_image
+
+    def _get_symbol_index(self, coord: float) -> int:
+        """リール座標に対応する上段図柄のインデックスを返す
+
+        リールは下方向に回転するため、座標が増えるほど上段図柄の
+        インデックスは減少する
+
+        Parameters
+        ----------
+        coord : float
+            リール座標
 
         Returns
         -------
-        current_symbol : list[Symbol]
-            現在表示中の図柄
+        symbol_index_top : int
+            上段図柄のインデックス
         """
-        # 図柄1つ分の高さ
-        symbol_height = GameData.SYMBOL_HEIGHT
+        return (
+            -int(coord / GameData.SYMBOL_HEIGHT) - 1
+        ) % GameData.REEL_SYMBOL_LENGTH
+
+    def _get_window_symbol(self, symbol_index_top: int) -> list[Symbol]:
+        """上段図柄のインデックスから上段/中段/下段の図柄を返す
 
-        # 上段/中段/下段に表示されている図柄のインデックスを算出
-        current_symbol_index_top = int(self._current_coord / symbol_height) - 1
-        current_symbol_index_middle = current_symbol_index_top + 1
-        current_symbol_index_bottom = current_symbol_index_middle + 1
+        Parameters
+        ----------
+        symbol_index_top : int
+            上段図柄のインデックス
 
-        # リール図柄数
+        Returns
+        -------
+        window_symbol : list[Symbol]
+            図柄 [上段, 中段, 下段]
+        """
         reel_symbol_length = GameData.REEL_SYMBOL_LENGTH
-        # 1周分の補正
-        current_symbol_index_top %= reel_symbol_length
-        current_symbol_index_middle %= reel_symbol_length
-        current_symbol_index_bottom %= reel_symbol_length
-
-        # 図柄のインデックスからオブジェクト取得
-        current_symbol: list[Symbol] = [
-            self._reel_symbol[current_symbol_index_top],
-            self._reel_symbol[current_symbol_index_middle],
-            self._reel_symbol[current_symbol_index_bottom],
+
+        return [
+            self._reel_symbol[(symbol_index_top + row) % reel_symbol_length]
+            for row in range(3)
         ]
 
-        return current_symbol
+    def get_window_symbol_ids(self, symbol_index_top: int) -> list[int]:
+        """上段図柄のインデックスから上段/中段/下段の図柄IDを返す
+
+        Parameters
+        ----------
+        symbol_index_top : int
+            上段図柄のインデックス
+
+        Returns
+        -------
+        window_symbol_ids : list[int]
+            図柄ID [上段, 中段, 下段]
+        """
+        reel_symbol_length = GameData.REEL_SYMBOL_LENGTH
+
+        return [
+            self._reel_symbol_ids.item(
+                (symbol_index_top + row) % reel_symbol_length
+            )
+            for row in range(3)
+        ]
+
+    def _get_motion_units(self, elapsed: float) -> int:
+        """前回の更新から指定時間が経過するまでの移動量を返す
+
+        Parameters
+        ----------
+        elapsed : float
+            前回の更新からの経過時間[sec]
+
+        Returns
+        -------
+        units : int
+            移動量 (固定小数点座標, 停止中は0)
+        """
+        if not self._spinning or elapsed <= 0:
+            return 0
+
+        motion = (
+            GameData.REEL_UNITS * round(elapsed * 1_000_000_000)
+            + self._motion_remainder
+        )
+
+        return motion // GameData.REEL_PERIOD_NS
+
+    def get_stop_symbol_index(self, elapsed: float = 0.0) -> int:
+        """滑りなしで停止した場合の上段図柄のインデックスを返す
+
+        Parameters
+        ----------
+        elapsed : float
+            停止ボタンを押した時刻の前回の更新からの経過時間[sec]
+            (押した時刻のリール座標から停止位置を求める)
+
+        Returns
+        -------
+        stop_symbol_index : int
+            次の図柄境界で停止した場合の上段図柄のインデックス
+        """
+        steps = (
+            self._current_offset + self._get_motion_units(elapsed)
+        ) // GameData.SYMBOL_UNITS
+
+        return (
+            self._current_symbol_index - steps - 1
+        ) % GameData.REEL_SYMBOL_LENGTH
 
     def get_n_ahead_symbol(self, n: int) -> list[Symbol]:
         """現在位置からn個先の図柄を取得
@@ -130,36 +249,12 @@ class Reel:
         if n < 0:
             raise ValueError("nに負の値は指定できません")
 
-        target_symbol_index_top = (
-            self._reel_symbol.index(
-                self._current_symbol[GameData.REEL_POSITION_TOP]
-            )
-            - n
-        )
-        target_symbol_index_middle = target_symbol_index_top + 1
-        target_symbol_index_bottom = target_symbol_index_middle + 1
-
-        # リール図柄数
-        reel_symbol_length = GameData.REEL_SYMBOL_LENGTH
-
-        # 1周分の補正
-        target_symbol_index_top %= reel_symbol_length
-        target_symbol_index_middle %= reel_symbol_length
-        target_symbol_index_bottom %= reel_symbol_length
-
-        # 図柄のインデックスからオブジェクト取得
-        target_symbol: list[Symbol] = [
-            self._reel_symbol[target_symbol_index_top],
-            self._reel_symbol[target_symbol_index_middle],
-            self._reel_symbol[target_symbol_index_bottom],
-        ]
+        return self._get_window_symbol(self._current_symbol_index - n)
 
-        return target_symbol
-
-    def _get_target_symbol(
+    def _get_target_symbol_index(
         self, target_symbol_index: int, target_stop_position: int
-    ) -> list[Symbol]:
-        """リール目標表示図柄を設定
+    ) -> int:
+        """目標図柄と目標停止位置から目標停止位置の上段図柄を算出する
 
         Parameters
         ----------
@@ -167,53 +262,42 @@ class Reel:
             目標図柄のインデックス
         target_stop_position : int
             目標停止位置
+
+        Returns
+        -------
+        target_symbol_index_top : int
+            停止時の上段図柄のインデックス
         """
         if target_symbol_index < 0:
             raise ValueError("目標図柄のインデックスに負の値は指定できません")
-        if GameData.REEL_SYMBOL_LENGTH < target_symbol_index:
+        if GameData.REEL_SYMBOL_LENGTH <= target_symbol_index:
             raise ValueError(
                 "目標図柄のインデックスがリール配列の図柄数を超えています"
             )
         if target_stop_position == GameData.REEL_POSITION_TOP:
             target_symbol_index_top = target_symbol_index
-            target_symbol_index_middle = target_symbol_index_top - 1
-            target_symbol_index_bottom = target_symbol_index_middle - 1
         elif target_stop_position == GameData.REEL_POSITION_MIDDLE:
-            target_symbol_index_middle = target_symbol_index
-            target_symbol_index_top = target_symbol_index_middle + 1
-            target_symbol_index_bottom = target_symbol_index_middle - 1
+            target_symbol_index_top = target_symbol_index - 1
         elif target_stop_position == GameData.REEL_POSITION_BOTTOM:
-            target_symbol_index_bottom = target_symbol_index
-            target_symbol_index_top = target_symbol_index_bottom + 2
-            target_symbol_index_middle = target_symbol_index_top - 1
+            target_symbol_index_top = target_symbol_index - 2
         else:
             raise ValueError("目標停止位置の値が不正です")
 
-        # リール図柄数
-        reel_symbol_length = GameData.REEL_SYMBOL_LENGTH
-
-        # 1周分の補正
-        target_symbol_index_top %= reel_symbol_length
-        target_symbol_index_middle %= reel_symbol_length
-        target_symbol_index_bottom %= reel_symbol_length
-
-        # 図柄のインデックスからオブジェクト取得
-        target_symbol: list[Symbol] = [
-            self._reel_symbol[target_symbol_index_top],
-            self._reel_symbol[target_symbol_index_middle],
-            self._reel_symbol[target_symbol_index_bottom],
-        ]
-
-        return target_symbol
+        return target_symbol_index_top % GameData.REEL_SYMBOL_LENGTH
 
     def reel_start(self) -> None:
         """リールの回転を開始する"""
-        self._targetsymbol = [None, None, None]
+        self._target_symbol_index = None
+        self._stop_distance = None
+        self._motion_remainder = 0
         self._spinning = True
         self._stop_request = False
 
     def stop_spin(
-        self, target_symbol_index: int, target_stop_position: int
+        self,
+        target_symbol_index: int,
+        target_stop_position: int,
+        elapsed: float = 0.0,
     ) -> None:
         """リール停止指示を行う
 
@@ -223,15 +307,30 @@ class Reel:
             目標図柄のインデックス
         target_stop_position : int
             目標停止位置
+        elapsed : float
+            停止ボタンを押した時刻の前回の更新からの経過時間[sec]
         """
-        # リール目標表示図柄を設定
-        self._target_symbol = self._get_target_symbol(
+        # リール目標停止位置を設定
+        self._target_symbol_index = self._get_target_symbol_index(
             target_symbol_index, target_stop_position
         )
 
+        # 目標停止位置までの移動量を算出
+        # (目標停止位置に到達した時点で停止する)
+        distance = (
+            self._current_symbol_index - self._target_symbol_index
+        ) % GameData.REEL_SYMBOL_LENGTH
+        self._stop_distance = max(
+            distance * GameData.SYMBOL_UNITS - self._current_offset, 0
+        )
+        # 押した時刻までに通過する位置には停止できないため次の周で停止する
+        if self._stop_distance < self._get_motion_units(elapsed):
+            self._stop_distance += GameData.REEL_UNITS
+
         # リール停止指示
         self._stop_request = True
 
+    @tracer.traced("Reel.update")
     def update(self, dt: float):
         """リール状態を更新する
 
@@ -240,51 +339,47 @@ class Reel:
         dt: float
             前回からの経過時間
         """
+        # 停止中は何もしない
+        if not self._spinning:
+            return
 
-        # 回転中の場合
-        if self._spinning:
-            # リール座標を更新する
-            self._current_coord = self._get_updated_current_coord(
-                self._current_coord, dt
-            )
-
-            # 現在表示中の図柄を取得
-            self._current_symbol = self._get_current_symbol()
-
-            # 停止指示がある場合
-            if self._stop_request:
-                # 現在表示中の図柄 = 停止目標図柄であれば回転停止
-                if self._current_symbol == self._targetsymbol:
-                    self._spinning = False
-
-    def _get_updated_current_coord(
-        self, current_coord: float, dt: float
-    ) -> float:
-        """リールの現在座標を更新する
-
-        Parameters
-        ----------
-        dt: float
-            前回からの経過時間
-        current_coord: float
-            現在座標
-
-        Returns
-        -------
-        current_coord: float
-            更新後のリール現在座標
-        """
-        # リール画像高さ
-        reel_height = GameData.REEL_HEIGHT
-
-        # 前回からの経過時間から現在座標を計算
-        current_coord += (reel_height / GameData.REEL_SPEED) * dt
-
-        # 現在座標がリール端を超えている場合、補正する
-        if current_coord >= reel_height:
-            current_coord %= reel_height
+        symbol_units = GameData.SYMBOL_UNITS
+        reel_symbol_length = GameData.REEL_SYMBOL_LENGTH
 
-        return current_coord
+        # 前回からの経過時間で進んだ移動量 (端数は次回に繰り越す)
+        motion = (
+            GameData.REEL_UNITS * round(dt * 1_000_000_000)
+            + self._motion_remainder
+        )
+        units, self._motion_remainder = divmod(motion, GameData.REEL_PERIOD_NS)
+
+        # 停止指示がある場合、停止までの残り移動量から位置を決める
+        # (経過時間の刻み幅によらず必ず目標停止位置に停止する)
+        if self._stop_request and self._stop_distance is not None:
+            if self._stop_distance <= units:
+                self._current_symbol_index = self._target_symbol_index
+                # 図柄境界に座標を合わせる
+                self._current_offset = 0
+                self._motion_remainder = 0
+                self._stop_distance = None
+                self._spinning = False
+                return
+
+            self._stop_distance -= units
+            # 目標停止位置からの残り移動量で現在位置を逆算する
+            steps = -(-self._stop_distance // symbol_units)
+            self._current_symbol_index = (
+                self._target_symbol_index + steps
+            ) % reel_symbol_length
+            self._current_offset = steps * symbol_units - self._stop_distance
+            return
+
+        steps, self._current_offset = divmod(
+            self._current_offset + units, symbol_units
+        )
+        self._current_symbol_index = (
+            self._current_symbol_index - steps
+        ) % reel_symbol_length
 
     @property
     def id(self) -> int:
@@ -298,17 +393,57 @@ class Reel:
     def reel_image(self) -> MatLike:
         return self._reel_image
 
+    @property
+    def reel_symbol_ids(self) -> np.ndarray:
+        return self._reel_symbol_ids
+
     @property
     def current_coord(self) -> float:
-        return self._current_coord
+        return self.current_coord_fixed / (1 << GameData.SUBPIXEL_BITS)
+
+    @property
+    def current_coord_fixed(self) -> int:
+        # 上段図柄のインデックスから図柄境界の座標を逆算する
+        symbol_steps = (
+            -self._current_symbol_index - 1
+        ) % GameData.REEL_SYMBOL_LENGTH
+
+        return symbol_steps * GameData.SYMBOL_UNITS + self._current_offset
 
     @property
     def current_symbol(self) -> list[Symbol]:
-        return self._current_symbol
+        return self._get_window_symbol(self._current_symbol_index)
+
+    @property
+    def current_symbol_index(self) -> int:
+        return self._current_symbol_index
 
     @property
     def target_symbol(self) -> list[Symbol] | list[None]:
-        return self._target_symbol
+        if self._target_symbol_index is None:
+            return [None, None, None]
+
+        return self._get_window_symbol(self._target_symbol_index)
+
+    @property
+    def target_symbol_index(self) -> int | None:
+        return self._target_symbol_index
+
+    @property
+    def time_to_stop(self) -> float | None:
+        if self._stop_distance is None:
+            return None
+
+        # 残り移動量に到達するまでの時間 (nsec単位で切り上げ)
+        stop_time_ns = -(
+            -(
+                self._stop_distance * GameData.REEL_PERIOD_NS
+                - self._motion_remainder
+            )
+            // GameData.REEL_UNITS
+        )
+
+        return max(stop_time_ns, 0) / 1_000_000_000
 
     @property
     def spinning(self) -> bool:
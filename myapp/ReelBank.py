@@ -0,0 +1,263 @@
+import GameData
+import numpy as np
+
+
+class ReelBank:
+    """複数リールの状態をまとめて保持・更新するリール群
+
+    リールごとの停止位置 (上段図柄のインデックス)・図柄境界からの
+    移動量 (固定小数点座標)・回転状態・停止目標をNumPy配列で保持し、
+    1回の整数の配列演算で全リールを更新する
+
+    配列の形状は任意のため、(台数, リール数) のように複数台の
+    リールをまとめて扱うこともできる
+    座標の更新と停止判定の規則はReelと同じ
+
+    Attributes
+    ----------
+    shape : tuple[int, ...]
+        リール群の形状
+    current_symbol_index : np.ndarray
+        上段図柄のインデックス (停止位置)
+    current_offset : np.ndarray
+        上段図柄の図柄境界からの移動量 (固定小数点座標)
+    current_coord : np.ndarray
+        リール現在座標 (ピクセル)
+    current_coord_fixed : np.ndarray
+        リール現在座標 (固定小数点, 1ピクセル = 2 ** GameData.SUBPIXEL_BITS)
+    spinning : np.ndarray
+        リール回転状態
+    stop_request : np.ndarray
+        リール停止指示状態
+    target_symbol_index : np.ndarray
+        目標停止位置 (上段図柄のインデックス, 未設定はNO_TARGET)
+    """
+
+    # 目標停止位置: 未設定
+    NO_TARGET: int = -1
+
+    def __init__(self, shape: int | tuple[int, ...]) -> None:
+        """
+        Parameters
+        ----------
+        shape : int | tuple[int, ...]
+            リール群の形状 (リール数, または (台数, リール数) など)
+        """
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        if not shape or min(shape) <= 0:
+            raise ValueError("リール群の形状には1以上の値を指定してください")
+
+        # 初期位置はReelと同じく座標0に対応する上段図柄
+        self._current_symbol_index: np.ndarray = np.full(
+            shape, GameData.REEL_SYMBOL_LENGTH - 1, dtype=np.int64
+        )
+        self._current_offset: np.ndarray = np.zeros(shape, dtype=np.int64)
+        self._motion_remainder: np.ndarray = np.zeros(shape, dtype=np.int64)
+        self._spinning: np.ndarray = np.zeros(shape, dtype=bool)
+        self._stop_request: np.ndarray = np.ones(shape, dtype=bool)
+        self._target_symbol_index: np.ndarray = np.full(
+            shape, ReelBank.NO_TARGET, dtype=np.int64
+        )
+        # 停止指示から目標停止位置に到達するまでの残り移動量 (未設定は負)
+        self._stop_distance: np.ndarray = np.full(
+            shape, ReelBank.NO_TARGET, dtype=np.int64
+        )
+
+    def reel_start(self, index=...) -> None:
+        """リールの回転を開始する
+
+        Parameters
+        ----------
+        index : int | tuple | np.ndarray
+            対象リールのインデックス (省略時は全リール)
+        """
+        self._target_symbol_index[index] = ReelBank.NO_TARGET
+        self._stop_distance[index] = ReelBank.NO_TARGET
+        self._motion_remainder[index] = 0
+        self._spinning[index] = True
+        self._stop_request[index] = False
+
+    def _get_motion_units(self, index, elapsed) -> np.ndarray:
+        """前回の更新から指定時間が経過するまでの移動量を返す
+
+        Parameters
+        ----------
+        index : int | tuple | np.ndarray
+            対象リールのインデックス
+        elapsed : float | np.ndarray
+            前回の更新からの経過時間[sec]
+
+        Returns
+        -------
+        units : np.ndarray
+            移動量 (固定小数点座標, 停止中のリールは0)
+        """
+        elapsed_ns = np.rint(np.asarray(elapsed) * 1_000_000_000).astype(
+            np.int64
+        )
+        motion = (
+            GameData.REEL_UNITS * elapsed_ns + self._motion_remainder[index]
+        )
+
+        return np.where(
+            self._spinning[index] & (elapsed_ns > 0),
+            motion // GameData.REEL_PERIOD_NS,
+            0,
+        )
+
+    def stop_spin(self, index, target_symbol_index, elapsed=0.0) -> None:
+        """リール停止指示を行う
+
+        Parameters
+        ----------
+        index : int | tuple | np.ndarray
+            対象リールのインデックス
+        target_symbol_index : int | np.ndarray
+            目標停止位置 (上段図柄のインデックス)
+        elapsed : float | np.ndarray
+            停止ボタンを押した時刻の前回の更新からの経過時間[sec]
+        """
+        target_symbol_index = np.asarray(target_symbol_index)
+        if np.any(target_symbol_index < 0) or np.any(
+            GameData.REEL_SYMBOL_LENGTH <= target_symbol_index
+        ):
+            raise ValueError("目標停止位置の値が不正です")
+
+        self._target_symbol_index[index] = target_symbol_index
+        # 目標停止位置までの移動量を算出する
+        distance = (
+            self._current_symbol_index[index] - target_symbol_index
+        ) % GameData.REEL_SYMBOL_LENGTH
+        stop_distance = np.maximum(
+            distance * GameData.SYMBOL_UNITS - self._current_offset[index], 0
+        )
+        # 押した時刻までに通過する位置には停止できないため次の周で停止する
+        stop_distance = np.where(
+            stop_distance < self._get_motion_units(index, elapsed),
+            stop_distance + GameData.REEL_UNITS,
+            stop_distance,
+        )
+        self._stop_distance[index] = stop_distance
+        self._stop_request[index] = True
+
+    def get_stop_symbol_index(self, index=..., elapsed=0.0) -> np.ndarray:
+        """滑りなしで停止した場合の上段図柄のインデックスを返す
+
+        Parameters
+        ----------
+        index : int | tuple | np.ndarray
+            対象リールのインデックス (省略時は全リール)
+        elapsed : float | np.ndarray
+            停止ボタンを押した時刻の前回の更新からの経過時間[sec]
+            (押した時刻のリール座標から停止位置を求める)
+
+        Returns
+        -------
+        stop_symbol_index : np.ndarray
+            次の図柄境界で停止した場合の上段図柄のインデックス
+        """
+        steps = (
+            self._current_offset[index]
+            + self._get_motion_units(index, elapsed)
+        ) // GameData.SYMBOL_UNITS
+
+        return (
+            self._current_symbol_index[index] - steps - 1
+        ) % GameData.REEL_SYMBOL_LENGTH
+
+    def update(self, dt: float) -> None:
+        """全リールの状態を更新する
+
+        Parameters
+        ----------
+        dt : float
+            前回からの経過時間
+        """
+        spinning = self._spinning
+        if not spinning.any():
+            return
+
+        symbol_units = GameData.SYMBOL_UNITS
+        reel_symbol_length = GameData.REEL_SYMBOL_LENGTH
+
+        # 前回からの経過時間で進んだ移動量 (端数は次回に繰り越す)
+        # (int64で扱うため1回の経過時間は数時間以内とする)
+        motion = self._motion_remainder + np.where(
+            spinning, GameData.REEL_UNITS * round(dt * 1_000_000_000), 0
+        )
+        units, self._motion_remainder = np.divmod(
+            motion, GameData.REEL_PERIOD_NS
+        )
+
+        # 停止指示があるリールは停止までの残り移動量から位置を決める
+        stop_distance = self._stop_distance
+        stopping = spinning & self._stop_request & (stop_distance >= 0)
+        arrived = stopping & (stop_distance <= units)
+        stopping &= ~arrived
+        stop_distance = np.where(
+            stopping, stop_distance - units, stop_distance
+        )
+        stop_steps = -(-stop_distance // symbol_units)
+
+        # 停止指示がないリールは移動量だけ進める
+        free_steps, free_offset = np.divmod(
+            self._current_offset + units, symbol_units
+        )
+
+        target_symbol_index = self._target_symbol_index
+        self._current_symbol_index = np.select(
+            [arrived, stopping],
+            [
+                target_symbol_index,
+                (target_symbol_index + stop_steps) % reel_symbol_length,
+            ],
+            (self._current_symbol_index - free_steps) % reel_symbol_length,
+        )
+        # 停止したリールは図柄境界に座標を合わせる
+        self._current_offset = np.select(
+            [arrived, stopping],
+            [0, stop_steps * symbol_units - stop_distance],
+            free_offset,
+        )
+        self._motion_remainder[arrived] = 0
+        self._stop_distance = np.where(
+            arrived, ReelBank.NO_TARGET, stop_distance
+        )
+        self._spinning = spinning & ~arrived
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._spinning.shape
+
+    @property
+    def current_symbol_index(self) -> np.ndarray:
+        return self._current_symbol_index
+
+    @property
+    def current_offset(self) -> np.ndarray:
+        return self._current_offset
+
+    @property
+    def current_coord(self) -> np.ndarray:
+        return self.current_coord_fixed / (1 << GameData.SUBPIXEL_BITS)
+
+    @property
+    def current_coord_fixed(self) -> np.ndarray:
+        # 上段図柄のインデックスから図柄境界の座標を逆算する
+        symbol_steps = (
+            -self._current_symbol_index - 1
+        ) % GameData.REEL_SYMBOL_LENGTH
+
+        return symbol_steps * GameData.SYMBOL_UNITS + self._current_offset
+
+    @property
+    def spinning(self) -> np.ndarray:
+        return self._spinning
+
+    @property
+    def stop_request(self) -> np.ndarray:
+        return self._stop_request
+
+    @property
+    def target_symbol_index(self) -> np.ndarray:
+        return self._target_symbol_index
@@ -0,0 +1,377 @@
+import GameData
+import numpy as np
+from Role import Role
+from Symbol import Symbol
+
+# 滑りコマ数の上限
+SLIP_MAX: int = 4
+# 滑りコマ数の範囲
+SLIP_MAX_RANGE: range = range(SLIP_MAX + 1)
+
+
+class ReelControl:
+    """リール制御テーブル
+
+    リールごと・内部抽選結果ごと・停止ボタンを押した位置ごとに、
+    リールが滑るコマ数をあらかじめ算出しておき、停止時はテーブルを
+    1回参照するだけで停止位置を決定する
+
+    内部抽選結果は Lottery と同じく 0: ハズレ, i + 1: roles[i] 当選 で表す。
+    位置はすべて上段図柄のインデックスで表し、リールは下方向に回転するため
+    押した位置 p から s コマ滑ると p - s の位置に停止する
+
+    - 当選役あり: 役の Slip.validslip の範囲で、当選役の図柄を優先順位の
+      高い入賞ライン上に引き込めるコマ数を優先し、その中で他の役が揃う
+      危険度が低く、滑りが小さいものを選ぶ。入賞ラインの優先順位は全リール
+      共通で、引き込んだ場合に他の役が揃う危険度が低い順とする
+    - ハズレ: 0 〜 SLIP_MAX コマの範囲で、役が揃う危険度が低く、
+      滑りが小さいものを選ぶ
+
+    危険度は、役の図柄が入賞ライン上に来る数に、他のリールで役の図柄が
+    揃う確率を掛けたものの合計とする
+
+    Attributes
+    ----------
+    roles : list[Role]
+        制御対象の役 (抽選結果 i + 1 に対応する役が roles[i])
+    slip_table : np.ndarray
+        滑りコマ数 (リール数, 抽選結果数, リール図柄数)
+    """
+
+    def __init__(
+        self,
+        roles: list[Role],
+        reel_symbols: list[list[Symbol]],
+        arrays: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        roles : list[Role]
+            制御対象の役
+        reel_symbols : list[list[Symbol]]
+            リール配列 [左リール, 中リール, 右リール]
+        arrays : dict[str, np.ndarray] | None
+            to_arraysで出力したコンパイル済みの配列
+            (指定した場合はコンパイルを省略する)
+        """
+        if len(reel_symbols) != 3:
+            raise ValueError("リール配列の数がリール数と一致しません")
+        for symbols in reel_symbols:
+            if len(symbols) != GameData.REEL_SYMBOL_LENGTH:
+                raise ValueError(
+                    "リール配列の図柄数が既定のリール図柄数と一致しません"
+                )
+        self._roles: list[Role] = roles
+        if arrays is None:
+            self._slip_table: np.ndarray = self._compile(reel_symbols)
+        else:
+            self._slip_table = arrays["slip_table"]
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """コンパイル済みの配列を返す
+
+        Returns
+        -------
+        arrays : dict[str, np.ndarray]
+            コンパイル済みの配列
+        """
+        return {"slip_table": self._slip_table}
+
+    def _get_combo_symbol_flags(
+        self, reel: int, symbols: list[Symbol]
+    ) -> np.ndarray:
+        """リール配列の各図柄が役の図柄であるかを判定する
+
+        Parameters
+        ----------
+        reel : int
+            リール番号 (0: 左リール, 1: 中リール, 2: 右リール)
+        symbols : list[Symbol]
+            リール配列
+
+        Returns
+        -------
+        combo_symbol_flags : np.ndarray
+            役ごと・図柄インデックスごとの判定結果 (役数, リール図柄数)
+        """
+        symbol_ids = np.array([symbol.id for symbol in symbols])
+
+        return np.array(
+            [
+                np.isin(
+                    symbol_ids,
+                    [s.id for s in role.symbolcombo.symbolcombo[reel]],
+                )
+                for role in self._roles
+            ],
+            dtype=bool,
+        ).reshape(len(self._roles), len(symbols))
+
+    def _get_line_hit_counts(
+        self, reel: int, combo_symbol_flags: np.ndarray
+    ) -> np.ndarray:
+        """停止位置ごとに各役の図柄が入賞ライン上に来る数を算出する
+
+        Parameters
+        ----------
+        reel : int
+            リール番号 (0: 左リール, 1: 中リール, 2: 右リール)
+        combo_symbol_flags : np.ndarray
+            役ごと・図柄インデックスごとの役の図柄判定結果
+
+        Returns
+        -------
+        hit_counts : np.ndarray
+            役ごと・停止位置ごとの入賞ライン上の図柄数 (役数, リール図柄数)
+        """
+        hit_counts = np.zeros(combo_symbol_flags.shape, dtype=np.int64)
+        for i, role in enumerate(self._roles):
+            for payline in role.payline:
+                # 停止位置 p のとき入賞ライン上に来る図柄は p + 段位置
+                row = payline.line[reel]
+                hit_counts[i] += np.roll(combo_symbol_flags[i], -row)
+
+        return hit_counts
+
+    def _get_line_orders(
+        self,
+        combo_symbol_flags: list[np.ndarray],
+        risks: list[np.ndarray],
+    ) -> list[list[int]]:
+        """役ごとに引き込みを狙う入賞ラインの優先順を決定する
+
+        各リールが同じ入賞ラインを狙うよう、入賞ラインごとに全リール・
+        全押し位置で引き込んだ場合の他の役が揃う危険度を合計し、
+        危険度が低い順に並べる
+
+        Parameters
+        ----------
+        combo_symbol_flags : list[np.ndarray]
+            リールごとの役の図柄判定結果 (役数, リール図柄数)
+        risks : list[np.ndarray]
+            リールごとの役が揃う危険度 (役数, リール図柄数)
+
+        Returns
+        -------
+        line_orders : list[list[int]]
+            役ごとの入賞ライン (Role.paylineのインデックス) の優先順
+        """
+        reel_length = GameData.REEL_SYMBOL_LENGTH
+        # 引き込めない場合の危険度
+        # (1停止位置の危険度は 役数 × 入賞ライン数 を超えない)
+        unreachable_risk = float(
+            len(self._roles) * max(len(role.payline) for role in self._roles)
+            + 1
+        )
+
+        line_orders: list[list[int]] = []
+        for i, role in enumerate(self._roles):
+            line_costs: list[float] = []
+            for payline in role.payline:
+                cost = 0.0
+                for reel, flags in enumerate(combo_symbol_flags):
+                    other_risk = risks[reel].sum(axis=0) - risks[reel][i]
+                    row = payline.line[reel]
+                    validslip = role.slip.validslip[reel] or [0]
+                    for press in range(reel_length):
+                        reachable_risks = [
+                            other_risk[(press - slip) % reel_length]
+                            for slip in validslip
+                            if flags[i, (press - slip + row) % reel_length]
+                        ]
+                        cost += min(reachable_risks, default=unreachable_risk)
+                line_costs.append(cost)
+            line_orders.append(
+                sorted(range(len(role.payline)), key=lambda k: line_costs[k])
+            )
+
+        return line_orders
+
+    def _get_line_ranks(
+        self,
+        reel: int,
+        combo_symbol_flags: np.ndarray,
+        line_orders: list[list[int]],
+    ) -> np.ndarray:
+        """停止位置ごとに各役の図柄が来る入賞ラインの優先順位を算出する
+
+        Parameters
+        ----------
+        reel : int
+            リール番号 (0: 左リール, 1: 中リール, 2: 右リール)
+        combo_symbol_flags : np.ndarray
+            役ごと・図柄インデックスごとの役の図柄判定結果
+        line_orders : list[list[int]]
+            役ごとの入賞ラインの優先順
+
+        Returns
+        -------
+        line_ranks : np.ndarray
+            役ごと・停止位置ごとの入賞ラインの優先順位
+            (役の図柄が入賞ライン上に来ない場合はライン数) (役数, リール図柄数)
+        """
+        line_ranks = np.zeros(combo_symbol_flags.shape, dtype=np.int64)
+        for i, role in enumerate(self._roles):
+            line_ranks[i] = len(role.payline)
+            for rank in reversed(range(len(line_orders[i]))):
+                row = role.payline[line_orders[i][rank]].line[reel]
+                line_ranks[i][np.roll(combo_symbol_flags[i], -row)] = rank
+
+        return line_ranks
+
+    def _get_role_weights(
+        self, reel_symbols: list[list[Symbol]]
+    ) -> np.ndarray:
+        """役の図柄が入賞ライン上に来た場合の重みを算出する
+
+        あるリールで役の図柄が入賞ライン上に来たとき、他のリールで役の
+        図柄が揃う確率 (他リールの配列中の役の図柄の割合の積) を重みとする
+
+        Parameters
+        ----------
+        reel_symbols : list[list[Symbol]]
+            リール配列 [左リール, 中リール, 右リール]
+
+        Returns
+        -------
+        role_weights : np.ndarray
+            役ごと・リールごとの重み (役数, リール数)
+        """
+        # 役ごと・リールごとの配列中の役の図柄の割合 (役数, リール数)
+        symbol_ratio = np.array(
+            [
+                [
+                    np.mean(
+                        [
+                            symbol in role.symbolcombo.symbolcombo[reel]
+                            for symbol in symbols
+                        ]
+                    )
+                    for reel, symbols in enumerate(reel_symbols)
+                ]
+                for role in self._roles
+            ]
+        )
+
+        role_weights = np.ones_like(symbol_ratio)
+        for reel in range(len(reel_symbols)):
+            for other_reel in range(len(reel_symbols)):
+                if other_reel != reel:
+                    role_weights[:, reel] *= symbol_ratio[:, other_reel]
+
+        return role_weights
+
+    def _compile(self, reel_symbols: list[list[Symbol]]) -> np.ndarray:
+        """リール制御テーブルを生成する
+
+        Parameters
+        ----------
+        reel_symbols : list[list[Symbol]]
+            リール配列 [左リール, 中リール, 右リール]
+
+        Returns
+        -------
+        slip_table : np.ndarray
+            滑りコマ数 (リール数, 抽選結果数, リール図柄数)
+        """
+        reel_length = GameData.REEL_SYMBOL_LENGTH
+        result_count = len(self._roles) + 1
+        role_weights = self._get_role_weights(reel_symbols)
+
+        combo_symbol_flags = [
+            self._get_combo_symbol_flags(reel, symbols)
+            for reel, symbols in enumerate(reel_symbols)
+        ]
+        hit_counts = [
+            self._get_line_hit_counts(reel, flags)
+            for reel, flags in enumerate(combo_symbol_flags)
+        ]
+        # 停止位置ごとに役が揃ってしまう危険度 (役数, リール図柄数)
+        risks = [
+            counts * role_weights[:, reel, np.newaxis]
+            for reel, counts in enumerate(hit_counts)
+        ]
+        line_orders = self._get_line_orders(combo_symbol_flags, risks)
+
+        slip_table = np.zeros(
+            (len(reel_symbols), result_count, reel_length), dtype=np.uint8
+        )
+        for reel in range(len(reel_symbols)):
+            line_ranks = self._get_line_ranks(
+                reel, combo_symbol_flags[reel], line_orders
+            )
+            total_risk = risks[reel].sum(axis=0)
+
+            for press in range(reel_length):
+                # ハズレ
+                slip_table[reel, 0, press] = min(
+                    SLIP_MAX_RANGE,
+                    key=lambda slip: (
+                        total_risk[(press - slip) % reel_length],
+                        slip,
+                    ),
+                )
+
+                # 当選役あり
+                for i, role in enumerate(self._roles):
+                    validslip = role.slip.validslip[reel] or [0]
+                    other_risk = total_risk - risks[reel][i]
+                    slip_table[reel, i + 1, press] = min(
+                        validslip,
+                        key=lambda slip: (
+                            line_ranks[i, (press - slip) % reel_length],
+                            other_risk[(press - slip) % reel_length],
+                            slip,
+                        ),
+                    )
+
+        return slip_table
+
+    def get_slip(self, reel: int, result: int, press: int) -> int:
+        """滑りコマ数を返す
+
+        Parameters
+        ----------
+        reel : int
+            リール番号 (0: 左リール, 1: 中リール, 2: 右リール)
+        result : int
+            内部抽選結果 (0: ハズレ, i + 1: roles[i] 当選)
+        press : int
+            停止ボタンを押した位置 (滑りなしで停止する上段図柄のインデックス)
+
+        Returns
+        -------
+        slip : int
+            滑りコマ数
+        """
+        return self._slip_table.item(reel, result, press)
+
+    def get_stop_index(self, reel: int, result: int, press: int) -> int:
+        """停止位置を返す
+
+        Parameters
+        ----------
+        reel : int
+            リール番号 (0: 左リール, 1: 中リール, 2: 右リール)
+        result : int
+            内部抽選結果 (0: ハズレ, i + 1: roles[i] 当選)
+        press : int
+            停止ボタンを押した位置 (滑りなしで停止する上段図柄のインデックス)
+
+        Returns
+        -------
+        stop_index : int
+            停止位置 (上段図柄のインデックス)
+        """
+        slip = self._slip_table.item(reel, result, press)
+
+        return (press - slip) % GameData.REEL_SYMBOL_LENGTH
+
+    @property
+    def roles(self) -> list[Role]:
+        return self._roles
+
+    @property
+    def slip_table(self) -> np.ndarray:
+        return self._slip_table
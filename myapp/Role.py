@@ -77,7 +77,7 @@ class PressOrder:
         for val_l in pressorder[0]:
             for val_c in pressorder[1]:
                 for val_r in pressorder[2]:
-                    if [val_l, val_c, val_r].sort() == [1, 2, 3]:
+                    if sorted([val_l, val_c, val_r]) == [1, 2, 3]:
                         result = True
 
         return result
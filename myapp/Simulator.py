@@ -0,0 +1,305 @@
+import time
+
+import GameData
+import numpy as np
+import SlotData
+from Role import Role
+from Slot import Slot
+
+
+class SimulationResult:
+    """シミュレーション結果
+
+    Attributes
+    ----------
+    games : int
+        遊技数
+    elapsed : float
+        シミュレーションに要した実時間[sec]
+    virtual_time : float
+        仮想時計上の経過時間[sec]
+    payout_in : int
+        投入クレジット数 (再遊技を除くBET数の合計)
+    payout_out : int
+        払出クレジット数の合計
+    payout_histogram : np.ndarray
+        払出クレジット数ごとの遊技数 ([n]: 払出n枚の遊技数)
+    role_hits : np.ndarray
+        役ごとの入賞遊技数 (SlotData.ROLESと同じ並び)
+    games_per_sec : float
+        1秒あたりの遊技数 (実時間基準)
+    payout_rate : float
+        機械割 (払出クレジット数 / 投入クレジット数)
+    """
+
+    def __init__(
+        self,
+        games: int,
+        elapsed: float,
+        virtual_time: float,
+        payout_in: int,
+        payout_out: int,
+        payout_histogram: np.ndarray,
+        role_hits: np.ndarray,
+    ):
+        """
+        Parameters
+        ----------
+        games : int
+            遊技数
+        elapsed : float
+            シミュレーションに要した実時間[sec]
+        virtual_time : float
+            仮想時計上の経過時間[sec]
+        payout_in : int
+            投入クレジット数
+        payout_out : int
+            払出クレジット数の合計
+        payout_histogram : np.ndarray
+            払出クレジット数ごとの遊技数
+        role_hits : np.ndarray
+            役ごとの入賞遊技数
+        """
+        self._games: int = games
+        self._elapsed: float = elapsed
+        self._virtual_time: float = virtual_time
+        self._payout_in: int = payout_in
+        self._payout_out: int = payout_out
+        self._payout_histogram: np.ndarray = payout_histogram
+        self._role_hits: np.ndarray = role_hits
+
+    @classmethod
+    def merge(
+        cls, results: list["SimulationResult"], elapsed: float
+    ) -> "SimulationResult":
+        """複数のシミュレーション結果を合算する
+
+        Parameters
+        ----------
+        results : list[SimulationResult]
+            合算するシミュレーション結果
+        elapsed : float
+            全体の実行に要した実時間[sec]
+
+        Returns
+        -------
+        result : SimulationResult
+            合算したシミュレーション結果
+        """
+        if not results:
+            raise ValueError("合算するシミュレーション結果がありません")
+
+        return cls(
+            games=sum(result.games for result in results),
+            elapsed=elapsed,
+            virtual_time=sum(result.virtual_time for result in results),
+            payout_in=sum(result.payout_in for result in results),
+            payout_out=sum(result.payout_out for result in results),
+            payout_histogram=np.sum(
+                [result.payout_histogram for result in results], axis=0
+            ),
+            role_hits=np.sum([result.role_hits for result in results], axis=0),
+        )
+
+    @property
+    def games(self) -> int:
+        return self._games
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed
+
+    @property
+    def virtual_time(self) -> float:
+        return self._virtual_time
+
+    @property
+    def payout_in(self) -> int:
+        return self._payout_in
+
+    @property
+    def payout_out(self) -> int:
+        return self._payout_out
+
+    @property
+    def payout_histogram(self) -> np.ndarray:
+        return self._payout_histogram
+
+    @property
+    def role_hits(self) -> np.ndarray:
+        return self._role_hits
+
+    @property
+    def games_per_sec(self) -> float:
+        if self._elapsed <= 0:
+            return 0.0
+        return self._games / self._elapsed
+
+    @property
+    def payout_rate(self) -> float:
+        if self._payout_in <= 0:
+            return 0.0
+        return self._payout_out / self._payout_in
+
+
+class Simulator:
+    """ヘッドレスシミュレーター
+
+    pygameを使用せず、仮想時計でSlotを駆動する
+
+    Attributes
+    ----------
+    slot : Slot
+        シミュレーション対象のスロットマシン
+    dt : float
+        仮想時計の刻み幅[sec]
+    time : float
+        仮想時計の現在時刻[sec]
+    """
+
+    def __init__(
+        self,
+        slot: Slot,
+        dt: float = GameData.SIMULATION_TIMESTEP,
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        slot : Slot
+            シミュレーション対象のスロットマシン
+        dt : float
+            仮想時計の刻み幅[sec]
+        rng : np.random.Generator | None
+            停止ボタンを押すタイミングの決定に使用する乱数生成器
+        """
+        if dt <= 0:
+            raise ValueError("仮想時計の刻み幅には正の値を指定してください")
+        self._slot: Slot = slot
+        self._dt: float = dt
+        self._rng: np.random.Generator = (
+            rng if rng is not None else np.random.default_rng()
+        )
+        self._time: float = 0.0
+
+        # 集計
+        self._role_index: dict[Role, int] = {
+            role: i for i, role in enumerate(SlotData.ROLES)
+        }
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        """集計値を初期化する"""
+        self._payout_in: int = 0
+        self._payout_out: int = 0
+        self._payout_counts: list[int] = [0] * (GameData.PAYOUT_MAX + 1)
+        self._role_hit_counts: list[int] = [0] * len(SlotData.ROLES)
+
+    def _step(self) -> None:
+        """仮想時計を1刻み進めてスロット状態を更新する"""
+        self._slot.update(self._dt)
+        self._time += self._dt
+
+    def _advance(self, seconds: float) -> None:
+        """仮想時計を指定時間だけ一度に進めてスロット状態を更新する
+
+        リールの停止位置は停止指示時に確定するため、リール回転中は
+        刻み幅に分割せずに進めても結果は変わらない
+
+        Parameters
+        ----------
+        seconds : float
+            経過時間[sec]
+        """
+        self._slot.update(seconds)
+        self._time += seconds
+
+    def play_game(self) -> None:
+        """1遊技を実行する
+
+        MAXBET → レバーON → 左/中/右リール停止の順に操作し、
+        全リールが停止して遊技が終了するまで仮想時計を進める
+        """
+        slot = self._slot
+
+        # BET (再遊技時はBETが持ち越されるため投入なし)
+        replay = slot.replay
+        slot.maxbet_keydown()
+        while slot.beting:
+            self._step()
+        if not replay:
+            self._payout_in += slot.bet
+
+        # レバーON
+        slot.lever_keydown()
+
+        # リール停止 (リール1周以内のランダムなタイミングで押す)
+        for reelstop_keydown in (
+            slot.leftreelstop_keydown,
+            slot.centerreelstop_keydown,
+            slot.rightreelstop_keydown,
+        ):
+            self._advance(self._rng.random() * GameData.REEL_SPEED)
+            reelstop_keydown()
+
+        # 最後のリールが停止するまで早送りする
+        times_to_stop = [
+            reel.time_to_stop
+            for reel in slot.reel
+            if reel.time_to_stop is not None
+        ]
+        if times_to_stop:
+            self._advance(max(times_to_stop))
+        while slot.gaming:
+            self._step()
+
+        # 集計
+        self._payout_out += slot.payout
+        self._payout_counts[slot.payout] += 1
+        for role in slot.roles:
+            self._role_hit_counts[self._role_index[role]] += 1
+
+    def run(self, games: int) -> SimulationResult:
+        """指定された遊技数のシミュレーションを実行する
+
+        Parameters
+        ----------
+        games : int
+            遊技数
+
+        Returns
+        -------
+        result : SimulationResult
+            シミュレーション結果
+        """
+        if games < 0:
+            raise ValueError("遊技数に負の値は指定できません")
+
+        self._reset_counters()
+        start_time = self._time
+        start = time.perf_counter()
+        for _ in range(games):
+            self.play_game()
+        elapsed = time.perf_counter() - start
+
+        return SimulationResult(
+            games=games,
+            elapsed=elapsed,
+            virtual_time=self._time - start_time,
+            payout_in=self._payout_in,
+            payout_out=self._payout_out,
+            payout_histogram=np.array(self._payout_counts, dtype=np.int64),
+            role_hits=np.array(self._role_hit_counts, dtype=np.int64),
+        )
+
+    @property
+    def slot(self) -> Slot:
+        return self._slot
+
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @property
+    def time(self) -> float:
+        return self._time
@@ -1,11 +1,24 @@
 import time
 
+import config
 import GameData
 import Logger
+import numpy as np
 import SlotData
+import Tracer
+from GameJournal import GameJournal
+from InputRecording import InputRecording
+from Lottery import Lottery
+from PayoutTable import PayoutTable
 from Reel import Reel
+from ReelControl import ReelControl
+from Role import Role
+from Symbol import Symbol
+from TableCache import TableCache
+from WinEvaluator import WinEvaluator
 
 log = Logger.get_logger(__name__)
+tracer = Tracer.get_tracer()
 
 
 class Slot:
@@ -34,17 +47,46 @@ class Slot:
         再遊技可能状態
     gaming : bool
         遊技状態
+    time_ns : int
+        論理時刻 (updateで進めた経過時間の合計) [nsec]
+    game_count : int
+        遊技数
+    spec_hash : str
+        テーブルの生成元となる仕様 (リール配列, 役, 入賞ライン, 抽選テーブル)
+        のハッシュ値
     setting : int
         設定
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        rng: np.random.Generator | None = None,
+        cache_dir: str | None = config.CACHE_DIR,
+        journal: GameJournal | None = None,
+        recorder: InputRecording | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        rng : np.random.Generator | None
+            内部抽選に使用する乱数生成器
+        cache_dir : str | None
+            コンパイル済みテーブルのキャッシュの保存先
+            (Noneの場合はキャッシュを使用しない)
+        journal : GameJournal | None
+            遊技ごとの記録の出力先 (Noneの場合は記録しない)
+        recorder : InputRecording | None
+            ボタン入力の記録先 (Noneの場合は記録しない)
+        """
+        self._rng: np.random.Generator = (
+            rng if rng is not None else np.random.default_rng()
+        )
         self._credit = 0
         self._payout = 0
         self._bet = 0
         self._validbet: list[int] = [3]
         # self._payline: list[payline] = None
-        self._roles = None
+        self._roles: list[Role] = []
 
         log.info("reel generate")
         self._reel = [
@@ -56,6 +98,33 @@ class Slot:
         log.info(self._reel[0].current_symbol[1].name)
         log.info(self._reel[0].current_symbol[2].name)
         log.info(self._reel[0].get_n_ahead_symbol(n=1)[0].name)
+
+        reel_symbols = [reel.reel_symbol for reel in self._reel]
+        self._spec_hash: str = self.get_spec_hash(reel_symbols)
+        tables = self._load_tables(reel_symbols, cache_dir)
+
+        log.info("payout table generate")
+        self._payout_table = PayoutTable(
+            evaluator=WinEvaluator(
+                roles=SlotData.ROLES, paylines=SlotData.PAYLINES
+            ),
+            reel_symbols=reel_symbols,
+            arrays=tables.get("payout_table"),
+        )
+
+        log.info("reel control table generate")
+        self._lottery = Lottery(
+            table=SlotData.LOTTERY_TABLE, arrays=tables.get("lottery")
+        )
+        self._lottery_result: int = Lottery.RESULT_NONE
+        self._reel_control = ReelControl(
+            roles=self._lottery.roles,
+            reel_symbols=reel_symbols,
+            arrays=tables.get("reel_control"),
+        )
+
+        if cache_dir is not None and not tables:
+            self._save_tables(cache_dir)
         self._start: bool = False
         self._replay: bool = False
         self._wait: bool = False
@@ -64,73 +133,221 @@ class Slot:
         self._beting: bool = False
         self._targetbet: int = False
         self._latest_betstart_time: float = time.perf_counter()
+        # 論理時刻 (updateで進めた経過時間の合計) [nsec]
+        self._time_ns: int = 0
+
+        # 遊技の記録
+        self._journal: GameJournal | None = journal
+        self._game_count: int = 0
+        # 押し順 (停止操作したリールのインデックス)
+        self._press_order: list[int] = []
+        # リールごとの押した位置 (滑りなしの停止位置)
+        self._press_positions: list[int] = [0, 0, 0]
+        # ボタン入力の記録
+        self._recorder: InputRecording | None = recorder
 
         self.internalState = SlotData.STATE_NORMAL
         self.ATState = SlotData.STATE_NORMAL
         self.NaviState = SlotData.STATE_NORMAL
         self.RTState = SlotData.STATE_NORMAL
 
+    @staticmethod
+    def get_spec_hash(reel_symbols: list[list[Symbol]] | None = None) -> str:
+        """テーブルの生成元となる仕様のハッシュ値を返す
+
+        Parameters
+        ----------
+        reel_symbols : list[list[Symbol]] | None
+            リール配列 [左リール, 中リール, 右リール]
+            (Noneの場合はSlotDataのリール配列)
+
+        Returns
+        -------
+        spec_hash : str
+            仕様のハッシュ値
+        """
+        if reel_symbols is None:
+            reel_symbols = [
+                SlotData.REEL_SYMBOLPATTERN_L,
+                SlotData.REEL_SYMBOLPATTERN_C,
+                SlotData.REEL_SYMBOLPATTERN_R,
+            ]
+
+        return TableCache.get_spec_hash(
+            reel_symbols=reel_symbols,
+            roles=SlotData.ROLES,
+            paylines=SlotData.PAYLINES,
+            lottery_table=SlotData.LOTTERY_TABLE,
+        )
+
+    def _load_tables(
+        self, reel_symbols: list[list[Symbol]], cache_dir: str | None
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """キャッシュからコンパイル済みテーブルを読み込む
+
+        Parameters
+        ----------
+        reel_symbols : list[list[Symbol]]
+            リール配列 [左リール, 中リール, 右リール]
+        cache_dir : str | None
+            キャッシュの保存先
+
+        Returns
+        -------
+        tables : dict[str, dict[str, np.ndarray]]
+            テーブル名ごとの配列 (キャッシュがない場合は空)
+        """
+        if cache_dir is None:
+            return {}
+
+        # 仕様のハッシュ値が同じでも配列の形状が異なるキャッシュは使用しない
+        reel_lengths = tuple(len(symbols) for symbols in reel_symbols)
+        layouts = {
+            "payout_table": {"payouts": (reel_lengths, np.dtype(np.int64))},
+            "reel_control": {
+                "slip_table": (
+                    (
+                        len(reel_symbols),
+                        len(SlotData.LOTTERY_TABLE) + 1,
+                        max(reel_lengths),
+                    ),
+                    np.dtype(np.uint8),
+                )
+            },
+        }
+        tables = TableCache(cache_dir=cache_dir).load(self._spec_hash, layouts)
+        if tables is None:
+            return {}
+        log.info("table cache loaded: %s", self._spec_hash)
+
+        return tables
+
+    def _save_tables(self, cache_dir: str) -> None:
+        """コンパイル済みテーブルをキャッシュに保存する
+
+        Parameters
+        ----------
+        cache_dir : str
+            キャッシュの保存先
+        """
+        TableCache(cache_dir=cache_dir).save(
+            self._spec_hash,
+            {
+                "payout_table": self._payout_table.to_arrays(),
+                "lottery": self._lottery.to_arrays(),
+                "reel_control": self._reel_control.to_arrays(),
+            },
+        )
+        log.info("table cache saved: %s", self._spec_hash)
+
     # ボタン処理
     def onebet_keydown(self):
         """ONEBETボタンを押した場合の処理"""
+        self._record_input("onebet", True)
         # ONEBETボタン状態 = 押下
         self._onebet()
 
     def onebet_keyup(self):
         """ONEBETボタンを離した場合の処理"""
+        self._record_input("onebet", False)
         # ONEBETボタン状態 = 開放
         pass
 
     def maxbet_keydown(self):
         """MAXBETボタンを押した場合の処理"""
+        self._record_input("maxbet", True)
         # MAXBETボタン状態 = 押下
         self._maxbet()
 
     def maxbet_keyup(self):
         """MAXBETボタンを離した場合の処理"""
+        self._record_input("maxbet", False)
         # MAXBETボタン状態 = 開放
         pass
 
     def lever_keydown(self):
         """LEVERボタンを押した場合の処理"""
+        self._record_input("lever", True)
         # LEVERボタン状態 = 押下
         self._leveron()
 
     def lever_keyup(self):
         """LEVERボタンを離した場合の処理"""
+        self._record_input("lever", False)
         # LEVERボタン状態 = 開放
         pass
 
-    def leftreelstop_keydown(self):
-        """左リール停止ボタンを押した場合の処理"""
+    def leftreelstop_keydown(self, elapsed: float = 0.0):
+        """左リール停止ボタンを押した場合の処理
+
+        Parameters
+        ----------
+        elapsed : float
+            ボタンを押した時刻の前回の更新からの経過時間[sec]
+        """
+        self._record_input("leftreelstop", True, elapsed)
         # 左リール停止ボタン状態 = 押下
-        self._leftreelstop()
+        self._leftreelstop(elapsed)
 
     def leftreelstop_keyup(self):
         """左リール停止ボタンを離した場合の処理"""
+        self._record_input("leftreelstop", False)
         # 左リール停止ボタン状態 = 開放
         pass
 
-    def centerreelstop_keydown(self):
-        """中リール停止ボタンを押した場合の処理"""
+    def centerreelstop_keydown(self, elapsed: float = 0.0):
+        """中リール停止ボタンを押した場合の処理
+
+        Parameters
+        ----------
+        elapsed : float
+            ボタンを押した時刻の前回の更新からの経過時間[sec]
+        """
+        self._record_input("centerreelstop", True, elapsed)
         # 中リール停止ボタン状態 = 押下
-        self._centerreelstop()
+        self._centerreelstop(elapsed)
 
     def centerreelstop_keyup(self):
         """中リール停止ボタンを離した場合の処理"""
+        self._record_input("centerreelstop", False)
         # 中リール停止ボタン状態 = 開放
         pass
 
-    def rightreelstop_keydown(self):
-        """右リール停止ボタンを押した場合の処理"""
+    def rightreelstop_keydown(self, elapsed: float = 0.0):
+        """右リール停止ボタンを押した場合の処理
+
+        Parameters
+        ----------
+        elapsed : float
+            ボタンを押した時刻の前回の更新からの経過時間[sec]
+        """
+        self._record_input("rightreelstop", True, elapsed)
         # 右リール停止ボタン状態 = 押下
-        self._rightreelstop()
+        self._rightreelstop(elapsed)
 
     def rightreelstop_keyup(self):
         """右リール停止ボタンを離した場合の処理"""
+        self._record_input("rightreelstop", False)
         # 右リール停止ボタン状態 = 開放
         pass
 
+    def _record_input(self, button: str, pressed: bool, elapsed: float = 0.0):
+        """ボタン入力を記録する
+
+        Parameters
+        ----------
+        button : str
+            ボタン名
+        pressed : bool
+            押下であればTrue, 開放であればFalse
+        elapsed : float
+            ボタンを押した時刻の前回の更新からの経過時間[sec]
+        """
+        if self._recorder is not None:
+            self._recorder.record(
+                self._time_ns, round(elapsed * 1_000_000_000), button, pressed
+            )
+
     # イベント処理
     def _onebet(self):
         """ONEBET処理"""
@@ -140,11 +357,11 @@ class Slot:
             if current_bet != current_validbet_max:
                 self._beting = True
                 self._targetbet = current_bet + 1
-                self._latest_bet_interval_time = GameData.BET_INTERVAL
+                self._latest_bet_interval_ns = GameData.BET_INTERVAL_NS
             else:
                 self._beting = True
                 self._targetbet = 1
-                self._latest_bet_interval_time = GameData.BET_INTERVAL
+                self._latest_bet_interval_ns = GameData.BET_INTERVAL_NS
 
     def _maxbet(self):
         """MAXBET処理"""
@@ -154,11 +371,17 @@ class Slot:
             if current_bet != current_validbet_max:
                 self._beting = True
                 self._targetbet = current_validbet_max
-                self._latest_bet_interval_time = GameData.BET_INTERVAL
+                self._latest_bet_interval_ns = GameData.BET_INTERVAL_NS
 
     def _leveron(self):
         """遊技開始処理(仮)"""
+        if self._is_gaming() or self._beting:
+            return
         if self._bet in self._validbet:
+            self._gaming = True
+            self._press_order = []
+            # 内部抽選
+            self._lottery_result = self._lottery.draw(self._rng)
             self._reel[0].reel_start()
             self._reel[1].reel_start()
             self._reel[2].reel_start()
@@ -170,26 +393,46 @@ class Slot:
         #         # 遊技開始()
         #         pass
 
-    def _leftreelstop(self):
+    def _leftreelstop(self, elapsed: float = 0.0):
         """左リール停止処理"""
-        if self._reel[0].spinning:
-            if not self._reel[0].stop_request:
-                # 左リール停止指示()
-                pass
+        self._reelstop(0, elapsed)
 
-    def _centerreelstop(self):
+    def _centerreelstop(self, elapsed: float = 0.0):
         """中リール停止処理"""
-        if "中リール回転中()?":
-            if "中リールに停止指示がない()?":
-                # 中リール停止指示()
-                pass
+        self._reelstop(1, elapsed)
 
-    def _rightreelstop(self):
+    def _rightreelstop(self, elapsed: float = 0.0):
         """右リール停止処理"""
-        if "右リール回転中()?":
-            if "右リールに停止指示がない()?":
-                # 右リール停止指示()
-                pass
+        self._reelstop(2, elapsed)
+
+    def _reelstop(self, reel_index: int, elapsed: float = 0.0):
+        """リール停止処理
+
+        Parameters
+        ----------
+        reel_index : int
+            停止対象のリール (0: 左リール, 1: 中リール, 2: 右リール)
+        elapsed : float
+            ボタンを押した時刻の前回の更新からの経過時間[sec]
+            (押した時刻のリール座標から停止位置を決定する)
+        """
+        reel = self._reel[reel_index]
+        # リール回転中かつ停止指示がない場合のみ停止指示を行う
+        if reel.spinning and not reel.stop_request:
+            # 押した位置と内部抽選結果からリール制御テーブルで停止位置を決定
+            press = reel.get_stop_symbol_index(elapsed)
+            self._press_order.append(reel_index)
+            self._press_positions[reel_index] = press
+            stop_index = self._reel_control.get_stop_index(
+                reel=reel_index,
+                result=self._lottery_result,
+                press=press,
+            )
+            reel.stop_spin(
+                target_symbol_index=stop_index,
+                target_stop_position=GameData.REEL_POSITION_TOP,
+                elapsed=elapsed,
+            )
 
     def _get_current_validbet_max(self) -> int:
         """現在の有効BET数の最大値を返す"""
@@ -206,17 +449,17 @@ class Slot:
             前回からの経過時間
         """
         if self._beting:
-            self._latest_bet_interval_time -= dt
-            if self._latest_bet_interval_time <= 0:
+            # 経過時間は整数のナノ秒で扱い、分割方法によらず結果を一致させる
+            self._latest_bet_interval_ns -= round(dt * 1_000_000_000)
+            # 経過時間が長い場合はその間に行われるBETをまとめて処理する
+            while self._beting and self._latest_bet_interval_ns <= 0:
                 current_validbet_max = self._get_current_validbet_max()
-                # A
                 if self._bet != current_validbet_max:
                     self._bet += 1
                 else:
                     self._bet = 1
 
-                self._latest_bet_interval_time += GameData.BET_INTERVAL
-                # ここで本来はAに戻る必要がある。←forでよさそう
+                self._latest_bet_interval_ns += GameData.BET_INTERVAL_NS
 
                 if self._bet == self._targetbet:
                     self._beting = False
@@ -232,7 +475,58 @@ class Slot:
 
         return result
 
+    def _is_reel_spinning(self) -> bool:
+        """いずれかのリールが回転中であればTrueを返す"""
+        for reel in self._reel:
+            if reel.spinning:
+                return True
+
+        return False
+
+    def _game_end(self):
+        """遊技終了処理(仮)"""
+        self._gaming = False
+
+        # 入賞判定 (停止位置から払出テーブルを参照する)
+        stops = (
+            self._reel[0].current_symbol_index,
+            self._reel[1].current_symbol_index,
+            self._reel[2].current_symbol_index,
+        )
+        self._payout = self._payout_table.get_payout(stops)
+        self._credit += self._payout
+        self._roles = self._payout_table.get_win_roles(stops)
+
+        # 再遊技役入賞時はBETを持ち越す
+        self._replay = False
+        for role in self._roles:
+            if role in SlotData.REPLAY_ROLES:
+                self._replay = True
+        self._game_count += 1
+        if self._journal is not None:
+            self._journal.append(
+                game=self._game_count,
+                time_ns=self._time_ns,
+                bet=self._bet,
+                lottery_result=self._lottery_result,
+                press_order=tuple(self._press_order),
+                press=tuple(self._press_positions),
+                stop=stops,
+                payout=self._payout,
+                credit=self._credit,
+                replay=self._replay,
+                internal_state=self.internalState.id,
+                at_state=self.ATState.id,
+                navi_state=self.NaviState.id,
+                rt_state=self.RTState.id,
+            )
+
+        if not self._replay:
+            # BETを消化する
+            self._bet = 0
+
     # 状態更新
+    @tracer.traced("Slot.update")
     def update(self, dt: float):
         """スロット状態を更新する
 
@@ -242,6 +536,8 @@ class Slot:
             前回からの経過時間
         """
 
+        self._time_ns += round(dt * 1_000_000_000)
+
         self._bet_process(dt)
 
         # リール状態更新
@@ -249,10 +545,18 @@ class Slot:
         self._reel[1].update(dt)
         self._reel[2].update(dt)
 
+        # 全リール停止で遊技終了
+        if self._is_gaming() and not self._is_reel_spinning():
+            self._game_end()
+
     @property
     def reel(self) -> list[Reel]:
         return self._reel
 
+    @property
+    def payout_table(self) -> PayoutTable:
+        return self._payout_table
+
     @property
     def credit(self) -> int:
         return self._credit
@@ -261,6 +565,18 @@ class Slot:
     def payout(self) -> int:
         return self._payout
 
+    @property
+    def lottery_result(self) -> int:
+        return self._lottery_result
+
+    @property
+    def lottery_role(self) -> Role | None:
+        return self._lottery.get_role(self._lottery_result)
+
+    @property
+    def roles(self) -> list[Role]:
+        return self._roles
+
     @property
     def bet(self) -> int:
         return self._bet
@@ -277,6 +593,26 @@ class Slot:
     def wait(self) -> bool:
         return self._wait
 
+    @property
+    def gaming(self) -> bool:
+        return self._gaming
+
+    @property
+    def beting(self) -> bool:
+        return self._beting
+
+    @property
+    def spec_hash(self) -> str:
+        return self._spec_hash
+
+    @property
+    def time_ns(self) -> int:
+        return self._time_ns
+
+    @property
+    def game_count(self) -> int:
+        return self._game_count
+
 
 class BetManager:
     """
@@ -1,5 +1,6 @@
 import GameData
 from PayLine import PayLine
+from Role import PressOrder, Role, Slip, SymbolCombo
 from State import State
 from Symbol import Symbol
 
@@ -14,6 +15,17 @@ SYMBOL_WATERMELON = Symbol("スイカ", "WaterMelon.png")
 SYMBOL_BELL_A = Symbol("ベル", "Bell_A.png")
 SYMBOL_REPLAY_A = Symbol("リプレイ", "Replay_A.png")
 
+# 全図柄
+SYMBOLS = [
+    SYMBOL_REDSEVEN,
+    SYMBOL_BLUESEVEN,
+    SYMBOL_BAR,
+    SYMBOL_CHERRY,
+    SYMBOL_WATERMELON,
+    SYMBOL_BELL_A,
+    SYMBOL_REPLAY_A,
+]
+
 # 左リール配列
 REEL_SYMBOLPATTERN_L = [
     SYMBOL_WATERMELON,
@@ -122,3 +134,127 @@ PAYLINE_RIGHTDOWN = PayLine(
         GameData.REEL_POSITION_BOTTOM,
     )
 )
+
+# 全有効ライン
+PAYLINES = [
+    PAYLINE_UPPER,
+    PAYLINE_MIDDLE,
+    PAYLINE_LOWER,
+    PAYLINE_RIGHTUP,
+    PAYLINE_RIGHTDOWN,
+]
+
+# 押し順: 指定なし
+PRESSORDER_ANY = PressOrder(
+    pressorder=([1, 2, 3], [1, 2, 3], [1, 2, 3]),
+)
+
+# 滑り: 最大4コマ
+SLIP_MAX4 = Slip(
+    slip=([0, 1, 2, 3, 4], [0, 1, 2, 3, 4], [0, 1, 2, 3, 4]),
+)
+
+# 役
+ROLE_REPLAY = Role(
+    name="リプレイ",
+    payout=0,
+    symbolcombo=SymbolCombo(
+        symbolcombo=([SYMBOL_REPLAY_A], [SYMBOL_REPLAY_A], [SYMBOL_REPLAY_A])
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+ROLE_BELL = Role(
+    name="ベル",
+    payout=8,
+    symbolcombo=SymbolCombo(
+        symbolcombo=([SYMBOL_BELL_A], [SYMBOL_BELL_A], [SYMBOL_BELL_A])
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+ROLE_WATERMELON = Role(
+    name="スイカ",
+    payout=5,
+    symbolcombo=SymbolCombo(
+        symbolcombo=(
+            [SYMBOL_WATERMELON],
+            [SYMBOL_WATERMELON],
+            [SYMBOL_WATERMELON],
+        )
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+ROLE_CHERRY = Role(
+    name="チェリー",
+    payout=2,
+    symbolcombo=SymbolCombo(
+        symbolcombo=([SYMBOL_CHERRY], list(SYMBOLS), list(SYMBOLS))
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+ROLE_BAR = Role(
+    name="ＢＡＲ揃い",
+    payout=10,
+    symbolcombo=SymbolCombo(
+        symbolcombo=([SYMBOL_BAR], [SYMBOL_BAR], [SYMBOL_BAR])
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+ROLE_REDSEVEN = Role(
+    name="赤７揃い",
+    payout=15,
+    symbolcombo=SymbolCombo(
+        symbolcombo=([SYMBOL_REDSEVEN], [SYMBOL_REDSEVEN], [SYMBOL_REDSEVEN])
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+ROLE_BLUESEVEN = Role(
+    name="青７揃い",
+    payout=15,
+    symbolcombo=SymbolCombo(
+        symbolcombo=(
+            [SYMBOL_BLUESEVEN],
+            [SYMBOL_BLUESEVEN],
+            [SYMBOL_BLUESEVEN],
+        )
+    ),
+    payline=PAYLINES,
+    slip=SLIP_MAX4,
+    pressorder=PRESSORDER_ANY,
+)
+
+# 全役
+ROLES = [
+    ROLE_REPLAY,
+    ROLE_BELL,
+    ROLE_WATERMELON,
+    ROLE_CHERRY,
+    ROLE_BAR,
+    ROLE_REDSEVEN,
+    ROLE_BLUESEVEN,
+]
+
+# 再遊技役
+REPLAY_ROLES = [ROLE_REPLAY]
+
+# 内部抽選テーブル (役, 置数) ※置数の合計はGameData.LOTTERY_RANGE以下
+LOTTERY_TABLE = [
+    (ROLE_REPLAY, 8978),
+    (ROLE_BELL, 8192),
+    (ROLE_WATERMELON, 512),
+    (ROLE_CHERRY, 1092),
+    (ROLE_BAR, 200),
+    (ROLE_REDSEVEN, 100),
+    (ROLE_BLUESEVEN, 100),
+]
@@ -0,0 +1,313 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import config
+import GameData
+import Logger
+import numpy as np
+from PayLine import PayLine
+from Role import Role
+from Symbol import Symbol
+
+log = Logger.get_logger(__name__)
+
+# キャッシュ形式のバージョン (テーブルの生成方法を変更した場合は更新する)
+FORMAT_VERSION: int = 1
+
+# キャッシュの内容を記録するファイル名
+MANIFEST_FILENAME: str = "manifest.json"
+
+# テーブル名ごとの配列の形状とデータ型
+TableLayouts = dict[str, dict[str, tuple[tuple[int, ...], np.dtype]]]
+
+
+class TableCache:
+    """コンパイル済みテーブルのキャッシュ
+
+    仕様 (リール配列, 役, 入賞ライン, 抽選テーブル) のハッシュ値ごとに
+    ディレクトリを作成し、テーブルの配列を1つずつ .npy 形式で保存する
+
+    読込時は配列をメモリマップで開くため、複数のプロセスで同じテーブルを
+    コピーせずに共有できる
+
+    Attributes
+    ----------
+    cache_dir : str
+        キャッシュの保存先ディレクトリ
+    """
+
+    def __init__(self, cache_dir: str = config.CACHE_DIR) -> None:
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            キャッシュの保存先ディレクトリ
+        """
+        self._cache_dir: str = cache_dir
+
+    @staticmethod
+    def get_spec_hash(
+        reel_symbols: list[list[Symbol]],
+        roles: list[Role],
+        paylines: list[PayLine],
+        lottery_table: list[tuple[Role, int]],
+    ) -> str:
+        """仕様のハッシュ値を返す
+
+        Parameters
+        ----------
+        reel_symbols : list[list[Symbol]]
+            リール配列 [左リール, 中リール, 右リール]
+        roles : list[Role]
+            役
+        paylines : list[PayLine]
+            入賞ライン
+        lottery_table : list[tuple[Role, int]]
+            抽選テーブル (役, 置数)
+
+        Returns
+        -------
+        spec_hash : str
+            仕様のハッシュ値 (SHA-256の16進数表記)
+        """
+        spec = {
+            "format_version": FORMAT_VERSION,
+            "reel_symbol_length": GameData.REEL_SYMBOL_LENGTH,
+            "payout_max": GameData.PAYOUT_MAX,
+            "lottery_range": GameData.LOTTERY_RANGE,
+            "reels": [
+                [[symbol.id, symbol.name] for symbol in symbols]
+                for symbols in reel_symbols
+            ],
+            "paylines": [list(payline.line) for payline in paylines],
+            "roles": [
+                {
+                    "name": role.name,
+                    "payout": role.payout,
+                    "symbolcombo": [
+                        [symbol.id for symbol in symbols]
+                        for symbols in role.symbolcombo.symbolcombo
+                    ],
+                    "payline": [
+                        paylines.index(payline) for payline in role.payline
+                    ],
+                    "slip": role.slip.validslip,
+                    "pressorder": role.pressorder.pressorder,
+                }
+                for role in roles
+            ],
+            "lottery": [
+                [roles.index(role), value] for role, value in lottery_table
+            ],
+        }
+        text = json.dumps(spec, ensure_ascii=False, sort_keys=True)
+
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_path(self, spec_hash: str) -> str:
+        """仕様のハッシュ値に対応するキャッシュのディレクトリを返す
+
+        Parameters
+        ----------
+        spec_hash : str
+            仕様のハッシュ値
+
+        Returns
+        -------
+        path : str
+            キャッシュのディレクトリ
+        """
+        return os.path.join(self._cache_dir, spec_hash)
+
+    def _read(
+        self, spec_hash: str, layouts: TableLayouts | None = None
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """キャッシュからテーブルをメモリマップで開く
+
+        Parameters
+        ----------
+        spec_hash : str
+            仕様のハッシュ値
+        layouts : TableLayouts | None
+            配列ごとに期待する形状とデータ型 (Noneの場合は検証しない)
+
+        Returns
+        -------
+        tables : dict[str, dict[str, np.ndarray]]
+            テーブル名ごとの配列 (メモリマップ)
+
+        Raises
+        ------
+        ValueError
+            マニフェストの形式や仕様のハッシュ値が異なる場合,
+            配列ファイルが壊れている場合, 配列の形状やデータ型が異なる場合
+        """
+        path = self.get_path(spec_hash)
+        with open(
+            os.path.join(path, MANIFEST_FILENAME), encoding="utf-8"
+        ) as f:
+            manifest = json.load(f)
+        if manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError("キャッシュ形式のバージョンが異なります")
+        if manifest["spec_hash"] != spec_hash:
+            raise ValueError("仕様のハッシュ値が異なります")
+
+        tables: dict[str, dict[str, np.ndarray]] = {}
+        for table_name, array_names in manifest["tables"].items():
+            tables[table_name] = {
+                array_name: np.load(
+                    os.path.join(path, f"{table_name}.{array_name}.npy"),
+                    mmap_mode="r",
+                    allow_pickle=False,
+                )
+                for array_name in array_names
+            }
+
+        for table_name, array_layouts in (layouts or {}).items():
+            for array_name, (shape, dtype) in array_layouts.items():
+                array = tables.get(table_name, {}).get(array_name)
+                if array is None:
+                    raise ValueError(
+                        f"配列がありません: {table_name}.{array_name}"
+                    )
+                if array.shape != tuple(shape) or array.dtype != dtype:
+                    raise ValueError(
+                        f"配列の形状またはデータ型が異なります: "
+                        f"{table_name}.{array_name} "
+                        f"{array.shape} {array.dtype}"
+                    )
+
+        return tables
+
+    def _is_valid(
+        self, spec_hash: str, layouts: TableLayouts | None = None
+    ) -> bool:
+        """キャッシュのディレクトリが読み込める状態であるかを返す
+
+        Parameters
+        ----------
+        spec_hash : str
+            仕様のハッシュ値
+        layouts : TableLayouts | None
+            配列ごとに期待する形状とデータ型 (Noneの場合は検証しない)
+
+        Returns
+        -------
+        valid : bool
+            マニフェストが現在の形式で、記載された配列ファイルが
+            すべて開ける場合はTrue
+        """
+        try:
+            self._read(spec_hash, layouts)
+        except (OSError, ValueError, KeyError):
+            return False
+
+        return True
+
+    def load(
+        self, spec_hash: str, layouts: TableLayouts | None = None
+    ) -> dict[str, dict[str, np.ndarray]] | None:
+        """キャッシュからテーブルを読み込む
+
+        Parameters
+        ----------
+        spec_hash : str
+            仕様のハッシュ値
+        layouts : TableLayouts | None
+            配列ごとに期待する形状とデータ型 (Noneの場合は検証しない)
+            (異なる場合は壊れたキャッシュとして扱う)
+
+        Returns
+        -------
+        tables : dict[str, dict[str, np.ndarray]] | None
+            テーブル名ごとの配列 (メモリマップ)
+            (キャッシュがない場合や形式が異なる場合, 壊れている場合はNone)
+        """
+        path = self.get_path(spec_hash)
+        if not os.path.isfile(os.path.join(path, MANIFEST_FILENAME)):
+            return None
+
+        try:
+            tables = self._read(spec_hash, layouts)
+        except (OSError, ValueError, KeyError) as e:
+            # 壊れたキャッシュは次回の保存時に置き換える
+            log.warning("table cache load failed: %s (%s)", path, e)
+            return None
+
+        return tables
+
+    def save(
+        self, spec_hash: str, tables: dict[str, dict[str, np.ndarray]]
+    ) -> None:
+        """テーブルをキャッシュに保存する
+
+        一時ディレクトリに書き出してから名前を変更するため、
+        複数のプロセスが同時に保存しても読込側が書込途中の
+        キャッシュを参照することはない
+        既存のキャッシュが壊れている場合や形式が異なる場合は置き換える
+
+        Parameters
+        ----------
+        spec_hash : str
+            仕様のハッシュ値
+        tables : dict[str, dict[str, np.ndarray]]
+            テーブル名ごとの配列
+        """
+        path = self.get_path(spec_hash)
+        layouts = {
+            table_name: {
+                array_name: (array.shape, array.dtype)
+                for array_name, array in arrays.items()
+            }
+            for table_name, arrays in tables.items()
+        }
+        if self._is_valid(spec_hash, layouts):
+            return
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        temp_path = tempfile.mkdtemp(dir=self._cache_dir, prefix=".tmp_")
+        try:
+            for table_name, arrays in tables.items():
+                for array_name, array in arrays.items():
+                    np.save(
+                        os.path.join(
+                            temp_path, f"{table_name}.{array_name}.npy"
+                        ),
+                        np.ascontiguousarray(array),
+                        allow_pickle=False,
+                    )
+            manifest = {
+                "format_version": FORMAT_VERSION,
+                "spec_hash": spec_hash,
+                "tables": {
+                    table_name: list(arrays)
+                    for table_name, arrays in tables.items()
+                },
+            }
+            with open(
+                os.path.join(temp_path, MANIFEST_FILENAME),
+                "w",
+                encoding="utf-8",
+            ) as f:
+                json.dump(manifest, f, indent=2)
+            if os.path.isdir(path):
+                # 壊れたキャッシュは退避してから置き換え、退避先を削除する
+                stale_path = tempfile.mkdtemp(
+                    dir=self._cache_dir, prefix=".stale_"
+                )
+                os.rename(path, os.path.join(stale_path, spec_hash))
+                shutil.rmtree(stale_path, ignore_errors=True)
+                log.warning("table cache replaced: %s", path)
+            os.rename(temp_path, path)
+        except OSError as e:
+            # 他のプロセスが先に保存した場合もここに来る
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if not self._is_valid(spec_hash, layouts):
+                log.warning("table cache save failed: %s (%s)", path, e)
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
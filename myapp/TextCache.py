@@ -0,0 +1,138 @@
+from collections import OrderedDict
+
+import pygame
+import Tracer
+import Utility
+
+# 文字列描画キャッシュの既定の上限数
+TEXT_CACHE_MAXSIZE: int = 256
+
+tracer = Tracer.get_tracer()
+
+
+class TextCache:
+    """文字列描画キャッシュ
+
+    font.renderで描画した文字列のSurfaceを (フォント, 文字列, アンチエイリアス,
+    色) ごとに保持し、同じ文字列を毎フレーム描画し直さないようにする
+
+    通常の文字列は上限数を超えると最も長く使われていないものから破棄する
+    (LRU)。固定の表示文字列はpreloadで事前に描画し、破棄の対象外とする
+
+    Attributes
+    ----------
+    maxsize : int
+        保持する文字列の上限数 (preloadしたものは含まない)
+    hits : int
+        キャッシュから返した回数
+    misses : int
+        新たに描画した回数
+    """
+
+    def __init__(self, maxsize: int = TEXT_CACHE_MAXSIZE) -> None:
+        """
+        Parameters
+        ----------
+        maxsize : int
+            保持する文字列の上限数
+        """
+        if maxsize <= 0:
+            raise ValueError("上限数には1以上を指定してください")
+        self._maxsize: int = maxsize
+        self._cache: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._pinned: dict[tuple, pygame.Surface] = {}
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        antialias: bool,
+        color: tuple[int, int, int],
+    ) -> pygame.Surface:
+        """文字列を描画したSurfaceを返す
+
+        Parameters
+        ----------
+        font : pygame.font.Font
+            描画に使用するフォントオブジェクト
+        text : str
+            文字列
+        antialias : bool
+            アンチエイリアスの有無
+        color : tuple[int, int, int]
+            文字色
+
+        Returns
+        -------
+        surface : pygame.Surface
+            文字列を描画したSurface (共有されるため変更しないこと)
+        """
+        key = (font, text, antialias, color)
+
+        surface = self._pinned.get(key)
+        if surface is not None:
+            self._hits += 1
+            return surface
+
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return surface
+
+        self._misses += 1
+        with tracer.span("font.render"):
+            surface = Utility.convert_to_display_format(
+                font.render(text, antialias, color)
+            )
+        self._cache[key] = surface
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+        return surface
+
+    def preload(
+        self,
+        font: pygame.font.Font,
+        texts: list[str],
+        antialias: bool,
+        color: tuple[int, int, int],
+    ) -> None:
+        """固定の表示文字列を事前に描画して保持する
+
+        Parameters
+        ----------
+        font : pygame.font.Font
+            描画に使用するフォントオブジェクト
+        texts : list[str]
+            文字列
+        antialias : bool
+            アンチエイリアスの有無
+        color : tuple[int, int, int]
+            文字色
+        """
+        for text in texts:
+            key = (font, text, antialias, color)
+            if key not in self._pinned:
+                self._pinned[key] = Utility.convert_to_display_format(
+                    font.render(text, antialias, color)
+                )
+
+    def clear(self) -> None:
+        """保持している文字列をすべて破棄する"""
+        self._cache.clear()
+        self._pinned.clear()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
@@ -0,0 +1,286 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+
+import config
+import numpy as np
+
+# 保持する区間数の既定値
+TRACE_BUFFER_SIZE: int = 65536
+
+
+class _Span:
+    """計測区間 (with文で使用する)"""
+
+    __slots__ = ("_tracer", "_name_id", "_start")
+
+    def __init__(self, tracer: "Tracer", name_id: int) -> None:
+        self._tracer = tracer
+        self._name_id = name_id
+        self._start = 0
+
+    def __enter__(self) -> None:
+        self._start = self._tracer._clock()
+
+    def __exit__(self, *exc_info) -> None:
+        self._tracer._record(self._name_id, self._start)
+
+
+class _TracedMethod:
+    """記録対象のメソッド (クラス定義時にトレーサーに登録する)"""
+
+    def __init__(
+        self, tracer: "Tracer", func: Callable, wrapper: Callable
+    ) -> None:
+        self._tracer = tracer
+        self._func = func
+        self._wrapper = wrapper
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._tracer._register(owner, name, self._func, self._wrapper)
+
+
+# 無効時に返す何もしない計測区間
+_NULL_SPAN = nullcontext()
+
+
+class Tracer:
+    """処理区間の開始時刻と所要時間を記録するトレーサー
+
+    記録した区間はリングバッファに保持し (古いものから上書きする)、
+    Chrome trace event形式のJSONとして保存できる
+    (chrome://tracing や Perfetto で表示できる)
+
+    with文の区間は無効時に有効状態の判定のみを行う
+    デコレータで指定したメソッドは有効時のみ記録付きのメソッドに
+    置き換えるため、無効時は元のメソッドの呼び出しと変わらない
+
+    Attributes
+    ----------
+    enabled : bool
+        記録の有無
+    capacity : int
+        保持する区間数
+    count : int
+        保持している区間数
+    """
+
+    def __init__(
+        self,
+        capacity: int = TRACE_BUFFER_SIZE,
+        enabled: bool = False,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        capacity : int
+            保持する区間数
+        enabled : bool
+            記録の有無
+        clock : Callable[[], int]
+            現在時刻 [nsec] を返す関数
+        """
+        if capacity <= 0:
+            raise ValueError("保持する区間数には1以上を指定してください")
+
+        self._capacity: int = capacity
+        self._enabled: bool = enabled
+        self._clock: Callable[[], int] = clock
+
+        # 記録対象のメソッド (クラス, メソッド名, 元の関数, 記録付きの関数)
+        self._traced_methods: list[tuple[type, str, Callable, Callable]] = []
+
+        # 区間名とIDの対応
+        self._names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+
+        # 区間ごとの区間名ID・開始時刻[nsec]・所要時間[nsec]
+        self._name_id_buffer: np.ndarray = np.zeros(capacity, dtype=np.int32)
+        self._start_buffer: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._duration_buffer: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._total: int = 0
+
+    def _get_name_id(self, name: str) -> int:
+        """区間名のIDを返す
+
+        Parameters
+        ----------
+        name : str
+            区間名
+
+        Returns
+        -------
+        name_id : int
+            区間名のID (未登録の場合は登録する)
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+
+        return name_id
+
+    def _record(self, name_id: int, start: int) -> None:
+        """区間を記録する
+
+        Parameters
+        ----------
+        name_id : int
+            区間名のID
+        start : int
+            開始時刻[nsec]
+        """
+        end = self._clock()
+        index = self._total % self._capacity
+        self._name_id_buffer[index] = name_id
+        self._start_buffer[index] = start
+        self._duration_buffer[index] = end - start
+        self._total += 1
+
+    def span(self, name: str):
+        """with文で囲んだ処理を1つの区間として記録する
+
+        Parameters
+        ----------
+        name : str
+            区間名
+
+        Returns
+        -------
+        span : contextmanager
+            計測区間 (無効時は何もしない)
+        """
+        if not self._enabled:
+            return _NULL_SPAN
+
+        return _Span(self, self._get_name_id(name))
+
+    def traced(self, name: str) -> Callable[[Callable], _TracedMethod]:
+        """メソッドの呼び出しを1つの区間として記録するデコレータ
+
+        Parameters
+        ----------
+        name : str
+            区間名
+
+        Returns
+        -------
+        decorator : Callable[[Callable], _TracedMethod]
+            デコレータ (クラス内のメソッド定義にのみ使用できる)
+        """
+        name_id = self._get_name_id(name)
+
+        def decorator(func: Callable) -> _TracedMethod:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = self._clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._record(name_id, start)
+
+            return _TracedMethod(self, func, wrapper)
+
+        return decorator
+
+    def _register(
+        self, owner: type, name: str, func: Callable, wrapper: Callable
+    ) -> None:
+        """記録対象のメソッドを登録する
+
+        Parameters
+        ----------
+        owner : type
+            メソッドを定義したクラス
+        name : str
+            メソッド名
+        func : Callable
+            元の関数
+        wrapper : Callable
+            記録付きの関数
+        """
+        self._traced_methods.append((owner, name, func, wrapper))
+        setattr(owner, name, wrapper if self._enabled else func)
+
+    def clear(self) -> None:
+        """記録した区間をすべて破棄する"""
+        self._total = 0
+
+    def get_trace_events(self) -> list[dict]:
+        """記録した区間をChrome trace event形式で古い順に返す
+
+        Returns
+        -------
+        trace_events : list[dict]
+            trace event (完了イベント, 時刻の単位はマイクロ秒)
+        """
+        count = self.count
+        order = np.arange(self._total - count, self._total) % self._capacity
+        pid = os.getpid()
+        tid = threading.main_thread().native_id
+
+        return [
+            {
+                "name": self._names[name_id],
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name_id, start, duration in zip(
+                self._name_id_buffer[order].tolist(),
+                self._start_buffer[order].tolist(),
+                self._duration_buffer[order].tolist(),
+            )
+        ]
+
+    def save(self, path: str) -> None:
+        """記録した区間をChrome trace event形式のJSONファイルに保存する
+
+        Parameters
+        ----------
+        path : str
+            保存先のファイルパス
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": self.get_trace_events(),
+                    "displayTimeUnit": "ms",
+                },
+                f,
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+        for owner, name, func, wrapper in self._traced_methods:
+            setattr(owner, name, wrapper if enabled else func)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        return min(self._total, self._capacity)
+
+
+# アプリケーション全体で共有するトレーサー
+_tracer = Tracer(enabled=config.TRACE_ENABLED)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
@@ -1,4 +1,4 @@
-import cv2
+import numpy as np
 import pygame
 from cv2.typing import MatLike
 
@@ -7,6 +7,9 @@ def cv2_to_pygame_surface(cv2_image: MatLike) -> pygame.Surface:
     """
     OpenCV (BGR) 画像を Pygame Surface に変換する
 
+    画素をコピーせずにNumPy配列のメモリをBGRのまま参照するSurfaceを返す
+    (メモリ配置が連続していない場合のみ1回コピーする)
+
     Parameters
     ----------
     cv2_image : MatLike
@@ -16,13 +19,116 @@ def cv2_to_pygame_surface(cv2_image: MatLike) -> pygame.Surface:
     -------
     surface: pygame.Surface
         Pygameで描画可能なPygame.Surfaceオブジェクト
+        (元の画像とメモリを共有する)
+    """
+    image = _get_bgr_image(cv2_image)
+
+    return pygame.image.frombuffer(image, image.shape[1::-1], "BGR")
+
+
+def cv2_to_pygame_surfaces(cv2_images: list[MatLike]) -> list[pygame.Surface]:
+    """
+    複数の OpenCV (BGR) 画像をまとめて Pygame Surface に変換する
+
+    幅が同じ画像は1つのバッファに縦に連結して1回で変換し、
+    各画像はその部分領域 (subsurface) として返す
+
+    Parameters
+    ----------
+    cv2_images : list[MatLike]
+        OpenCVで扱うBGR形式の画像
+
+    Returns
+    -------
+    surfaces: list[pygame.Surface]
+        Pygameで描画可能なPygame.Surfaceオブジェクト
+    """
+    images = [_get_bgr_image(cv2_image) for cv2_image in cv2_images]
+    if not images:
+        return []
+    if len({image.shape[1] for image in images}) != 1:
+        return [cv2_to_pygame_surface(image) for image in images]
+
+    surface = cv2_to_pygame_surface(np.concatenate(images))
+    surfaces: list[pygame.Surface] = []
+    top = 0
+    for image in images:
+        height, width = image.shape[:2]
+        surfaces.append(surface.subsurface((0, top, width, height)))
+        top += height
+
+    return surfaces
+
+
+def _get_bgr_image(cv2_image: MatLike) -> np.ndarray:
+    """
+    画像をメモリ配置が連続したBGR形式の配列として返す
+
+    Parameters
+    ----------
+    cv2_image : MatLike
+        OpenCVで扱うBGR形式の画像
+
+    Returns
+    -------
+    image: np.ndarray
+        メモリ配置が連続したBGR形式の配列 (高さ, 幅, 3)
     """
-    # BGR → RGB に変換
-    rgb_image = cv2.cvtColor(cv2_image, cv2.COLOR_BGR2RGB)
+    image = np.ascontiguousarray(cv2_image, dtype=np.uint8)
+    if image.ndim != 3 or image.shape[2] != 3:
+        raise ValueError("BGR形式の画像ではありません")
+
+    return image
+
+
+def convert_to_display_format(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Surfaceを表示用のピクセル形式に変換する
+
+    描画のたびにピクセル形式の変換が行われないよう、画像の読込時に
+    1回だけ変換しておくために使用する
+    (ピクセル単位の透過を持つSurfaceは透過情報を保持して変換する)
 
-    # numpy配列 → Pygame Surface に変換
-    surface = pygame.image.frombuffer(
-        rgb_image.tobytes(), rgb_image.shape[1::-1], "RGB"
-    )
+    Parameters
+    ----------
+    surface : pygame.Surface
+        変換対象のSurface
+
+    Returns
+    -------
+    surface: pygame.Surface
+        表示用のピクセル形式に変換したSurface
+        (表示モード設定前の場合は変換せずにそのまま返す)
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+
+    return surface.convert()
+
+
+def get_wraparound_padded_image(image: MatLike, padding: int) -> MatLike:
+    """
+    画像の先頭の行を末尾に折り返して追加した画像を返す
+
+    リール画像の任意の位置から表示窓の高さ分を連続した領域として
+    切り出せるようにするために使用する
+
+    Parameters
+    ----------
+    image : MatLike
+        元画像
+    padding : int
+        末尾に追加する行数
+
+    Returns
+    -------
+    padded_image: MatLike
+        末尾に折り返しの余白を追加した画像
+    """
+    if not 0 <= padding <= image.shape[0]:
+        raise ValueError("余白の行数が不正です")
 
-    return surface
+    return np.concatenate([image, image[:padding]])
@@ -0,0 +1,337 @@
+import GameData
+import numpy as np
+from PayLine import PayLine
+from Role import Role
+
+# ビットマスクで扱える図柄IDの上限
+SYMBOL_ID_LIMIT: int = 64
+
+# ビット集合で扱える役数の上限
+ROLE_LIMIT: int = 64
+
+# 図柄ID → 図柄ビット
+_SYMBOL_BITS: np.ndarray = np.left_shift(
+    np.uint64(1), np.arange(SYMBOL_ID_LIMIT, dtype=np.uint64)
+)
+
+
+class WinEvaluator:
+    """入賞判定器
+
+    役の図柄組合せをリールごとの図柄ビットマスクに、入賞ラインを
+    リール位置のインデックス行列にコンパイルし、停止図柄に対して
+    全役・全入賞ラインの判定を一括で行う
+
+    Attributes
+    ----------
+    roles : list[Role]
+        判定対象の役
+    paylines : list[PayLine]
+        判定対象の入賞ライン
+    role_masks : np.ndarray
+        役ごと・リールごとの図柄ビットマスク (役数, リール数)
+    payline_matrix : np.ndarray
+        入賞ラインごと・リールごとのリール位置 (ライン数, リール数)
+    role_paylines : np.ndarray
+        役ごとの有効な入賞ライン (役数, ライン数)
+    role_payouts : np.ndarray
+        役ごとの払出クレジット数 (役数,)
+    combo_roles : np.ndarray
+        図柄IDの組合せごとに一致する役のビット集合
+        (図柄ID数 + 1,) * リール数
+    payline_role_masks : np.ndarray
+        入賞ラインごとに有効な役のビット集合 (ライン数,)
+    """
+
+    def __init__(self, roles: list[Role], paylines: list[PayLine]) -> None:
+        """
+        Parameters
+        ----------
+        roles : list[Role]
+            判定対象の役
+        paylines : list[PayLine]
+            判定対象の入賞ライン
+        """
+        if not roles:
+            raise ValueError("判定対象の役がありません")
+        if not paylines:
+            raise ValueError("判定対象の入賞ラインがありません")
+        if len(roles) > ROLE_LIMIT:
+            raise ValueError("役の数がビット集合で扱える範囲を超えています")
+        self._roles: list[Role] = roles
+        self._paylines: list[PayLine] = paylines
+
+        self._role_masks: np.ndarray = self._compile_role_masks(roles)
+        self._payline_matrix: np.ndarray = np.array(
+            [payline.line for payline in paylines], dtype=np.intp
+        )
+        self._role_paylines: np.ndarray = np.array(
+            [
+                [payline in role.payline for payline in paylines]
+                for role in roles
+            ],
+            dtype=bool,
+        )
+        self._role_payouts: np.ndarray = np.array(
+            [role.payout for role in roles], dtype=np.int64
+        )
+        self._role_bits: np.ndarray = np.left_shift(
+            np.uint64(1), np.arange(len(roles), dtype=np.uint64)
+        )
+        self._combo_roles: np.ndarray = self._compile_combo_roles(
+            self._role_masks
+        )
+        # 役判定対象外の図柄IDは番兵 (どの役にも一致しない) に寄せる
+        self._symbol_sentinel: int = self._combo_roles.shape[0] - 1
+        # 入賞ラインごとに有効な役のビット集合
+        self._payline_role_masks: np.ndarray = np.bitwise_or.reduce(
+            np.where(
+                self._role_paylines,
+                self._role_bits[:, np.newaxis],
+                np.uint64(0),
+            ),
+            axis=0,
+        )
+
+        # 1遊技ごとの判定用 (NumPyのスカラー演算を避けるためlistで保持)
+        self._combo_roles_list: list = self._combo_roles.tolist()
+        self._role_payouts_list: list[int] = self._role_payouts.tolist()
+        self._payline_items: list[tuple[tuple[int, ...], int]] = list(
+            zip(
+                map(tuple, self._payline_matrix.tolist()),
+                self._payline_role_masks.tolist(),
+            )
+        )
+
+    def _compile_role_masks(self, roles: list[Role]) -> np.ndarray:
+        """役の図柄組合せを図柄ビットマスクに変換する
+
+        Parameters
+        ----------
+        roles : list[Role]
+            変換対象の役
+
+        Returns
+        -------
+        role_masks : np.ndarray
+            役ごと・リールごとの図柄ビットマスク (役数, リール数)
+        """
+        role_masks = np.zeros(
+            (len(roles), len(roles[0].symbolcombo.symbolcombo)),
+            dtype=np.uint64,
+        )
+        for i, role in enumerate(roles):
+            for j, symbols in enumerate(role.symbolcombo.symbolcombo):
+                for symbol in symbols:
+                    if not 0 <= symbol.id < SYMBOL_ID_LIMIT:
+                        raise ValueError(
+                            "図柄IDがビットマスクで扱える範囲を超えています"
+                        )
+                    role_masks[i, j] |= _SYMBOL_BITS[symbol.id]
+
+        return role_masks
+
+    def _compile_combo_roles(self, role_masks: np.ndarray) -> np.ndarray:
+        """図柄IDの組合せごとに一致する役のビット集合を算出する
+
+        Parameters
+        ----------
+        role_masks : np.ndarray
+            役ごと・リールごとの図柄ビットマスク (役数, リール数)
+
+        Returns
+        -------
+        combo_roles : np.ndarray
+            図柄IDの組合せごとに一致する役のビット集合
+        """
+        # 役判定対象の図柄ID数 (+1は番兵)
+        symbol_count = int(np.bitwise_or.reduce(role_masks, axis=None))
+        symbol_count = symbol_count.bit_length() + 1
+        symbol_bits = np.append(_SYMBOL_BITS[: symbol_count - 1], np.uint64(0))
+
+        reel_count = role_masks.shape[1]
+        combo_roles = np.zeros(
+            (symbol_count,) * reel_count + (len(self._roles),), dtype=bool
+        )
+        combo_roles[...] = True
+        for j in range(reel_count):
+            # リールjの図柄ごとに一致する役 (図柄ID数, 役数)
+            reel_match = (symbol_bits[:, np.newaxis] & role_masks[:, j]) != 0
+            shape = [1] * reel_count + [len(self._roles)]
+            shape[j] = symbol_count
+            combo_roles &= reel_match.reshape(shape)
+
+        return np.bitwise_or.reduce(
+            np.where(combo_roles, self._role_bits, np.uint64(0)), axis=-1
+        )
+
+    def evaluate_batch(self, windows: np.ndarray) -> np.ndarray:
+        """複数の停止図柄に対して入賞判定を行う
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            停止図柄の図柄ID (停止図柄数, リール数, リール位置数)
+
+        Returns
+        -------
+        line_roles : np.ndarray
+            入賞ラインごとに入賞した役のビット集合 (停止図柄数, ライン数)
+            (ビットiはrolesのi番目の役)
+        """
+        windows = np.minimum(
+            np.asarray(windows, dtype=np.intp), self._symbol_sentinel
+        )
+
+        line_roles = self._combo_roles[
+            tuple(
+                windows[:, j, self._payline_matrix[:, j]]
+                for j in range(self._payline_matrix.shape[1])
+            )
+        ]
+
+        return line_roles & self._payline_role_masks
+
+    def evaluate(self, window: list[list[int]]) -> list[int]:
+        """停止図柄に対して入賞判定を行う
+
+        1遊技ごとの判定で使用するため、NumPyを介さずにコンパイル済みの
+        テーブルを直接参照する
+
+        Parameters
+        ----------
+        window : list[list[int]]
+            停止図柄の図柄ID [左リール, 中リール, 右リール]
+            (各リール [上段, 中段, 下段])
+
+        Returns
+        -------
+        line_roles : list[int]
+            入賞ラインごとに入賞した役のビット集合
+        """
+        combo_roles = self._combo_roles_list
+        sentinel = self._symbol_sentinel
+        left, center, right = window
+
+        return [
+            combo_roles[min(left[pos_l], sentinel)][
+                min(center[pos_c], sentinel)
+            ][min(right[pos_r], sentinel)]
+            & role_mask
+            for (pos_l, pos_c, pos_r), role_mask in self._payline_items
+        ]
+
+    def get_payout(self, line_roles: list[int]) -> int:
+        """入賞判定結果から払出クレジット数を返す
+
+        Parameters
+        ----------
+        line_roles : list[int]
+            evaluateの入賞判定結果
+
+        Returns
+        -------
+        payout : int
+            払出クレジット数 (上限はGameData.PAYOUT_MAX)
+        """
+        payout = 0
+        for role_bits in line_roles:
+            while role_bits:
+                lowest_bit = role_bits & -role_bits
+                payout += self._role_payouts_list[lowest_bit.bit_length() - 1]
+                role_bits ^= lowest_bit
+
+        return min(payout, GameData.PAYOUT_MAX)
+
+    def get_payout_batch(self, line_roles: np.ndarray) -> np.ndarray:
+        """入賞判定結果から払出クレジット数を返す
+
+        Parameters
+        ----------
+        line_roles : np.ndarray
+            evaluate_batchの入賞判定結果 (停止図柄数, ライン数)
+
+        Returns
+        -------
+        payout : np.ndarray
+            払出クレジット数 (上限はGameData.PAYOUT_MAX) (停止図柄数,)
+        """
+        hits = self.get_role_hits_batch(line_roles)
+        payout = (hits.sum(axis=2) * self._role_payouts).sum(axis=1)
+
+        return np.minimum(payout, GameData.PAYOUT_MAX)
+
+    def get_role_hits_batch(self, line_roles: np.ndarray) -> np.ndarray:
+        """入賞判定結果を役ごと・入賞ラインごとの入賞有無に展開する
+
+        Parameters
+        ----------
+        line_roles : np.ndarray
+            evaluate_batchの入賞判定結果 (停止図柄数, ライン数)
+
+        Returns
+        -------
+        hits : np.ndarray
+            役ごと・入賞ラインごとの入賞有無 (停止図柄数, 役数, ライン数)
+        """
+        return (
+            line_roles[:, np.newaxis, :]
+            & self._role_bits[np.newaxis, :, np.newaxis]
+        ) != 0
+
+    def get_win_roles(self, line_roles: list[int]) -> list[Role]:
+        """入賞判定結果から入賞した役を返す
+
+        Parameters
+        ----------
+        line_roles : list[int]
+            evaluateの入賞判定結果
+
+        Returns
+        -------
+        win_roles : list[Role]
+            入賞した役
+        """
+        role_bits = 0
+        for bits in line_roles:
+            role_bits |= bits
+
+        win_roles: list[Role] = []
+        while role_bits:
+            lowest_bit = role_bits & -role_bits
+            win_roles.append(self._roles[lowest_bit.bit_length() - 1])
+            role_bits ^= lowest_bit
+
+        return win_roles
+
+    @property
+    def roles(self) -> list[Role]:
+        return self._roles
+
+    @property
+    def paylines(self) -> list[PayLine]:
+        return self._paylines
+
+    @property
+    def role_masks(self) -> np.ndarray:
+        return self._role_masks
+
+    @property
+    def payline_matrix(self) -> np.ndarray:
+        return self._payline_matrix
+
+    @property
+    def role_paylines(self) -> np.ndarray:
+        return self._role_paylines
+
+    @property
+    def role_payouts(self) -> np.ndarray:
+        return self._role_payouts
+
+    @property
+    def combo_roles(self) -> np.ndarray:
+        return self._combo_roles
+
+    @property
+    def payline_role_masks(self) -> np.ndarray:
+        return self._payline_role_masks
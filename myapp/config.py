@@ -1,4 +1,29 @@
 import logging
+import os
+
+
+def _get_env_int(name: str, default: int) -> int:
+    """環境変数を整数として返す (不正な値の場合は既定値を返す)"""
+    value = os.environ.get(name, "")
+    if value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        # ログ出力の設定前のため、標準エラー出力に警告する
+        logging.getLogger(__name__).warning(
+            "invalid %s: %r (use %d)", name, value, default
+        )
+        return default
+
 
 LOG_LEVEL = logging.DEBUG
 LOG_DIR = "logs"
+CACHE_DIR = "cache"
+JOURNAL_DIR = "journal"
+RECORDING_DIR = "recordings"
+# トレースの記録の有無 (環境変数 NEWSLOT_TRACE=1 で有効化)
+TRACE_ENABLED = os.environ.get("NEWSLOT_TRACE", "0") not in ("", "0")
+# 起動時からcProfileで計測するフレーム数
+# (環境変数 NEWSLOT_PROFILE_FRAMES で指定, 0の場合は計測しない)
+PROFILE_FRAMES_ON_START = _get_env_int("NEWSLOT_PROFILE_FRAMES", 0)
@@ -0,0 +1,66 @@
+# MIT License
+# Copyright (c) 2025 818yaiba
+#
+# This file is part of NewSlot and is released under the MIT License.
+# See LICENSE file in the root directory for full license text.
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import config
+from InputRecording import InputRecording, verify
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "記録したボタン入力をpygameを使用せずに最大速度で再生し、"
+            "記録終了時のクレジット数と停止位置が一致することを確認する"
+        )
+    )
+    parser.add_argument(
+        "paths",
+        type=str,
+        nargs="*",
+        default=[config.RECORDING_DIR],
+        help="記録ファイルまたはその保存先 (省略時は既定の保存先)",
+    )
+    args = parser.parse_args()
+
+    paths: list[str] = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        elif os.path.isfile(path):
+            paths.append(path)
+    if not paths:
+        print("記録ファイルがありません")
+        sys.exit(1)
+
+    failed = 0
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            recording = InputRecording.load(path)
+            slot = verify(recording)
+        except (AssertionError, ValueError) as e:
+            failed += 1
+            print(f"NG {path}: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+        print(
+            f"OK {path}: events={len(recording.events)}"
+            f" games={slot.game_count} credit={slot.credit}"
+            f" virtual={recording.end_time_ns / 1_000_000_000:.3f} sec"
+            f" elapsed={elapsed:.3f} sec"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
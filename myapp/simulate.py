@@ -0,0 +1,75 @@
+# MIT License
+# Copyright (c) 2025 818yaiba
+#
+# This file is part of NewSlot and is released under the MIT License.
+# See LICENSE file in the root directory for full license text.
+
+import argparse
+
+import config
+import SlotData
+from MonteCarlo import MonteCarloRunner
+from Slot import Slot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="pygameを使用せずにスロットを高速に遊技させる"
+    )
+    parser.add_argument("--games", type=int, default=10000, help="遊技数")
+    parser.add_argument("--seed", type=int, default=None, help="乱数シード")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="ワーカープロセス数 (省略時はCPUコア数)",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=None,
+        help="遊技ごとの記録の保存先 (省略時は記録しない)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=config.CACHE_DIR,
+        help="コンパイル済みテーブルのキャッシュの保存先",
+    )
+    args = parser.parse_args()
+
+    runner = MonteCarloRunner(
+        workers=args.workers,
+        seed=args.seed,
+        journal_dir=args.journal,
+        cache_dir=args.cache_dir,
+    )
+    try:
+        result = runner.run(args.games)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"seed         : {runner.seed}")
+    print(f"workers      : {runner.workers}")
+    print(f"games        : {result.games}")
+    print(f"elapsed      : {result.elapsed:.3f} sec")
+    print(f"virtual time : {result.virtual_time:.3f} sec")
+    print(f"games/sec    : {result.games_per_sec:.1f}")
+    print(f"in / out     : {result.payout_in} / {result.payout_out}")
+    print(f"payout rate  : {result.payout_rate:.4f}")
+    # 全停止位置が等確率の場合の理論値
+    exact_payout_rate = Slot(
+        cache_dir=args.cache_dir
+    ).payout_table.get_payout_rate(replay_roles=SlotData.REPLAY_ROLES)
+    print(f"exact rate   : {exact_payout_rate:.4f}")
+    print("payout histogram:")
+    for payout, count in enumerate(result.payout_histogram):
+        if count:
+            print(f"  {payout:2d}: {count}")
+    print("role hits:")
+    for role, count in zip(SlotData.ROLES, result.role_hits):
+        print(f"  {role.name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
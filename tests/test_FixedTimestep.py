@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+from myapp.FixedTimestep import FixedTimestep
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_advance(self):
+        timestep = FixedTimestep(timestep=0.01, max_steps=10)
+        self.assertEqual(timestep.advance(0.025), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        # 端数は次のフレームに繰り越す
+        self.assertEqual(timestep.advance(0.005), 1)
+        self.assertAlmostEqual(timestep.alpha, 0.0)
+
+    def test_same_steps_for_any_framerate(self):
+        for framerate in (25, 50, 125, 500, 1000):
+            timestep = FixedTimestep(timestep=0.004, max_steps=60)
+            steps = sum(
+                timestep.advance(1 / framerate) for _ in range(framerate)
+            )
+            self.assertEqual(steps, 250)
+
+    def test_max_steps(self):
+        timestep = FixedTimestep(timestep=0.01, max_steps=5)
+        self.assertEqual(timestep.advance(1.0), 5)
+        self.assertLess(timestep.alpha, 1.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            FixedTimestep(timestep=0.0, max_steps=1)
+        with self.assertRaises(ValueError):
+            FixedTimestep(timestep=0.01, max_steps=0)
+        with self.assertRaises(ValueError):
+            FixedTimestep(timestep=0.01, max_steps=1).advance(-1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import csv
+import json
+import tempfile
+import unittest
+
+from myapp.FrameProfiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = FrameProfiler(
+            phases=("update", "draw"), history=100, clock=self.clock
+        )
+
+    def run_frames(self, count: int, update: float, draw: float):
+        for _ in range(count):
+            self.clock.now += update
+            self.profiler.lap("update")
+            self.clock.now += draw
+            self.profiler.lap("draw")
+            self.profiler.end_frame()
+
+    def test_summary(self):
+        self.run_frames(99, update=0.001, draw=0.004)
+        self.run_frames(1, update=0.020, draw=0.004)
+        summary = self.profiler.get_summary()
+        self.assertAlmostEqual(summary["update"]["p50"], 1.0)
+        self.assertAlmostEqual(summary["update"]["max"], 20.0)
+        self.assertAlmostEqual(summary["draw"]["p99"], 4.0)
+        self.assertAlmostEqual(summary["frame"]["p50"], 5.0)
+
+    def test_repeated_lap(self):
+        # 処理段階が交互に繰り返される場合は段階ごとに合算する
+        for _ in range(3):
+            self.clock.now += 0.002
+            self.profiler.lap("update")
+            self.clock.now += 0.001
+            self.profiler.lap("draw")
+        self.profiler.end_frame()
+        samples = self.profiler.get_samples()
+        self.assertAlmostEqual(samples[0, 0], 0.006)
+        self.assertAlmostEqual(samples[0, 1], 0.003)
+
+    def test_ring_buffer(self):
+        self.run_frames(100, update=0.010, draw=0.0)
+        self.run_frames(30, update=0.001, draw=0.0)
+        samples = self.profiler.get_samples()
+        self.assertEqual(samples.shape, (100, 2))
+        self.assertEqual(self.profiler.frame_count, 130)
+        # 古い順に並び、最新の30フレームが末尾になる
+        self.assertAlmostEqual(samples[0, 0], 0.010)
+        self.assertAlmostEqual(samples[-1, 0], 0.001)
+        self.assertAlmostEqual(samples[-31, 0], 0.010)
+
+    def test_save(self):
+        self.run_frames(10, update=0.001, draw=0.002)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "profile.csv")
+            json_path = os.path.join(temp_dir, "profile.json")
+            self.profiler.save_csv(csv_path)
+            self.profiler.save_json(json_path)
+            with open(csv_path, encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            with open(json_path, encoding="utf-8") as f:
+                summary = json.load(f)
+        self.assertEqual(rows[0], ["update_ms", "draw_ms"])
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(summary["frames"], 10)
+        self.assertAlmostEqual(summary["phases"]["draw"]["p95"], 2.0)
+
+    def test_invalid_phases(self):
+        with self.assertRaises(ValueError):
+            FrameProfiler(phases=())
+        with self.assertRaises(ValueError):
+            FrameProfiler(phases=("update", "update"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+from myapp.FrameScheduler import FrameScheduler
+
+
+class FakeClock:
+    """sleepで時刻を進め、時刻の取得ごとに僅かに時刻を進める時計"""
+
+    def __init__(self, sleep_overshoot: float = 0.0):
+        self.now = 0.0
+        self.sleep_overshoot = sleep_overshoot
+        self.slept = 0.0
+        self.polls = 0
+
+    def clock(self) -> float:
+        self.polls += 1
+        self.now += 0.00001
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept += seconds
+        self.now += seconds + self.sleep_overshoot
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def make_scheduler(self, clock: FakeClock, *args, **kwargs):
+        return FrameScheduler(
+            *args, clock=clock.clock, sleep=clock.sleep, **kwargs
+        )
+
+    def test_framerate(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock, 50)
+        frame_times = [scheduler.tick() for _ in range(100)]
+        self.assertAlmostEqual(clock.now, 2.0, delta=0.001)
+        for frame_time in frame_times[1:]:
+            self.assertAlmostEqual(frame_time, 0.02, delta=0.0001)
+        # 待ち時間の大部分はsleepで待つ
+        self.assertGreater(clock.slept, 1.8)
+
+    def test_sleep_overshoot_does_not_accumulate(self):
+        # sleepが0.5ms遅れて起床しても空ループで吸収する
+        clock = FakeClock(sleep_overshoot=0.0005)
+        scheduler = self.make_scheduler(clock, 100)
+        for _ in range(100):
+            scheduler.tick()
+        self.assertAlmostEqual(clock.now, 1.0, delta=0.001)
+
+    def test_idle_framerate(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock, 60, idle_framerate=20)
+        scheduler.tick()
+        self.assertAlmostEqual(scheduler.tick(idle=True), 0.05, delta=0.0001)
+        self.assertAlmostEqual(scheduler.tick(), 1 / 60, delta=0.0001)
+
+    def test_late_frame_resets_deadline(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock, 100)
+        scheduler.tick()
+        # 処理落ちで0.1秒遅れた後は遅れを取り戻そうとせず通常の間隔に戻る
+        clock.now += 0.1
+        scheduler.tick()
+        self.assertAlmostEqual(scheduler.tick(), 0.01, delta=0.0001)
+
+    def test_poll_during_wait(self):
+        clock = FakeClock()
+        polls = []
+        scheduler = self.make_scheduler(
+            clock,
+            50,
+            poll=lambda: polls.append(clock.now),
+            poll_interval=0.002,
+        )
+        scheduler.tick()
+        # 待ち時間を入力取得の間隔に区切ってsleepする
+        self.assertGreaterEqual(len(polls), 9)
+        for previous, current in zip(polls, polls[1:]):
+            self.assertLessEqual(current - previous, 0.0021)
+        self.assertAlmostEqual(scheduler.frame_time, 0.02, delta=0.0001)
+
+    def test_unlimited(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock, None)
+        scheduler.tick()
+        self.assertEqual(clock.slept, 0.0)
+        self.assertLess(scheduler.frame_time, 0.001)
+
+    def test_invalid_framerate(self):
+        with self.assertRaises(ValueError):
+            FrameScheduler(0)
+        with self.assertRaises(ValueError):
+            FrameScheduler(60, idle_framerate=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
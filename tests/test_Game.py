@@ -0,0 +1,99 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tempfile
+import unittest
+from unittest import mock
+
+import pygame
+
+from myapp import GameData
+from myapp.Game import Game
+
+
+class TestGameDirtyRects(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        # ジャーナルとテーブルのキャッシュは一時ディレクトリに作成する
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.game = Game("test")
+        # 初回は画面全体を描画する
+        self.game._screen_update()
+        self.assertEqual(
+            self.game._dirty_rects[0], self.game._screen.get_rect()
+        )
+
+    def tearDown(self):
+        self.game._journal.close()
+        pygame.quit()
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def test_unchanged_frame(self):
+        self.game._screen_update()
+        self.assertEqual(self.game._dirty_rects, [])
+        with (
+            mock.patch.object(pygame.display, "update") as update,
+            mock.patch.object(pygame.display, "flip") as flip,
+        ):
+            self.game._display_update()
+        update.assert_not_called()
+        flip.assert_not_called()
+
+    def test_changed_reel(self):
+        self.game._reel_coords_fixed[0] += 1 << GameData.SUBPIXEL_BITS
+        self.game._screen_update()
+        self.assertEqual(
+            self.game._dirty_rects, [self.game._drawn_rects["left_reel"]]
+        )
+        with mock.patch.object(pygame.display, "update") as update:
+            self.game._display_update()
+        update.assert_called_once_with(self.game._dirty_rects)
+
+    def test_changed_lamp(self):
+        self.game._slot.maxbet_keydown()
+        self.game._slot.maxbet_keyup()
+        while self.game._slot.beting:
+            self.game._slot.update(GameData.LOGIC_TIMESTEP)
+        self.game._screen_update()
+        dirty_rects = self.game._dirty_rects
+        self.assertIn(self.game._drawn_rects["bet"], dirty_rects)
+        # 状態が変化していない要素は再描画しない
+        for key in ("replay", "wait", "left_reel"):
+            self.assertNotIn(self.game._drawn_rects[key], dirty_rects)
+
+    def test_poll_input_while_waiting(self):
+        # 待機中のイベント取得時間は待機時間と分けて計測する
+        with mock.patch.object(self.game, "_frame_profiler") as profiler:
+            self.game._poll_input_while_waiting()
+        self.assertEqual(
+            profiler.lap.call_args_list,
+            [mock.call("wait"), mock.call("input")],
+        )
+        self.assertEqual(
+            self.game._frame_scheduler._poll,
+            self.game._poll_input_while_waiting,
+        )
+
+    def test_draw_if_changed(self):
+        draw = mock.Mock(
+            side_effect=[pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10)]
+        )
+        self.game._dirty_rects = []
+        self.game._draw_if_changed("item", 1, draw)
+        self.game._draw_if_changed("item", 1, draw)
+        self.assertEqual(draw.call_count, 1)
+        self.assertEqual(self.game._dirty_rects, [pygame.Rect(0, 0, 10, 10)])
+        # 前回描画した領域を含めて更新する
+        self.game._dirty_rects = []
+        self.game._draw_if_changed("item", 2, draw)
+        self.assertEqual(self.game._dirty_rects, [pygame.Rect(0, 0, 15, 15)])
+
+
+if __name__ == "__main__":
+    unittest.main()
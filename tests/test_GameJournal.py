@@ -0,0 +1,169 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tempfile
+import unittest
+
+import numpy as np
+
+from myapp.GameJournal import (
+    JOURNAL_CORRUPT_SUFFIX,
+    JOURNAL_DTYPE,
+    JOURNAL_HEADER_DTYPE,
+    GameJournal,
+    GameJournalReader,
+    create_session_directory,
+    get_journal_files,
+)
+from myapp.MonteCarlo import MonteCarloRunner
+
+
+def append_games(journal: GameJournal, start: int, count: int) -> None:
+    for game in range(start, start + count):
+        journal.append(
+            game=game,
+            time_ns=game * 1000,
+            bet=3,
+            lottery_result=game % 5,
+            press_order=(0, 1, 2),
+            press=(game % 20, 1, 2),
+            stop=(3, 4, 5),
+            payout=game % 16,
+            credit=game * 2,
+            replay=game % 2 == 0,
+            internal_state=0,
+            at_state=0,
+            navi_state=0,
+            rt_state=0,
+        )
+
+
+class TestGameJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_and_read(self):
+        with GameJournal(
+            self.directory, file_records=10, batch_size=4
+        ) as journal:
+            append_games(journal, 1, 25)
+        # 1ファイル10遊技ずつに分割される
+        self.assertEqual(len(get_journal_files(self.directory)), 3)
+
+        records = GameJournalReader(self.directory).read()
+        self.assertEqual(records.dtype, JOURNAL_DTYPE)
+        np.testing.assert_array_equal(records["game"], np.arange(1, 26))
+        np.testing.assert_array_equal(
+            records["press"][:, 0], records["game"] % 20
+        )
+        np.testing.assert_array_equal(
+            records["replay"], records["game"] % 2 == 0
+        )
+
+    def test_batched_write(self):
+        journal = GameJournal(self.directory, batch_size=4)
+        append_games(journal, 1, 3)
+        # バッチサイズに達するまでは書き込まない
+        self.assertEqual(len(GameJournalReader(self.directory).read()), 0)
+        append_games(journal, 4, 1)
+        self.assertEqual(len(GameJournalReader(self.directory).read()), 4)
+
+    def test_iter_batches(self):
+        with GameJournal(self.directory, file_records=10) as journal:
+            append_games(journal, 1, 25)
+        sizes = [
+            len(batch)
+            for batch in GameJournalReader(self.directory).iter_batches(
+                batch_size=4
+            )
+        ]
+        self.assertEqual(sizes, [4, 4, 2, 4, 4, 2, 4, 1])
+
+    def test_append_to_existing(self):
+        with GameJournal(self.directory, file_records=10) as journal:
+            append_games(journal, 1, 5)
+        # 書き込み途中で中断した不完全な記録は切り捨てて追記する
+        (path,) = get_journal_files(self.directory)
+        with open(path, "ab") as f:
+            f.write(b"\x00" * (JOURNAL_DTYPE.itemsize // 2))
+        with GameJournal(self.directory, file_records=10) as journal:
+            append_games(journal, 6, 10)
+        records = GameJournalReader(self.directory).read()
+        np.testing.assert_array_equal(records["game"], np.arange(1, 16))
+        self.assertEqual(len(get_journal_files(self.directory)), 2)
+
+    def test_time_based_flush(self):
+        now = [0.0]
+        journal = GameJournal(
+            self.directory, flush_interval=5.0, clock=lambda: now[0]
+        )
+        append_games(journal, 1, 2)
+        self.assertEqual(len(GameJournalReader(self.directory).read()), 0)
+        # バッチサイズに達していなくても一定時間が経過すれば書き込む
+        now[0] = 5.0
+        append_games(journal, 3, 1)
+        self.assertEqual(len(GameJournalReader(self.directory).read()), 3)
+        now[0] = 6.0
+        append_games(journal, 4, 1)
+        self.assertEqual(len(GameJournalReader(self.directory).read()), 3)
+
+    def test_recover_from_invalid_last_file(self):
+        with GameJournal(self.directory, file_records=5) as journal:
+            append_games(journal, 1, 7)
+        # ヘッダーの書き込み前に中断した最後のファイル
+        path = os.path.join(self.directory, "journal_000001.bin")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * (JOURNAL_HEADER_DTYPE.itemsize // 2))
+
+        with self.assertLogs(level="WARNING"):
+            journal = GameJournal(self.directory, file_records=5)
+        with journal:
+            append_games(journal, 8, 2)
+        self.assertTrue(os.path.isfile(path + JOURNAL_CORRUPT_SUFFIX))
+        records = GameJournalReader(self.directory).read()
+        np.testing.assert_array_equal(records["game"], [1, 2, 3, 4, 5, 8, 9])
+
+    def test_session(self):
+        path = create_session_directory(self.directory)
+        # 同じ時刻に作成しても別のディレクトリになる
+        self.assertNotEqual(create_session_directory(self.directory), path)
+        with GameJournal(path, session={"seed": 2**100}) as journal:
+            append_games(journal, 1, 1)
+        self.assertEqual(GameJournalReader(path).session, {"seed": 2**100})
+        self.assertIsNone(GameJournalReader(self.directory).session)
+
+    def test_invalid_file(self):
+        path = os.path.join(self.directory, "journal_000000.bin")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * JOURNAL_HEADER_DTYPE.itemsize)
+        with self.assertRaises(ValueError):
+            GameJournalReader(self.directory).read()
+
+    def test_simulation_journal(self):
+        runner = MonteCarloRunner(
+            workers=1, seed=1, journal_dir=self.directory, cache_dir=None
+        )
+        result = runner.run(200)
+        records = GameJournalReader(
+            os.path.join(self.directory, "worker_000")
+        ).read()
+        self.assertEqual(len(records), 200)
+        np.testing.assert_array_equal(records["game"], np.arange(1, 201))
+        self.assertEqual(int(records["payout"].sum()), result.payout_out)
+        # 全リールを左・中・右の順に停止している
+        np.testing.assert_array_equal(
+            records["press_order"], [[0, 1, 2]] * 200
+        )
+        # 前回の記録に続けて追記しない
+        with self.assertRaises(ValueError):
+            runner.run(200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tempfile
+import unittest
+
+import numpy as np
+
+from myapp import GameData
+from myapp.GameJournal import GameJournal, GameJournalReader
+from myapp.InputRecording import InputRecording, replay, verify
+from myapp.Slot import Slot
+
+# ゲーム本体と同じ固定の刻み幅で更新する
+TIMESTEP = GameData.LOGIC_TIMESTEP
+
+
+def create_slot(rng: np.random.Generator, recorder=None, journal=None) -> Slot:
+    return Slot(rng=rng, cache_dir=None, recorder=recorder, journal=journal)
+
+
+def play(seed: int, games: int, journal=None) -> tuple[Slot, InputRecording]:
+    """固定の刻み幅で更新しながら、ばらばらの時刻にボタンを押して遊技する"""
+    recording = InputRecording(seed=seed)
+    slot = create_slot(
+        np.random.default_rng(seed), recorder=recording, journal=journal
+    )
+    # 押す時刻は内部抽選とは別の乱数で決める
+    timing_rng = np.random.default_rng(seed + 1)
+
+    def wait(steps: int) -> None:
+        for _ in range(steps):
+            slot.update(TIMESTEP)
+
+    for _ in range(games):
+        wait(int(timing_rng.integers(1, 30)))
+        slot.maxbet_keydown()
+        slot.maxbet_keyup()
+        while slot.beting:
+            wait(1)
+        slot.lever_keydown()
+        slot.lever_keyup()
+        for keydown, keyup in (
+            (slot.leftreelstop_keydown, slot.leftreelstop_keyup),
+            (slot.centerreelstop_keydown, slot.centerreelstop_keyup),
+            (slot.rightreelstop_keydown, slot.rightreelstop_keyup),
+        ):
+            wait(int(timing_rng.integers(10, 200)))
+            # 押した時刻は直前の更新から刻み幅未満の範囲でずれる
+            keydown(float(timing_rng.uniform(0.0, TIMESTEP)))
+            keyup()
+        while slot.gaming:
+            wait(1)
+    wait(10)
+    recording.finish(slot)
+
+    return slot, recording
+
+
+class TestInputRecording(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.slot, cls.recording = play(seed=1234, games=20)
+
+    def test_record(self):
+        recording = self.recording
+        self.assertEqual(recording.seed, 1234)
+        # 1遊技あたり MAXBET・レバー・停止ボタン3つの押下と開放
+        self.assertEqual(len(recording.events), 20 * 5 * 2)
+        self.assertEqual(recording.end_time_ns, self.slot.time_ns)
+        self.assertEqual(recording.credit, self.slot.credit)
+        self.assertEqual(
+            recording.stops,
+            tuple(reel.current_symbol_index for reel in self.slot.reel),
+        )
+        times = [time_ns for time_ns, _, _, _ in recording.events]
+        self.assertEqual(times, sorted(times))
+        # 停止ボタンの押下のみ押した時刻の経過時間を持つ
+        for _, elapsed_ns, button, pressed in recording.events:
+            if not (pressed and button.endswith("reelstop")):
+                self.assertEqual(elapsed_ns, 0)
+
+    def test_replay_matches(self):
+        slot = verify(self.recording, slot_factory=create_slot)
+        self.assertEqual(slot.game_count, self.slot.game_count)
+        self.assertEqual(slot.credit, self.slot.credit)
+        self.assertEqual(slot.time_ns, self.slot.time_ns)
+
+    def test_replay_journal_matches(self):
+        # 遊技終了時の論理時刻を含めて、ジャーナルの記録が記録時と一致する
+        with tempfile.TemporaryDirectory() as temp_dir:
+            live_dir = os.path.join(temp_dir, "live")
+            replay_dir = os.path.join(temp_dir, "replay")
+            with GameJournal(live_dir) as journal:
+                _, recording = play(seed=99, games=10, journal=journal)
+            with GameJournal(replay_dir) as journal:
+                replay(
+                    recording,
+                    slot_factory=lambda rng: create_slot(rng, journal=journal),
+                )
+            live_records = GameJournalReader(live_dir).read()
+            replay_records = GameJournalReader(replay_dir).read()
+
+        self.assertEqual(len(live_records), 10)
+        np.testing.assert_array_equal(replay_records, live_records)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "recording.json")
+            self.recording.save(path)
+            loaded = InputRecording.load(path)
+
+        self.assertEqual(loaded.seed, self.recording.seed)
+        self.assertEqual(
+            [tuple(event) for event in loaded.events], self.recording.events
+        )
+        self.assertEqual(loaded.spec_hash, self.slot.spec_hash)
+        self.assertEqual(loaded.end_time_ns, self.recording.end_time_ns)
+        self.assertEqual(loaded.credit, self.recording.credit)
+        self.assertEqual(loaded.stops, self.recording.stops)
+        verify(loaded, slot_factory=create_slot)
+
+    def test_mismatch(self):
+        # 乱数シードが異なるSlotで再生した終了時の状態を記録する
+        recording = InputRecording(seed=self.recording.seed)
+        other = InputRecording(seed=self.recording.seed + 1)
+        for event in self.recording.events:
+            recording.record(*event)
+            other.record(*event)
+        other.finish(self.slot)
+        recording.finish(replay(other, slot_factory=create_slot))
+        # 内部抽選の結果が変わるため、停止位置が記録と一致しない
+        with self.assertRaisesRegex(AssertionError, "リールの停止位置"):
+            verify(recording, slot_factory=create_slot)
+
+    def test_spec_mismatch(self):
+        # テーブルの仕様を変更した後の再生は結果を比較せずに中断する
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "recording.json")
+            self.recording.save(path)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            data["spec_hash"] = "0" * 64
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            recording = InputRecording.load(path)
+
+        with self.assertRaisesRegex(ValueError, "テーブルの仕様"):
+            verify(recording, slot_factory=create_slot)
+
+    def test_load_invalid(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "recording.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"format_version": 0}, f)
+            with self.assertRaises(ValueError):
+                InputRecording.load(path)
+
+        with self.assertRaises(ValueError):
+            verify(InputRecording(seed=0), slot_factory=create_slot)
+
+
+if __name__ == "__main__":
+    unittest.main()
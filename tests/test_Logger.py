@@ -0,0 +1,117 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import glob
+import logging
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler
+
+from myapp import Logger
+
+# Loggerが参照する設定モジュール
+config = Logger.config
+
+
+def log_in_worker(message: str) -> int:
+    Logger.get_logger("worker").info("%s from %d", message, os.getpid())
+    return os.getpid()
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = config.LOG_DIR
+        self.log_level = config.LOG_LEVEL
+        config.LOG_DIR = self.temp_dir.name
+        root_logger = logging.getLogger()
+        self.root_level = root_logger.level
+        self.root_handlers = list(root_logger.handlers)
+
+    def tearDown(self):
+        Logger.shutdown_logging()
+        config.LOG_DIR = self.log_dir
+        config.LOG_LEVEL = self.log_level
+        root_logger = logging.getLogger()
+        root_logger.setLevel(self.root_level)
+        root_logger.handlers[:] = self.root_handlers
+        self.temp_dir.cleanup()
+
+    def read_log(self) -> str:
+        (log_file,) = glob.glob(os.path.join(self.temp_dir.name, "*.log"))
+        with open(log_file, encoding="utf-8") as f:
+            return f.read()
+
+    def test_queue_logging(self):
+        config.LOG_LEVEL = logging.INFO
+        Logger.setup_logging()
+        root_logger = logging.getLogger()
+        queue_handlers = [
+            handler
+            for handler in root_logger.handlers
+            if isinstance(handler, QueueHandler)
+        ]
+        self.assertEqual(len(queue_handlers), 1)
+
+        log = Logger.get_logger("test")
+        log.info("value: %s", 42)
+        log.debug("filtered")
+        # 停止時にキューに残ったログを出力する
+        Logger.shutdown_logging()
+
+        text = self.read_log()
+        self.assertIn("INFO test value: 42", text)
+        self.assertNotIn("filtered", text)
+
+    def test_mutable_args(self):
+        Logger.setup_logging()
+        log = Logger.get_logger("test")
+        values = [1, 2, 3]
+        log.info("values: %s", values)
+        # 出力前に引数を変更しても記録時の値を出力する
+        values.append(4)
+        Logger.shutdown_logging()
+
+        self.assertIn("INFO test values: [1, 2, 3]\n", self.read_log())
+
+    def test_prepare(self):
+        handler = Logger._DeferredQueueHandler(None)
+        record = logging.makeLogRecord({"msg": "value: %s", "args": (42,)})
+        # 変更されない引数のみの場合は整形をリスナーのスレッドに任せる
+        self.assertEqual(handler.prepare(record).args, (42,))
+        record = logging.makeLogRecord({"msg": "value: %s", "args": ([42],)})
+        record = handler.prepare(record)
+        self.assertEqual(record.msg, "value: [42]")
+        self.assertIsNone(record.args)
+
+    def test_worker_logging(self):
+        config.LOG_LEVEL = logging.INFO
+        Logger.setup_logging()
+        with (
+            Logger.worker_log_queue() as log_queue,
+            ProcessPoolExecutor(
+                max_workers=1,
+                initializer=Logger.setup_worker_logging,
+                initargs=(log_queue,),
+            ) as executor,
+        ):
+            pid = executor.submit(log_in_worker, "message").result()
+        Logger.shutdown_logging()
+
+        # ワーカープロセスのログも親プロセスのログファイルに出力する
+        self.assertNotEqual(pid, os.getpid())
+        self.assertIn(f"INFO worker message from {pid}\n", self.read_log())
+
+    def test_setup_once(self):
+        Logger.setup_logging()
+        Logger.setup_logging()
+        self.assertEqual(
+            len(glob.glob(os.path.join(self.temp_dir.name, "*.log"))), 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tempfile
+import unittest
+
+import numpy as np
+
+from myapp.MonteCarlo import MonteCarloRunner
+
+
+class TestMonteCarloRunner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_split_games(self):
+        runner = MonteCarloRunner(workers=3, seed=0)
+        self.assertEqual(runner._split_games(10), [4, 3, 3])
+        self.assertEqual(sum(runner._split_games(10)), 10)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            MonteCarloRunner(workers=0)
+
+    def test_same_seed_same_result(self):
+        result_a = MonteCarloRunner(
+            workers=2, seed=1234, cache_dir=self.cache_dir
+        ).run(40)
+        result_b = MonteCarloRunner(
+            workers=2, seed=1234, cache_dir=self.cache_dir
+        ).run(40)
+        self.assertEqual(result_a.games, 40)
+        self.assertEqual(result_a.payout_in, result_b.payout_in)
+        self.assertEqual(result_a.payout_out, result_b.payout_out)
+        np.testing.assert_array_equal(
+            result_a.payout_histogram, result_b.payout_histogram
+        )
+        np.testing.assert_array_equal(result_a.role_hits, result_b.role_hits)
+        # ワーカーは指定したキャッシュを共有する
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_histogram_matches_totals(self):
+        result = MonteCarloRunner(
+            workers=1, seed=5, cache_dir=self.cache_dir
+        ).run(30)
+        self.assertEqual(int(result.payout_histogram.sum()), 30)
+        payouts = np.arange(len(result.payout_histogram))
+        self.assertEqual(
+            int((payouts * result.payout_histogram).sum()), result.payout_out
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+import numpy as np
+
+from myapp import GameData, SlotData
+from myapp.PayoutTable import PayoutTable
+from myapp.WinEvaluator import WinEvaluator
+
+
+class TestPayoutTable(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = WinEvaluator(SlotData.ROLES, SlotData.PAYLINES)
+        self.reel_symbols = [
+            SlotData.REEL_SYMBOLPATTERN_L,
+            SlotData.REEL_SYMBOLPATTERN_C,
+            SlotData.REEL_SYMBOLPATTERN_R,
+        ]
+        self.table = PayoutTable(self.evaluator, self.reel_symbols)
+
+    def _window(self, stops):
+        length = GameData.REEL_SYMBOL_LENGTH
+        return [
+            [symbols[(stop + row) % length].id for row in range(3)]
+            for symbols, stop in zip(self.reel_symbols, stops)
+        ]
+
+    def test_shape(self):
+        length = GameData.REEL_SYMBOL_LENGTH
+        self.assertEqual(self.table.payouts.shape, (length, length, length))
+
+    def test_lookup_matches_evaluator(self):
+        rng = np.random.default_rng(0)
+        for stops in rng.integers(GameData.REEL_SYMBOL_LENGTH, size=(300, 3)):
+            stops = tuple(int(stop) for stop in stops)
+            line_roles = self.evaluator.evaluate(self._window(stops))
+            self.assertEqual(
+                self.table.get_payout(stops),
+                self.evaluator.get_payout(line_roles),
+            )
+            self.assertEqual(
+                self.table.get_win_roles(stops),
+                self.evaluator.get_win_roles(line_roles),
+            )
+
+    def test_payout_rate(self):
+        expected = self.table.payouts.mean() / GameData.VALIDBET_MAX
+        self.assertAlmostEqual(self.table.get_payout_rate(), expected)
+        self.assertGreater(
+            self.table.get_payout_rate(replay_roles=SlotData.REPLAY_ROLES),
+            expected,
+        )
+
+    def test_invalid_reel_count(self):
+        with self.assertRaises(ValueError):
+            PayoutTable(self.evaluator, self.reel_symbols[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+
+from myapp import config
+from myapp.ProfileRecorder import ProfileRecorder
+
+
+def busy_function():
+    return sum(range(1000))
+
+
+class TestProfileRecorder(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.recorder = ProfileRecorder(
+            frames=3, output_dir=self.temp_dir.name
+        )
+
+    def tearDown(self):
+        self.recorder.stop()
+        self.temp_dir.cleanup()
+
+    def test_stop_after_frames(self):
+        self.recorder.start()
+        paths = []
+        for _ in range(3):
+            self.assertTrue(self.recorder.active)
+            busy_function()
+            paths.append(self.recorder.end_frame())
+        self.assertFalse(self.recorder.active)
+        self.assertEqual(paths[:2], [None, None])
+        self.assertTrue(paths[2].endswith(".pstats"))
+
+        stats = pstats.Stats(paths[2])
+        functions = {name for _, _, name in stats.stats}
+        self.assertIn("busy_function", functions)
+
+    def test_toggle(self):
+        self.assertIsNone(self.recorder.toggle())
+        self.assertTrue(self.recorder.active)
+        first = self.recorder.toggle()
+        self.assertFalse(self.recorder.active)
+        self.recorder.start()
+        second = self.recorder.stop()
+        # 計測ごとに別のファイルに保存する
+        self.assertNotEqual(first, second)
+        self.assertTrue(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+    def test_end_frame_while_inactive(self):
+        self.assertIsNone(self.recorder.end_frame())
+        self.assertIsNone(self.recorder.stop())
+
+    def test_invalid_frames(self):
+        with self.assertRaises(ValueError):
+            ProfileRecorder(frames=0)
+
+    def test_profile_frames_env(self):
+        with mock.patch.dict(os.environ, {"NEWSLOT_PROFILE_FRAMES": "120"}):
+            self.assertEqual(
+                config._get_env_int("NEWSLOT_PROFILE_FRAMES", 0), 120
+            )
+        # 不正な値は警告して既定値を使用する
+        with mock.patch.dict(os.environ, {"NEWSLOT_PROFILE_FRAMES": "abc"}):
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(
+                    config._get_env_int("NEWSLOT_PROFILE_FRAMES", 0), 0
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
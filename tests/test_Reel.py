@@ -63,17 +63,65 @@ class TestReel(unittest.TestCase):
         self.assertTrue(self.reel.stop_request)
         self.assertIsInstance(self.reel.target_symbol, list)
 
-    def test_get_updated_current_coord(self):
-        current = 0.0
-        dt = 1.0
-        updated = self.reel._get_updated_current_coord(current, dt)
-        self.assertTrue(0 <= updated < GameData.REEL_HEIGHT)
+    def test_update_current_coord(self):
+        self.reel.reel_start()
+        self.reel.update(1.0)
+        self.assertTrue(0 <= self.reel.current_coord < GameData.REEL_HEIGHT)
+        self.assertEqual(
+            self.reel.current_symbol_index,
+            self.reel._get_symbol_index(self.reel.current_coord),
+        )
+
+    def test_get_n_ahead_symbol_with_duplicate_symbols(self):
+        # 同じ図柄が複数回出現するリール配列でも位置を取り違えない
+        symbols = [self.symbols[i % 4] for i in range(len(self.symbols))]
+        reel = Reel(symbols)
+        reel.reel_start()
+        reel.update(GameData.REEL_SPEED * 7 / GameData.REEL_SYMBOL_LENGTH)
+        index = reel.current_symbol_index
+        length = GameData.REEL_SYMBOL_LENGTH
+        self.assertEqual(
+            reel.get_n_ahead_symbol(5),
+            [symbols[(index - 5 + row) % length] for row in range(3)],
+        )
+
+    def test_stop_at_target_index(self):
+        self.reel.reel_start()
+        self.reel.update(0.1)
+        target = (self.reel.current_symbol_index - 3) % len(self.symbols)
+        self.reel.stop_spin(target, GameData.REEL_POSITION_TOP)
+        # 1回の更新で目標を通り過ぎる経過時間でも目標位置で停止する
+        self.reel.update(GameData.REEL_SPEED / 2)
+        self.assertFalse(self.reel.spinning)
+        self.assertEqual(self.reel.current_symbol_index, target)
+        self.assertEqual(self.reel.current_coord % GameData.SYMBOL_HEIGHT, 0.0)
+        self.assertEqual(
+            self.reel.get_window_symbol_ids(target),
+            [self.symbols[(target + row) % 20].id for row in range(3)],
+        )
 
     def test_get_reel_image(self):
         image = self.reel._get_reel_image(self.symbols)
         self.assertEqual(image.shape[1], GameData.REEL_WIDTH)
         self.assertEqual(image.shape[0], GameData.REEL_HEIGHT)
 
+    def test_reel_image_cache(self):
+        symbols = [
+            DummySymbol(1000 + i, f"symbol{i}")
+            for i in range(GameData.REEL_SYMBOL_LENGTH)
+        ]
+        for i, symbol in enumerate(symbols):
+            symbol._image = np.full_like(symbol.image, i)
+        reel_a = Reel(symbols)
+        reel_b = Reel(list(symbols))
+        # 同じ図柄IDの並びのリール画像は共有される
+        self.assertIs(reel_a.reel_image, reel_b.reel_image)
+        self.assertFalse(reel_a.reel_image.flags.writeable)
+        np.testing.assert_array_equal(
+            reel_a.reel_image,
+            np.concatenate([symbol.image for symbol in symbols]),
+        )
+
     def test_invalid_reel_symbol_length(self):
         with self.assertRaises(ValueError):
             Reel(self.symbols[:2])
@@ -111,6 +159,81 @@ class TestReel(unittest.TestCase):
         with self.assertRaises(ValueError):
             Reel(invalid_symbols)
 
+    def test_time_to_stop(self):
+        self.reel.reel_start()
+        self.assertIsNone(self.reel.time_to_stop)
+        target = (self.reel.get_stop_symbol_index() - 2) % 20
+        self.reel.stop_spin(target, GameData.REEL_POSITION_TOP)
+        expected = 3 * GameData.REEL_SPEED / GameData.REEL_SYMBOL_LENGTH
+        self.assertAlmostEqual(self.reel.time_to_stop, expected)
+        self.reel.update(expected / 2)
+        self.assertTrue(self.reel.spinning)
+        self.assertAlmostEqual(self.reel.time_to_stop, expected / 2)
+        self.reel.update(expected / 2)
+        self.assertFalse(self.reel.spinning)
+        self.assertEqual(self.reel.current_symbol_index, target)
+
+    def test_stop_independent_of_frame_rate(self):
+        results = []
+        for dt in (1 / 240, 1 / 60, 1 / 7, 2.0):
+            reel = Reel(self.symbols)
+            reel.reel_start()
+            reel.update(0.37)
+            target = (reel.get_stop_symbol_index() - 4) % 20
+            reel.stop_spin(target, GameData.REEL_POSITION_TOP)
+            elapsed = 0.0
+            while reel.spinning:
+                reel.update(dt)
+                elapsed += dt
+                if reel.spinning:
+                    self.assertGreater(reel.time_to_stop, 0.0)
+            results.append((reel.current_symbol_index, reel.current_coord))
+            self.assertLess(elapsed, 5 * GameData.REEL_SPEED / 20 + dt)
+        self.assertEqual(len(set(results)), 1)
+
+    def test_press_time_independent_of_frame_rate(self):
+        # 押した時刻が同じであれば更新間隔によらず停止位置は一致する
+        press_ns = 413_700_000
+        reference = Reel(self.symbols)
+        reference.reel_start()
+        reference.update(press_ns / 1_000_000_000)
+        expected = reference.get_stop_symbol_index()
+
+        for dt_ns in (40_000_000, 4_000_000, 1_000_000):
+            reel = Reel(self.symbols)
+            reel.reel_start()
+            steps = press_ns // dt_ns
+            for _ in range(steps):
+                reel.update(dt_ns / 1_000_000_000)
+            elapsed = (press_ns - steps * dt_ns) / 1_000_000_000
+            press = reel.get_stop_symbol_index(elapsed)
+            self.assertEqual(press, expected)
+            reel.stop_spin(press, GameData.REEL_POSITION_TOP, elapsed)
+            while reel.spinning:
+                reel.update(dt_ns / 1_000_000_000)
+            self.assertEqual(reel.current_symbol_index, expected)
+
+    def test_fixed_coord_independent_of_step_split(self):
+        # 経過時間の分割方法によらず固定小数点座標は一致する
+        reels = [Reel(self.symbols), Reel(self.symbols)]
+        for reel in reels:
+            reel.reel_start()
+        for _ in range(500):
+            reels[0].update(1 / 500)
+        for _ in range(10):
+            reels[1].update(1 / 10)
+        self.assertIsInstance(reels[0].current_coord_fixed, int)
+        self.assertEqual(
+            reels[0].current_coord_fixed, reels[1].current_coord_fixed
+        )
+        self.assertEqual(
+            reels[0].current_coord_fixed,
+            GameData.REEL_UNITS
+            * 1_000_000_000
+            // GameData.REEL_PERIOD_NS
+            % GameData.REEL_UNITS,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
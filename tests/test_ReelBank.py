@@ -0,0 +1,147 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+import numpy as np
+
+from myapp import GameData, SlotData
+from myapp.Reel import Reel
+from myapp.ReelBank import ReelBank
+
+
+class TestReelBank(unittest.TestCase):
+    def setUp(self):
+        self.bank = ReelBank(3)
+
+    def test_initialization(self):
+        self.assertEqual(self.bank.shape, (3,))
+        self.assertFalse(self.bank.spinning.any())
+        self.assertTrue(self.bank.stop_request.all())
+        np.testing.assert_array_equal(self.bank.current_coord, 0.0)
+
+    def test_matches_reel(self):
+        reels = [Reel(SlotData.REEL_SYMBOLPATTERN_L) for _ in range(3)]
+        rng = np.random.default_rng(0)
+        self.bank.reel_start()
+        for reel in reels:
+            reel.reel_start()
+        for step in range(300):
+            dt = float(rng.uniform(0.0, 0.1))
+            if step % 50 == 10:
+                index = step // 50 % 3
+                target = int(rng.integers(GameData.REEL_SYMBOL_LENGTH))
+                self.bank.stop_spin(index, target)
+                reels[index].stop_spin(target, GameData.REEL_POSITION_TOP)
+            if step % 50 == 40:
+                self.bank.reel_start(step // 50 % 3)
+                reels[step // 50 % 3].reel_start()
+            self.bank.update(dt)
+            for reel in reels:
+                reel.update(dt)
+            np.testing.assert_array_equal(
+                self.bank.current_symbol_index,
+                [reel.current_symbol_index for reel in reels],
+            )
+            np.testing.assert_array_equal(
+                self.bank.spinning, [reel.spinning for reel in reels]
+            )
+            np.testing.assert_array_equal(
+                self.bank.current_coord_fixed,
+                [reel.current_coord_fixed for reel in reels],
+            )
+
+    def test_matches_reel_with_press_time(self):
+        reels = [Reel(SlotData.REEL_SYMBOLPATTERN_L) for _ in range(3)]
+        rng = np.random.default_rng(1)
+        self.bank.reel_start()
+        for reel in reels:
+            reel.reel_start()
+        for step in range(300):
+            dt = float(rng.uniform(0.0, 0.1))
+            if step % 50 == 10:
+                index = step // 50 % 3
+                # 押した時刻は前回の更新から今回の更新までの間
+                elapsed = float(rng.uniform(0.0, dt))
+                press = reels[index].get_stop_symbol_index(elapsed)
+                self.assertEqual(
+                    int(self.bank.get_stop_symbol_index(index, elapsed)), press
+                )
+                # 押した時刻までに通過した位置を含めて目標にする
+                target = (press + int(rng.integers(-4, 2))) % (
+                    GameData.REEL_SYMBOL_LENGTH
+                )
+                self.bank.stop_spin(index, target, elapsed)
+                reels[index].stop_spin(
+                    target, GameData.REEL_POSITION_TOP, elapsed
+                )
+            if step % 50 == 40:
+                self.bank.reel_start(step // 50 % 3)
+                reels[step // 50 % 3].reel_start()
+            self.bank.update(dt)
+            for reel in reels:
+                reel.update(dt)
+            np.testing.assert_array_equal(
+                self.bank.current_symbol_index,
+                [reel.current_symbol_index for reel in reels],
+            )
+            np.testing.assert_array_equal(
+                self.bank.spinning, [reel.spinning for reel in reels]
+            )
+            np.testing.assert_array_equal(
+                self.bank.current_coord_fixed,
+                [reel.current_coord_fixed for reel in reels],
+            )
+
+    def test_batch_stop(self):
+        bank = ReelBank((4, 3))
+        bank.reel_start()
+        bank.update(0.05)
+        targets = (bank.get_stop_symbol_index() - 2) % 20
+        bank.stop_spin(..., targets)
+        # 1回の更新で目標を通り過ぎる経過時間でも目標位置で停止する
+        bank.update(GameData.REEL_SPEED)
+        self.assertFalse(bank.spinning.any())
+        np.testing.assert_array_equal(bank.current_symbol_index, targets)
+        np.testing.assert_array_equal(bank.current_offset, 0.0)
+
+    def test_stop_after_passed_target(self):
+        # 押した時刻までに通過した目標にはリール1周後に停止する (Reelと同じ)
+        bank = ReelBank(2)
+        reels = [Reel(SlotData.REEL_SYMBOLPATTERN_L) for _ in range(2)]
+        bank.reel_start()
+        for reel in reels:
+            reel.reel_start()
+        bank.update(0.05)
+        for reel in reels:
+            reel.update(0.05)
+        elapsed = np.array([0.0, 0.03])
+        targets = (bank.get_stop_symbol_index() + 1) % 20
+        bank.stop_spin(..., targets, elapsed)
+        for reel, target, reel_elapsed in zip(reels, targets, elapsed):
+            reel.stop_spin(
+                int(target), GameData.REEL_POSITION_TOP, float(reel_elapsed)
+            )
+        bank.update(0.1)
+        for reel in reels:
+            reel.update(0.1)
+        np.testing.assert_array_equal(bank.spinning, [False, True])
+        np.testing.assert_array_equal(
+            bank.spinning, [reel.spinning for reel in reels]
+        )
+        bank.update(GameData.REEL_SPEED)
+        np.testing.assert_array_equal(bank.current_symbol_index, targets)
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            ReelBank(0)
+
+    def test_invalid_target(self):
+        with self.assertRaises(ValueError):
+            self.bank.stop_spin(0, GameData.REEL_SYMBOL_LENGTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
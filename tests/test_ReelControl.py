@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+from myapp import GameData, SlotData
+from myapp.ReelControl import SLIP_MAX, ReelControl
+
+
+class TestReelControl(unittest.TestCase):
+    def setUp(self):
+        self.reel_symbols = [
+            SlotData.REEL_SYMBOLPATTERN_L,
+            SlotData.REEL_SYMBOLPATTERN_C,
+            SlotData.REEL_SYMBOLPATTERN_R,
+        ]
+        self.roles = [role for role, _ in SlotData.LOTTERY_TABLE]
+        self.control = ReelControl(self.roles, self.reel_symbols)
+
+    def test_table_shape(self):
+        self.assertEqual(
+            self.control.slip_table.shape,
+            (3, len(self.roles) + 1, GameData.REEL_SYMBOL_LENGTH),
+        )
+
+    def test_slip_within_validslip(self):
+        for reel in range(3):
+            for press in range(GameData.REEL_SYMBOL_LENGTH):
+                self.assertLessEqual(
+                    self.control.get_slip(reel, 0, press), SLIP_MAX
+                )
+                for i, role in enumerate(self.roles):
+                    self.assertIn(
+                        self.control.get_slip(reel, i + 1, press),
+                        role.slip.validslip[reel],
+                    )
+
+    def test_stop_index(self):
+        length = GameData.REEL_SYMBOL_LENGTH
+        for press in range(length):
+            slip = self.control.get_slip(1, 2, press)
+            self.assertEqual(
+                self.control.get_stop_index(1, 2, press),
+                (press - slip) % length,
+            )
+
+    def test_bell_is_always_pulled_in(self):
+        # ベルは各リール5コマ以内に配置されているため必ず引き込める
+        result = self.roles.index(SlotData.ROLE_BELL) + 1
+        length = GameData.REEL_SYMBOL_LENGTH
+        for reel, symbols in enumerate(self.reel_symbols):
+            for press in range(length):
+                stop = self.control.get_stop_index(reel, result, press)
+                window = [symbols[(stop + row) % length] for row in range(3)]
+                self.assertIn(SlotData.SYMBOL_BELL_A, window)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+import numpy as np
+
+from myapp import SlotData
+from myapp.Simulator import SimulationResult, Simulator
+from myapp.Slot import Slot
+
+
+def create_simulator(seed: int) -> Simulator:
+    rng = np.random.default_rng(seed)
+    return Simulator(slot=Slot(rng=rng, cache_dir=None), rng=rng)
+
+
+class TestSimulator(unittest.TestCase):
+    def test_play_game(self):
+        simulator = create_simulator(seed=7)
+        slot = simulator.slot
+        for _ in range(50):
+            simulator.play_game()
+            # 1遊技ごとに全リールが停止して遊技が終了している
+            self.assertFalse(slot.gaming)
+            for reel in slot.reel:
+                self.assertFalse(reel.spinning)
+            # 払出は払出のある役の入賞時のみ
+            self.assertEqual(
+                slot.payout > 0, any(role.payout > 0 for role in slot.roles)
+            )
+        self.assertEqual(slot.game_count, 50)
+
+    def test_run_totals(self):
+        games = 200
+        result = create_simulator(seed=11).run(games)
+        self.assertEqual(result.games, games)
+        self.assertGreater(result.virtual_time, 0.0)
+
+        # 払出の分布と払出クレジット数の合計が一致する
+        self.assertEqual(int(result.payout_histogram.sum()), games)
+        payouts = np.arange(len(result.payout_histogram))
+        self.assertEqual(
+            int((payouts * result.payout_histogram).sum()), result.payout_out
+        )
+
+        # 払出のある遊技数は払出のある役の入賞数を超えない
+        paying_hits = sum(
+            int(hits)
+            for role, hits in zip(SlotData.ROLES, result.role_hits)
+            if role.payout > 0
+        )
+        self.assertLessEqual(
+            int(result.payout_histogram[1:].sum()), paying_hits
+        )
+
+        # 再遊技で持ち越した遊技以外はMAXBET分を投入している
+        replay_index = SlotData.ROLES.index(SlotData.ROLE_REPLAY)
+        replays = int(result.role_hits[replay_index])
+        # 有効BET数は3のみ
+        bet = 3
+        self.assertIn(
+            result.payout_in,
+            (bet * (games - replays), bet * (games - replays + 1)),
+        )
+
+    def test_same_seed_same_result(self):
+        result_a = create_simulator(seed=3).run(30)
+        result_b = create_simulator(seed=3).run(30)
+        self.assertEqual(result_a.payout_in, result_b.payout_in)
+        self.assertEqual(result_a.payout_out, result_b.payout_out)
+        np.testing.assert_array_equal(result_a.role_hits, result_b.role_hits)
+
+    def test_merge(self):
+        result_a = create_simulator(seed=1).run(10)
+        result_b = create_simulator(seed=2).run(20)
+        merged = SimulationResult.merge([result_a, result_b], elapsed=1.0)
+        self.assertEqual(merged.games, 30)
+        self.assertEqual(
+            merged.payout_out, result_a.payout_out + result_b.payout_out
+        )
+        np.testing.assert_array_equal(
+            merged.role_hits, result_a.role_hits + result_b.role_hits
+        )
+        with self.assertRaises(ValueError):
+            SimulationResult.merge([], elapsed=0.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Simulator(slot=Slot(cache_dir=None), dt=0.0)
+        with self.assertRaises(ValueError):
+            create_simulator(seed=0).run(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
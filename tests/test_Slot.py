@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+from myapp import GameData
+from myapp.Slot import Slot
+
+
+class TestSlot(unittest.TestCase):
+    def test_bet_process_with_large_dt(self):
+        # 1回の更新で複数回分のBET間隔が経過しても全てのBETを処理する
+        slot = Slot(cache_dir=None)
+        slot.maxbet_keydown()
+        slot.update(GameData.BET_INTERVAL * 3)
+        self.assertFalse(slot.beting)
+        self.assertEqual(slot.bet, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tempfile
+import unittest
+
+import numpy as np
+
+from myapp import SlotData
+from myapp.Slot import Slot
+from myapp.TableCache import MANIFEST_FILENAME, TableCache
+
+
+class TestTableCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = TableCache(cache_dir=self.temp_dir.name)
+        self.reel_symbols = [
+            SlotData.REEL_SYMBOLPATTERN_L,
+            SlotData.REEL_SYMBOLPATTERN_C,
+            SlotData.REEL_SYMBOLPATTERN_R,
+        ]
+        self.spec_hash = TableCache.get_spec_hash(
+            self.reel_symbols,
+            SlotData.ROLES,
+            SlotData.PAYLINES,
+            SlotData.LOTTERY_TABLE,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        tables = {"table": {"values": np.arange(6).reshape(2, 3)}}
+        self.assertIsNone(self.cache.load(self.spec_hash))
+        self.cache.save(self.spec_hash, tables)
+
+        loaded = self.cache.load(self.spec_hash)
+        self.assertIsInstance(loaded["table"]["values"], np.memmap)
+        np.testing.assert_array_equal(
+            loaded["table"]["values"], tables["table"]["values"]
+        )
+
+    def test_spec_hash_changes_with_spec(self):
+        lottery_table = list(SlotData.LOTTERY_TABLE)
+        role, value = lottery_table[0]
+        lottery_table[0] = (role, value + 1)
+        spec_hash = TableCache.get_spec_hash(
+            self.reel_symbols,
+            SlotData.ROLES,
+            SlotData.PAYLINES,
+            lottery_table,
+        )
+        self.assertNotEqual(spec_hash, self.spec_hash)
+
+    def test_version_mismatch(self):
+        self.cache.save(self.spec_hash, {"table": {"values": np.zeros(3)}})
+        manifest_path = os.path.join(
+            self.cache.get_path(self.spec_hash), MANIFEST_FILENAME
+        )
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["format_version"] = -1
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        self.assertIsNone(self.cache.load(self.spec_hash))
+
+    def test_corrupted_cache_is_replaced(self):
+        tables = {"table": {"values": np.arange(6)}}
+        self.cache.save(self.spec_hash, tables)
+        array_path = os.path.join(
+            self.cache.get_path(self.spec_hash), "table.values.npy"
+        )
+        with open(array_path, "wb") as f:
+            f.write(b"garbage")
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(self.cache.load(self.spec_hash))
+
+        # 壊れたキャッシュは保存時に置き換える
+        with self.assertLogs(level="WARNING"):
+            self.cache.save(self.spec_hash, tables)
+        loaded = self.cache.load(self.spec_hash)
+        np.testing.assert_array_equal(
+            loaded["table"]["values"], tables["table"]["values"]
+        )
+        self.assertEqual(
+            [
+                name
+                for name in os.listdir(self.temp_dir.name)
+                if name.startswith(".")
+            ],
+            [],
+        )
+
+    def test_layout_mismatch(self):
+        tables = {"table": {"values": np.arange(6, dtype=np.int64)}}
+        self.cache.save(self.spec_hash, tables)
+        layouts = {"table": {"values": ((6,), np.dtype(np.int64))}}
+        self.assertIsNotNone(self.cache.load(self.spec_hash, layouts))
+        # 形状やデータ型が異なる場合は壊れたキャッシュとして扱う
+        for layout in (
+            ((2, 3), np.dtype(np.int64)),
+            ((6,), np.dtype(np.uint8)),
+        ):
+            with self.assertLogs(level="WARNING"):
+                self.assertIsNone(
+                    self.cache.load(
+                        self.spec_hash, {"table": {"values": layout}}
+                    )
+                )
+
+    def test_slot_replaces_stale_layout(self):
+        # 仕様のハッシュ値が同じで配列の形状が異なるキャッシュ
+        self.cache.save(
+            Slot(cache_dir=None).spec_hash,
+            {
+                "payout_table": {
+                    "line_roles": np.zeros(1, dtype=np.uint64),
+                    "role_bits": np.zeros(1, dtype=np.uint64),
+                    "payouts": np.zeros((2, 2, 2), dtype=np.int64),
+                },
+                "lottery": {"values": np.zeros(1), "thresholds": np.zeros(1)},
+                "reel_control": {"slip_table": np.zeros(1, dtype=np.uint8)},
+            },
+        )
+        with self.assertLogs(level="WARNING"):
+            compiled = Slot(cache_dir=self.temp_dir.name)
+        cached = Slot(cache_dir=self.temp_dir.name)
+        self.assertIsInstance(cached.payout_table.payouts, np.memmap)
+        np.testing.assert_array_equal(
+            cached.payout_table.payouts, compiled.payout_table.payouts
+        )
+
+    def test_slot_uses_cache(self):
+        compiled = Slot(cache_dir=self.temp_dir.name)
+        cached = Slot(cache_dir=self.temp_dir.name)
+        self.assertIsInstance(cached.payout_table.payouts, np.memmap)
+        np.testing.assert_array_equal(
+            cached.payout_table.payouts, compiled.payout_table.payouts
+        )
+        stops = (3, 7, 11)
+        self.assertEqual(
+            cached.payout_table.get_payout(stops),
+            compiled.payout_table.get_payout(stops),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
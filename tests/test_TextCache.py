@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+import pygame
+
+from myapp.TextCache import TextCache
+
+WHITE = (255, 255, 255)
+
+
+class TestTextCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 16)
+
+    def test_render_cached(self):
+        cache = TextCache()
+        first = cache.render(self.font, "123", True, WHITE)
+        second = cache.render(self.font, "123", True, WHITE)
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        other = cache.render(self.font, "123", True, (128, 128, 128))
+        self.assertIsNot(first, other)
+
+    def test_lru_eviction(self):
+        cache = TextCache(maxsize=2)
+        first = cache.render(self.font, "1", True, WHITE)
+        cache.render(self.font, "2", True, WHITE)
+        # "1"を最近使用したものにする
+        cache.render(self.font, "1", True, WHITE)
+        cache.render(self.font, "3", True, WHITE)
+        self.assertIs(cache.render(self.font, "1", True, WHITE), first)
+        misses = cache.misses
+        cache.render(self.font, "2", True, WHITE)
+        self.assertEqual(cache.misses, misses + 1)
+
+    def test_preload_not_evicted(self):
+        cache = TextCache(maxsize=1)
+        cache.preload(self.font, ["CREDIT: "], True, WHITE)
+        label = cache.render(self.font, "CREDIT: ", True, WHITE)
+        for text in ("1", "2", "3"):
+            cache.render(self.font, text, True, WHITE)
+        self.assertIs(cache.render(self.font, "CREDIT: ", True, WHITE), label)
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            TextCache(maxsize=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
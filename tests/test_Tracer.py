@@ -0,0 +1,88 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tempfile
+import unittest
+
+from myapp.Tracer import Tracer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        self.now += 1000
+        return self.now
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer(capacity=4, clock=FakeClock())
+
+    def test_disabled(self):
+        with self.tracer.span("span"):
+            pass
+        self.assertEqual(self.tracer.count, 0)
+
+    def test_span_and_traced(self):
+        tracer = self.tracer
+
+        class Target:
+            @tracer.traced("func")
+            def func(self, value):
+                return value * 2
+
+        # 無効時は元のメソッドのまま呼び出す
+        original = Target.func
+        self.assertEqual(Target().func(3), 6)
+        self.assertEqual(tracer.count, 0)
+
+        tracer.enabled = True
+        self.assertIsNot(Target.func, original)
+        with tracer.span("span"):
+            self.assertEqual(Target().func(3), 6)
+        events = self.tracer.get_trace_events()
+        # 終了した順に記録する
+        self.assertEqual([event["name"] for event in events], ["func", "span"])
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["dur"], 1.0)
+        self.assertEqual(events[1]["dur"], 3.0)
+
+        tracer.enabled = False
+        self.assertIs(Target.func, original)
+
+    def test_ring_buffer(self):
+        self.tracer.enabled = True
+        for i in range(6):
+            with self.tracer.span(f"span{i}"):
+                pass
+        events = self.tracer.get_trace_events()
+        self.assertEqual(
+            [event["name"] for event in events],
+            ["span2", "span3", "span4", "span5"],
+        )
+        self.tracer.clear()
+        self.assertEqual(self.tracer.count, 0)
+
+    def test_save(self):
+        self.tracer.enabled = True
+        with self.tracer.span("span"):
+            pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "trace.json")
+            self.tracer.save(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        self.assertEqual(trace["traceEvents"][0]["name"], "span")
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            Tracer(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import unittest
+
+import numpy as np
+import pygame
+
+from myapp import Utility
+
+
+class TestUtility(unittest.TestCase):
+    def test_cv2_to_pygame_surface(self):
+        image = np.zeros((4, 3, 3), dtype=np.uint8)
+        image[1, 2] = (10, 20, 30)
+        surface = Utility.cv2_to_pygame_surface(image)
+        self.assertEqual(surface.get_size(), (3, 4))
+        # BGR → RGB
+        self.assertEqual(tuple(surface.get_at((2, 1)))[:3], (30, 20, 10))
+        # 画素をコピーせずに共有している
+        image[0, 0] = (1, 2, 3)
+        self.assertEqual(tuple(surface.get_at((0, 0)))[:3], (3, 2, 1))
+
+    def test_cv2_to_pygame_surface_invalid_image(self):
+        with self.assertRaises(ValueError):
+            Utility.cv2_to_pygame_surface(np.zeros((4, 3), dtype=np.uint8))
+
+    def test_cv2_to_pygame_surfaces(self):
+        images = [
+            np.full((2 + i, 3, 3), (i, 0, 0), dtype=np.uint8) for i in range(3)
+        ]
+        surfaces = Utility.cv2_to_pygame_surfaces(images)
+        self.assertEqual(
+            [surface.get_size() for surface in surfaces],
+            [(3, 2), (3, 3), (3, 4)],
+        )
+        for i, surface in enumerate(surfaces):
+            self.assertEqual(tuple(surface.get_at((0, 0)))[:3], (0, 0, i))
+        # 幅が異なる場合は個別に変換する
+        images.append(np.zeros((2, 5, 3), dtype=np.uint8))
+        surfaces = Utility.cv2_to_pygame_surfaces(images)
+        self.assertEqual(surfaces[-1].get_size(), (5, 2))
+        self.assertEqual(Utility.cv2_to_pygame_surfaces([]), [])
+
+    def test_get_wraparound_padded_image(self):
+        image = np.arange(10 * 2 * 3, dtype=np.uint8).reshape(10, 2, 3)
+        padded = Utility.get_wraparound_padded_image(image, 4)
+        self.assertEqual(padded.shape, (14, 2, 3))
+        np.testing.assert_array_equal(padded[:10], image)
+        np.testing.assert_array_equal(padded[10:], image[:4])
+
+    def test_get_wraparound_padded_image_invalid_padding(self):
+        image = np.zeros((10, 2, 3), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            Utility.get_wraparound_padded_image(image, 11)
+
+    def test_convert_to_display_format(self):
+        surface = pygame.Surface((4, 4), depth=24)
+        # 表示モード設定前は変換しない
+        if pygame.display.get_surface() is None:
+            self.assertIs(Utility.convert_to_display_format(surface), surface)
+
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        try:
+            screen = pygame.display.set_mode((8, 8))
+            converted = Utility.convert_to_display_format(surface)
+            self.assertEqual(converted.get_bitsize(), screen.get_bitsize())
+            alpha = pygame.Surface((4, 4), pygame.SRCALPHA)
+            converted = Utility.convert_to_display_format(alpha)
+            self.assertTrue(converted.get_flags() & pygame.SRCALPHA)
+        finally:
+            pygame.display.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import itertools
+import unittest
+
+import numpy as np
+
+from myapp import GameData, SlotData
+from myapp.WinEvaluator import WinEvaluator
+
+
+def naive_payout(window):
+    """役・入賞ラインを総当たりで判定した払出クレジット数"""
+    payout = 0
+    for role in SlotData.ROLES:
+        symbol_ids = [
+            [symbol.id for symbol in symbols]
+            for symbols in role.symbolcombo.symbolcombo
+        ]
+        for payline in role.payline:
+            if all(
+                window[reel][pos] in symbol_ids[reel]
+                for reel, pos in enumerate(payline.line)
+            ):
+                payout += role.payout
+    return min(payout, GameData.PAYOUT_MAX)
+
+
+class TestWinEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = WinEvaluator(SlotData.ROLES, SlotData.PAYLINES)
+        symbol_ids = [symbol.id for symbol in SlotData.SYMBOLS]
+        rng = np.random.default_rng(0)
+        self.windows = rng.choice(symbol_ids, size=(500, 3, 3)).tolist()
+
+    def test_compiled_shapes(self):
+        self.assertEqual(
+            self.evaluator.role_masks.shape, (len(SlotData.ROLES), 3)
+        )
+        self.assertEqual(
+            self.evaluator.payline_matrix.shape, (len(SlotData.PAYLINES), 3)
+        )
+
+    def test_evaluate_matches_naive(self):
+        for window in self.windows:
+            line_roles = self.evaluator.evaluate(window)
+            self.assertEqual(
+                self.evaluator.get_payout(line_roles), naive_payout(window)
+            )
+
+    def test_batch_matches_single(self):
+        line_roles = self.evaluator.evaluate_batch(np.array(self.windows))
+        expected = [self.evaluator.evaluate(w) for w in self.windows]
+        np.testing.assert_array_equal(line_roles, expected)
+        np.testing.assert_array_equal(
+            self.evaluator.get_payout_batch(line_roles),
+            [naive_payout(w) for w in self.windows],
+        )
+
+    def test_bell_on_middle_line(self):
+        bell = SlotData.SYMBOL_BELL_A.id
+        bar = SlotData.SYMBOL_BAR.id
+        replay = SlotData.SYMBOL_REPLAY_A.id
+        window = [
+            [bar, bell, replay],
+            [replay, bell, bar],
+            [bar, bell, replay],
+        ]
+        line_roles = self.evaluator.evaluate(window)
+        self.assertEqual(
+            self.evaluator.get_win_roles(line_roles), [SlotData.ROLE_BELL]
+        )
+        self.assertEqual(
+            self.evaluator.get_payout(line_roles), SlotData.ROLE_BELL.payout
+        )
+
+    def test_unknown_symbol_never_wins(self):
+        unknown = max(s.id for s in SlotData.SYMBOLS) + 10
+        for row in itertools.product(range(3), repeat=2):
+            window = [[unknown] * 3 for _ in range(3)]
+            window[0][row[0]] = SlotData.SYMBOL_CHERRY.id
+            line_roles = self.evaluator.evaluate(window)
+            self.assertEqual(self.evaluator.get_win_roles(line_roles), [])
+
+
+if __name__ == "__main__":
+    unittest.main()